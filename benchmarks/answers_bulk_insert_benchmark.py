@@ -0,0 +1,93 @@
+"""
+Rows per second of POST /answers inserts: one commit per answer (previous
+AnswerRepository.create_answer loop) vs the single multi-row INSERT ... RETURNING
+transaction (AnswerRepository.create_answers).
+
+Inserts into the answers table of the schema given by --schema (it must hold
+the evaluation, question and user referenced by --evaluation/--question/--user)
+in the database pointed to by DATABASE_URL, and deletes the inserted rows.
+With a sqlite DATABASE_URL the tables are created in memory.
+
+    cd root && DATABASE_URL=postgresql+psycopg2://... python ../benchmarks/answers_bulk_insert_benchmark.py --schema tenant_demo --sizes 10,40,100
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'root'))
+
+from sqlalchemy import event  # noqa: E402
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.answers import Answer  # noqa: E402
+from app.repositories.answer_repository import AnswerRepository  # noqa: E402
+from app.utils.tenant_routing import tenant_schema  # noqa: E402
+
+
+def submission(size, args):
+    return [
+        {
+            "answer_description": f"Benchmark answer {index} " + "lorem ipsum " * 40,
+            "id_evaluation": args.evaluation,
+            "id_question": args.question,
+            "id_user": args.user,
+            "score": None,
+        }
+        for index in range(size)
+    ]
+
+
+def per_row(answers_data):
+    return [AnswerRepository.create_answer(**answer_data) for answer_data in answers_data]
+
+
+def bulk(answers_data):
+    return AnswerRepository.create_answers(answers_data)
+
+
+def measure(insert, size, args, statements):
+    timings, round_trips = [], []
+    for _ in range(args.runs):
+        answers_data = submission(size, args)
+        statements.clear()
+        started = time.perf_counter()
+        new_answers = insert(answers_data)
+        # The caller serializes every answer (as_dict)
+        [answer.as_dict() for answer in new_answers]
+        timings.append(time.perf_counter() - started)
+        round_trips.append(len(statements))
+
+        ids = [answer.id for answer in new_answers]
+        Answer.query.filter(Answer.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+    return sorted(timings)[len(timings) // 2], max(round_trips)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--schema', default='public')
+    parser.add_argument('--evaluation', type=int, default=1)
+    parser.add_argument('--question', type=int, default=1)
+    parser.add_argument('--user', type=int, default=1)
+    parser.add_argument('--sizes', default='10,40,100')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    statements = []
+
+    with app.app_context(), tenant_schema(args.schema):
+        if db.engine.dialect.name == 'sqlite':
+            Answer.__table__.create(db.engine, checkfirst=True)
+        event.listen(db.engine, 'before_cursor_execute', lambda *a, **kw: statements.append(a[2]))
+
+        print(f"{'answers':>7} {'mode':<8} {'median ms':>10} {'rows/s':>10} {'round trips':>11}")
+        for size in (int(size) for size in args.sizes.split(',')):
+            for mode, insert in (("per-row", per_row), ("bulk", bulk)):
+                median, round_trips = measure(insert, size, args, statements)
+                print(f"{size:>7} {mode:<8} {median * 1000:>10.1f} {size / median:>10.0f} {round_trips:>11}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Peak memory of POST /answers/stream as the NDJSON upload grows.
+
+Sends uploads of increasing size through the Flask test client against an
+in-memory SQLite database and reports the Python heap peak (tracemalloc)
+while the request is processed, next to the size of the upload itself. The
+upload bytes are allocated before tracing starts, so a flat peak means the
+endpoint memory does not grow with the number of lines. On Lambda the
+upload itself is held whole (API Gateway puts it in the event), on top of
+this peak; ANSWER_STREAM_MAX_BYTES bounds it.
+
+    python benchmarks/answers_stream_benchmark.py --lines 1000,10000,50000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'root'))
+
+from unittest import mock  # noqa: E402
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.answers import Answer  # noqa: E402
+from app.models.questions import Question  # noqa: E402
+from app.utils.jwt_utils import create_jwt_token  # noqa: E402
+from app.utils.permission_cache import CachedPermissions  # noqa: E402
+from app.utils.tenant_cache import CachedTenant  # noqa: E402
+
+QUESTIONS = 40
+
+
+def upload(lines):
+    return b"".join(
+        json.dumps({
+            "answer_description": f"Answer {index} " + "lorem ipsum dolor sit amet " * 20,
+            "id_evaluation": 1,
+            "id_question": index % QUESTIONS + 1,
+            "score": None,
+        }).encode('utf-8') + b"\n"
+        for index in range(lines)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', default='1000,10000,50000')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.metadata.create_all(db.engine, tables=[Question.__table__, Answer.__table__])
+        db.session.add_all(Question(f"Question {index}", 1, 1) for index in range(QUESTIONS))
+        db.session.commit()
+
+    client = app.test_client()
+    headers = {
+        "Authorization": "Bearer " + create_jwt_token({"user_id": 1, "role": 1}),
+        "Content-Type": "application/x-ndjson",
+        "X-Tenant": "public",
+    }
+
+    # Tenant resolution and authorization are out of scope: the user holds create_answers
+    tenant = CachedTenant(1, "public", "public", "ready")
+    permissions = CachedPermissions(role_id=1, names=frozenset({"create_answers"}))
+    with mock.patch('app.middlewares.tenant_middleware.tenant_cache.resolve', return_value=tenant), \
+            mock.patch('app.utils.permission_decorator.PermissionRepository.get_user_permissions', return_value=permissions):
+        print(f"{'lines':>7} {'upload MB':>10} {'peak MB':>8} {'seconds':>8} {'inserted':>9}")
+        for lines in (int(value) for value in args.lines.split(',')):
+            body = upload(lines)
+            tracemalloc.start()
+            started = time.perf_counter()
+            response = client.post('/api/v1/answers/stream', data=body, headers=headers)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report = response.get_json()["result"]
+            print(f"{lines:>7} {len(body) / 2**20:>10.1f} {peak / 2**20:>8.1f} {elapsed:>8.2f} {report['inserted']:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Bytes saved and CPU cost of response compression (app/utils/compression.py).
+
+Builds paginated feedback listings shaped like ApiResponse.ok payloads for a
+range of page sizes and compresses them with every available coding, reporting
+the compressed size, the size of the base64 Lambda payload API Gateway
+receives, and the median compression time.
+
+    python benchmarks/compression_benchmark.py --runs 50
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'root')
+sys.path.insert(0, ROOT_DIR)
+
+from app.config import Config  # noqa: E402
+from app.utils.compression import available_encodings, compress  # noqa: E402
+
+WORDS = (
+    "the student identifies the main concepts of the competency and applies them "
+    "correctly although the argument lacks evidence and the conclusion should "
+    "connect the analysis with the evaluation criteria of the grading matrix"
+).split()
+
+
+def feedback_page(items, seed=7):
+    rng = random.Random(seed)
+    result = [
+        {
+            "id_feedback": index + 1,
+            "id_evaluation": rng.randint(1, 50),
+            "feedback_description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(120, 260))),
+            "created_at": "2024-10-18T10:00:00",
+        }
+        for index in range(items)
+    ]
+    payload = {"result": result, "message": "OK", "success": True, "status": 200,
+               "total": items * 10, "page": 1, "per_page": items, "has_next": True, "has_prev": False}
+    return json.dumps(payload).encode('utf-8')
+
+
+def median_us(function, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter_ns()
+        function()
+        samples.append(time.perf_counter_ns() - started)
+    return statistics.median(samples) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--sizes', default='1,5,10,25,50,100', help="Feedback items per page")
+    args = parser.parse_args()
+
+    print(f"min size {Config.COMPRESSION_MIN_SIZE} B, gzip level {Config.COMPRESSION_GZIP_LEVEL}, "
+          f"brotli quality {Config.COMPRESSION_BROTLI_QUALITY}")
+    print(f"{'items':>6} {'coding':<8} {'body B':>10} {'sent B':>10} {'saved':>7} {'lambda B':>10} {'cpu us':>9}")
+    for items in (int(size) for size in args.sizes.split(',')):
+        data = feedback_page(items)
+        plain_payload = len(data)
+        print(f"{items:>6} {'identity':<8} {len(data):>10} {len(data):>10} {'0%':>7} {plain_payload:>10} {0:>9.1f}")
+        for encoding in available_encodings():
+            compressed = compress(data, encoding)
+            lambda_payload = len(base64.b64encode(compressed))
+            saved = 1 - len(compressed) / len(data)
+            cpu = median_us(lambda: compress(data, encoding), args.runs)
+            print(f"{items:>6} {encoding:<8} {len(data):>10} {len(compressed):>10} {saved:>7.0%} "
+                  f"{lambda_payload:>10} {cpu:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Batch wall time of the bedrock-feedback worker against a simulated Bedrock.
+
+The fake Bedrock answers after `--latency` seconds and throttles any call
+above `--capacity` simultaneous requests, so the run shows both the speedup
+over one-at-a-time processing and how the adaptive limit settles under
+throttling. The API call is stubbed out.
+
+    python benchmarks/feedback_worker_concurrency_benchmark.py --records 50 --latency 0.5 --capacity 6
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+
+WORKER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'workers', 'bedrock-feedback')
+sys.path.insert(0, WORKER_DIR)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'root', 'python', 'lib', 'python3.11', 'site-packages'))
+os.environ.setdefault("API_URL", "https://api.example.com/api/v1/feedback")
+# Every record must reach the fake Bedrock: generation cache hits would skip it
+os.environ["GENERATION_CACHE"] = "off"
+
+import bedrock_feedback  # noqa: E402
+from adaptive_concurrency import AdaptiveConcurrency  # noqa: E402
+from botocore.exceptions import ClientError  # noqa: E402
+
+
+class FakeBedrock:
+    def __init__(self, latency, capacity):
+        self.latency = latency
+        self.capacity = capacity
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def invoke_model(self, modelId, body, contentType):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            throttled = self.in_flight > self.capacity
+        try:
+            if throttled:
+                raise ClientError({"Error": {"Code": "ThrottlingException", "Message": "Too many requests"}}, "InvokeModel")
+            time.sleep(self.latency)
+            return {"body": io.BytesIO(json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode())}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class FakeResponse:
+    status_code = 201
+    text = ''
+
+
+class FakeContext:
+    def get_remaining_time_in_millis(self):
+        return 900000
+
+
+def run(records, latency, capacity, max_concurrency):
+    fake = FakeBedrock(latency, capacity)
+    bedrock_feedback._bedrock_clients["us-east-1"] = fake
+    bedrock_feedback._http_session.post = lambda url, json, headers: FakeResponse()
+    bedrock_feedback.MAX_CONCURRENCY = max_concurrency
+    bedrock_feedback._concurrency = AdaptiveConcurrency(
+        initial=min(bedrock_feedback.INITIAL_CONCURRENCY, max_concurrency), maximum=max_concurrency
+    )
+
+    event = {"Records": [
+        {
+            "messageId": f"message-{index}",
+            "body": json.dumps({"prompt_string": f"p{index}", "id_evaluation": 1, "id_user": 1, "performed_by": "system"}),
+        }
+        for index in range(records)
+    ]}
+    started = time.perf_counter()
+    # The worker logs one metrics line per record
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = bedrock_feedback.lambda_handler(event, FakeContext())
+    return {
+        "seconds": time.perf_counter() - started,
+        "failed": len(result["batchItemFailures"]),
+        "throttles": bedrock_feedback._concurrency.throttles,
+        "peak": fake.peak,
+        "limit": bedrock_feedback._concurrency.limit,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.5, help="Seconds per Bedrock call")
+    parser.add_argument('--capacity', type=int, default=6, help="Simultaneous calls before throttling")
+    parser.add_argument('--max-concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    for label, max_concurrency in (("sequential", 1), ("adaptive", args.max_concurrency)):
+        stats = run(args.records, args.latency, args.capacity, max_concurrency)
+        print(
+            f"{label:<11} {stats['seconds']:>7.2f}s  {args.records / stats['seconds']:>6.1f} records/s  "
+            f"failed={stats['failed']} throttles={stats['throttles']} peak={stats['peak']} final_limit={stats['limit']}"
+        )
+
+
+if __name__ == '__main__':
+    main()
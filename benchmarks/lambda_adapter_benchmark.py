@@ -0,0 +1,99 @@
+"""
+Per-invocation overhead of the API Gateway -> WSGI adapter.
+
+Replays the same REST API (v1) events through `awsgi.response` and through
+`app.utils.lambda_adapter.handle_request` on a minimal Flask app, so the
+timings measure the translation layer and not the application.
+
+    python benchmarks/lambda_adapter_benchmark.py --iterations 20000
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'root')
+sys.path.insert(0, ROOT_DIR)
+
+from awsgi import response as awsgi_response  # noqa: E402
+from flask import Flask, jsonify, request  # noqa: E402
+from app.utils.lambda_adapter import handle_request  # noqa: E402
+
+
+def build_app():
+    app = Flask(__name__)
+
+    @app.route('/ping', methods=['GET'])
+    def ping():
+        return jsonify({"status": "ok"})
+
+    @app.route('/echo', methods=['POST'])
+    def echo():
+        return jsonify(request.get_json())
+
+    return app
+
+
+def build_event(method, path, body=None):
+    headers = {
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+        "Host": "api.example.com",
+        "X-Tenant": "tenant_demo",
+        "X-Forwarded-For": "203.0.113.10",
+        "X-Forwarded-Proto": "https",
+        "X-Forwarded-Port": "443",
+    }
+    return {
+        "resource": "/{proxy+}",
+        "path": path,
+        "httpMethod": method,
+        "headers": headers,
+        "multiValueHeaders": {name: [value] for name, value in headers.items()},
+        "queryStringParameters": {"page": "1"},
+        "multiValueQueryStringParameters": {"page": ["1"]},
+        "requestContext": {"identity": {"sourceIp": "203.0.113.10"}, "stage": "Prod"},
+        "body": body,
+        "isBase64Encoded": False,
+    }
+
+
+def measure(handler, app, event, iterations):
+    for _ in range(min(iterations, 500)):
+        handler(app, event, None)
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter_ns()
+        handler(app, event, None)
+        samples.append(time.perf_counter_ns() - started)
+
+    samples.sort()
+    return {
+        "median_us": statistics.median(samples) / 1000,
+        "p99_us": samples[int(len(samples) * 0.99) - 1] / 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    app = build_app()
+    events = {
+        "GET /ping": build_event("GET", "/ping"),
+        "POST /echo (8 KB)": build_event("POST", "/echo", json.dumps({"answers": ["x" * 64] * 120})),
+    }
+
+    print(f"{'request':<20} {'adapter':<10} {'median us':>10} {'p99 us':>10}")
+    for label, event in events.items():
+        for name, handler in (("awsgi", awsgi_response), ("native", handle_request)):
+            result = measure(handler, app, event, args.iterations)
+            print(f"{label:<20} {name:<10} {result['median_us']:>10.1f} {result['p99_us']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
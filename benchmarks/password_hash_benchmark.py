@@ -0,0 +1,72 @@
+"""
+Cost of the password hash methods, to tune PASSWORD_HASH_PROFILES
+(app/utils/password_policy.py).
+
+Measures the median verification time of each candidate method on this
+machine, then estimates it for each Lambda memory size. Lambda gives CPU in
+proportion to memory (1769 MB = 1 vCPU), so the estimate assumes this machine
+runs at 1 vCPU. For each size it suggests the strongest method verifying
+within --target-ms.
+
+    python benchmarks/password_hash_benchmark.py --target-ms 450 --runs 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'root')
+sys.path.insert(0, ROOT_DIR)
+
+from werkzeug.security import check_password_hash, generate_password_hash  # noqa: E402
+from app.utils.password_policy import PASSWORD_HASH_PROFILES, method_for_memory  # noqa: E402
+
+# Weakest to strongest; the first one is the floor of the policy (werkzeug's default)
+CANDIDATES = (
+    'scrypt:32768:8:1',
+    'scrypt:65536:8:1',
+    'scrypt:131072:8:1',
+    'pbkdf2:sha256:600000',
+)
+
+MEMORY_SIZES = (128, 256, 512, 1024, 1536, 1769, 3008)
+FULL_VCPU_MEMORY = 1769
+
+
+def verify_ms(method, runs):
+    password_hash = generate_password_hash('correct horse battery staple', method=method)
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        check_password_hash(password_hash, 'correct horse battery staple')
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--target-ms', type=float, default=450)
+    args = parser.parse_args()
+
+    local = {method: verify_ms(method, args.runs) for method in CANDIDATES}
+    print(f"{'method':<24} {'local ms':>9}")
+    for method, elapsed in local.items():
+        print(f"{method:<24} {elapsed:>9.1f}")
+
+    print(f"\n{'memory MB':>9} {'current profile':<20} {'est. ms':>8}   suggested (<= {args.target_ms:.0f} ms)")
+    for memory_size in MEMORY_SIZES:
+        cpu_share = min(memory_size / FULL_VCPU_MEMORY, 1.0)
+        estimates = {method: elapsed / cpu_share for method, elapsed in local.items()}
+        current = method_for_memory(memory_size)
+        scrypt_fits = [method for method in CANDIDATES if method.startswith('scrypt') and estimates[method] <= args.target_ms]
+        suggested = scrypt_fits[-1] if scrypt_fits else CANDIDATES[0]
+        print(f"{memory_size:>9} {current:<20} {estimates.get(current, float('nan')):>8.0f}   "
+              f"{suggested} ({estimates[suggested]:.0f} ms)")
+
+    print(f"\nconfigured profiles: {PASSWORD_HASH_PROFILES}")
+
+
+if __name__ == '__main__':
+    main()
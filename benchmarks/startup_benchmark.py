@@ -0,0 +1,79 @@
+"""
+Cold-start benchmark of the API Lambda entry point (wsgi.py).
+
+Each run imports `wsgi` (which builds the Flask app) in a fresh interpreter
+with `-X importtime`, for eager and lazy imports (LAZY_IMPORTS), and reports
+the median startup time plus the modules with the largest import time.
+
+    python benchmarks/startup_benchmark.py --runs 5 --top 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'root')
+
+PROBE = (
+    "import time; started = time.perf_counter(); import wsgi; "
+    "print(f'STARTUP {time.perf_counter() - started:.6f}')"
+)
+
+
+def run_once(lazy_imports):
+    env = dict(os.environ)
+    env['LAZY_IMPORTS'] = 'true' if lazy_imports else 'false'
+    env.setdefault('DATABASE_URL', 'sqlite://')
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+
+    startup = next(float(line.split()[1]) for line in result.stdout.splitlines() if line.startswith('STARTUP'))
+
+    # "import time: self [us] | cumulative | imported package"
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+
+    return startup, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help="Modules listed per mode")
+    args = parser.parse_args()
+
+    for lazy_imports in (False, True):
+        startups = []
+        cumulative = {}
+        for _ in range(args.runs):
+            startup, modules = run_once(lazy_imports)
+            startups.append(startup)
+            for name, (_, cumulative_us) in modules.items():
+                cumulative.setdefault(name, []).append(cumulative_us)
+
+        mode = 'lazy' if lazy_imports else 'eager'
+        print(f"\n[{mode}] median startup: {statistics.median(startups) * 1000:.1f} ms "
+              f"(min {min(startups) * 1000:.1f} ms, max {max(startups) * 1000:.1f} ms, "
+              f"{len(cumulative)} modules imported)")
+
+        # Top-level dependencies and the app's own modules (app.<layer>.<module>),
+        # so nested modules are not counted twice
+        listed = {
+            name: statistics.median(times) for name, times in cumulative.items()
+            if name.count('.') == (2 if name.startswith('app.') else 0) and name not in ('wsgi', 'app')
+        }
+        for name, median_us in sorted(listed.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"  {median_us / 1000:>9.1f} ms  {name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark of tenant schema provisioning: DDL replay vs template cloning.
+
+Creates and drops throwaway schemas in the database pointed to by DATABASE_URL:
+
+    DATABASE_URL=postgresql+psycopg2://... python benchmarks/tenant_provisioning_benchmark.py --runs 5
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'root'))
+
+from sqlalchemy import event  # noqa: E402
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.services.tenant_schema_service import (  # noqa: E402
+    PROVISIONING_MODE_CLONE,
+    PROVISIONING_MODE_DDL,
+    TenantSchemaService,
+)
+
+
+def run(mode, runs, service, statements):
+    timings = []
+    counts = []
+    for i in range(runs):
+        schema_name = f"bench_{mode}_{os.getpid()}_{i}"
+        statements.clear()
+        started = time.perf_counter()
+        service.provision_schema(schema_name, mode=mode)
+        timings.append(time.perf_counter() - started)
+        counts.append(len(statements))
+
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql(f'DROP SCHEMA "{schema_name}" CASCADE')
+
+    return timings, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    service = TenantSchemaService()
+    statements = []
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda *a, **kw: statements.append(a[2]))
+
+        # Build the template up front: it is a one-off cost per DDL version
+        started = time.perf_counter()
+        service.ensure_template()
+        print(f"template build/check: {(time.perf_counter() - started) * 1000:.1f} ms")
+        script_statements = sum(script.count(';') for script in service._read_scripts())
+        print(f"statements in the DDL/seed scripts: {script_statements}")
+
+        print(f"{'mode':<6} {'runs':>4} {'avg ms':>9} {'min ms':>9} {'max ms':>9} {'round trips':>11}")
+        for mode in (PROVISIONING_MODE_DDL, PROVISIONING_MODE_CLONE):
+            timings, counts = run(mode, args.runs, service, statements)
+            print(f"{mode:<6} {args.runs:>4} {sum(timings) / len(timings) * 1000:>9.1f} "
+                  f"{min(timings) * 1000:>9.1f} {max(timings) * 1000:>9.1f} {max(counts):>11}")
+
+
+if __name__ == '__main__':
+    main()
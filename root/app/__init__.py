@@ -4,6 +4,9 @@ from flask_injector import FlaskInjector
 from injector import singleton
 from app.extensions import db
 from app.extensions import init_logging
+from app.utils.tenant_routing import init_tenant_routing, reset_schema_routing
+from app.utils.compression import init_compression
+from app.middlewares.tenant_middleware import tenant_middleware
 
 
 from app.controllers.tenants_controller import tenant_bp
@@ -17,6 +20,7 @@ from app.controllers.grading_matrix_controller import grading_matrix_bp
 from app.controllers.role_controller import role_bp 
 from app.controllers.permission_controller import permission_bp
 from app.controllers.feedback_controller import feedback_bp
+from app.controllers.import_controller import import_bp
 
 
 from app.services.tenants_service import TenantService
@@ -30,6 +34,8 @@ from app.services.grading_matrix_service import GradingMatrixService
 from app.services.role_service import RoleService
 from app.services.permission_service import PermissionService
 from app.services.feedback_service import FeedbackService
+from app.services.refresh_token_service import RefreshTokenService
+from app.services.import_service import ImportService
 
 
 def configure(binder):
@@ -44,6 +50,8 @@ def configure(binder):
     binder.bind(RoleService, to=RoleService, scope=singleton)
     binder.bind(PermissionService, to=PermissionService, scope=singleton)
     binder.bind(FeedbackService, to=FeedbackService, scope=singleton)
+    binder.bind(RefreshTokenService, to=RefreshTokenService, scope=singleton)
+    binder.bind(ImportService, to=ImportService, scope=singleton)
 
 
 def create_app():
@@ -52,14 +60,21 @@ def create_app():
     @app.teardown_request
     def teardown_request(exception=None):
         db.session.remove()
+        reset_schema_routing()
 
     CORS(app)
     app.config.from_object('app.config.Config')
+    init_compression(app)
 
     db.init_app(app)
+    with app.app_context():
+        init_tenant_routing(db.engine)
     logger = init_logging()
     logger.info(f"API MOBILE INVOKE")
 
+    # Resolves X-Tenant and routes the request's session to the tenant schema
+    app.before_request(tenant_middleware)
+
     app.register_blueprint(tenant_bp, url_prefix='/api/v1')
     app.register_blueprint(evaluation_bp, url_prefix='/api/v1')
     app.register_blueprint(user_bp, url_prefix='/api/v1')
@@ -71,6 +86,7 @@ def create_app():
     app.register_blueprint(role_bp, url_prefix='/api/v1')
     app.register_blueprint(permission_bp, url_prefix='/api/v1')
     app.register_blueprint(feedback_bp, url_prefix='/api/v1')
+    app.register_blueprint(import_bp, url_prefix='/api/v1')
 
 
 
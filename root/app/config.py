@@ -1,10 +1,110 @@
 import os
 from datetime import timedelta
 
+# root/ (the Lambda CodeUri), so bundled files resolve whatever the working directory
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class Config:
     #DATABASE CONFIGURATION
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
     # JWT CONFIGURATION
-    SECRET_KEY = os.getenv('SECRET_KEY', 'madagascar28!@#2024') 
\ No newline at end of file
+    SECRET_KEY = os.getenv('SECRET_KEY', 'madagascar28!@#2024') 
+    # werkzeug hash method (e.g. "scrypt:32768:8:1"); by default it depends on the Lambda memory size
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD')
+    ACCESS_TOKEN_EXPIRES_MINUTES = int(os.getenv('ACCESS_TOKEN_EXPIRES_MINUTES', 20))
+    # Sessions are extended with /refresh while the refresh token is used within this window
+    REFRESH_TOKEN_EXPIRES_DAYS = int(os.getenv('REFRESH_TOKEN_EXPIRES_DAYS', 7))
+
+    # STARTUP CONFIGURATION
+    # Defer heavy imports (boto3) until a route uses them
+    LAZY_IMPORTS = os.getenv('LAZY_IMPORTS', 'true').lower() == 'true'
+
+    # RESPONSE COMPRESSION CONFIGURATION
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    # Smaller bodies are sent as is: compressing them costs more than it saves
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))
+
+    # AWS CLIENTS CONFIGURATION
+    AWS_REGION = os.getenv('AWS_REGION')
+    AWS_RETRY_MODE = os.getenv('AWS_RETRY_MODE', 'standard')
+    AWS_MAX_ATTEMPTS = int(os.getenv('AWS_MAX_ATTEMPTS', 3))
+    AWS_CONNECT_TIMEOUT = float(os.getenv('AWS_CONNECT_TIMEOUT', 2))
+    AWS_READ_TIMEOUT = float(os.getenv('AWS_READ_TIMEOUT', 10))
+    # Model invocations take far longer than the other AWS calls
+    AWS_BEDROCK_READ_TIMEOUT = float(os.getenv('AWS_BEDROCK_READ_TIMEOUT', 60))
+    # Clients created during init, e.g. "sqs,bedrock-runtime" (none by default: boto3 stays lazy)
+    AWS_PREWARM_CLIENTS = [name for name in os.getenv('AWS_PREWARM_CLIENTS', '').split(',') if name]
+
+    # TENANT CACHE CONFIGURATION (seconds)
+    TENANT_CACHE_TTL = int(os.getenv('TENANT_CACHE_TTL', 300))
+    TENANT_CACHE_NEGATIVE_TTL = int(os.getenv('TENANT_CACHE_NEGATIVE_TTL', 30))
+
+    # PERMISSION CACHE CONFIGURATION (seconds)
+    # Bounds how long other containers keep serving permissions changed elsewhere
+    PERMISSION_CACHE_TTL = int(os.getenv('PERMISSION_CACHE_TTL', 60))
+    # Delay before other containers reject tokens issued for an older role or user
+    # version (role permissions changed, user moved to another role or deleted)
+    ROLE_VERSION_CACHE_TTL = int(os.getenv('ROLE_VERSION_CACHE_TTL', 30))
+
+    # ANSWERS NDJSON STREAMING CONFIGURATION
+    # Lines inserted per transaction; memory stays bounded by the batch, not by the upload
+    ANSWER_STREAM_BATCH_SIZE = int(os.getenv('ANSWER_STREAM_BATCH_SIZE', 500))
+    ANSWER_STREAM_MAX_LINE_BYTES = int(os.getenv('ANSWER_STREAM_MAX_LINE_BYTES', 65536))
+    # Largest upload accepted (API Gateway's payload limit). On Lambda the whole body
+    # arrives in the event, so this, not the batch size, bounds its memory
+    ANSWER_STREAM_MAX_BYTES = int(os.getenv('ANSWER_STREAM_MAX_BYTES', 10 * 1024 * 1024))
+    # Line errors kept in the report (the rest are only counted)
+    ANSWER_STREAM_MAX_ERRORS = int(os.getenv('ANSWER_STREAM_MAX_ERRORS', 1000))
+
+    # BULK IMPORT CONFIGURATION
+    # Row errors kept in the import report (the rest are only counted)
+    IMPORT_MAX_ERRORS = int(os.getenv('IMPORT_MAX_ERRORS', 1000))
+    # Longest NDJSON line / CSV header accepted
+    IMPORT_MAX_LINE_BYTES = int(os.getenv('IMPORT_MAX_LINE_BYTES', 65536))
+
+    # IDEMPOTENCY KEYS CONFIGURATION
+    # Retries with the same Idempotency-Key within this window replay the stored response
+    IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv('IDEMPOTENCY_KEY_TTL_HOURS', 24))
+    # Seconds after which a key left in progress (timed out invocation) may be claimed again
+    IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv('IDEMPOTENCY_LOCK_TIMEOUT', 60))
+
+    # FEEDBACK OUTBOX CONFIGURATION
+    # Messages claimed per SendMessageBatch round of the dispatcher
+    OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', 100))
+    # Seconds a claimed message stays hidden from other dispatchers (redelivered if not confirmed)
+    OUTBOX_LEASE_SECONDS = int(os.getenv('OUTBOX_LEASE_SECONDS', 300))
+    # Failed sends are retried after OUTBOX_RETRY_BASE_SECONDS * 2^(attempts - 1), at most 1 hour
+    OUTBOX_RETRY_BASE_SECONDS = int(os.getenv('OUTBOX_RETRY_BASE_SECONDS', 30))
+    # Messages failing this many times are marked 'dead' and no longer sent until requeued
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', 10))
+    # Try to send a message right after its transaction commits; the scheduled dispatcher is the fallback
+    OUTBOX_DISPATCH_ON_COMMIT = os.getenv('OUTBOX_DISPATCH_ON_COMMIT', 'true').lower() == 'true'
+
+    # FEEDBACK PROMPT CONFIGURATION (estimated tokens)
+    # Upper bound of the prompt sent to the model for one set of answers
+    PROMPT_MAX_TOKENS = int(os.getenv('PROMPT_MAX_TOKENS', 4000))
+    # Longest answer description kept before sharing the budget between answers
+    PROMPT_MAX_ANSWER_TOKENS = int(os.getenv('PROMPT_MAX_ANSWER_TOKENS', 500))
+
+    # QUESTION CACHE CONFIGURATION (seconds)
+    QUESTION_CACHE_TTL = int(os.getenv('QUESTION_CACHE_TTL', 3600))
+
+    # TENANT PROVISIONING CONFIGURATION
+    # Without a queue URL (e.g. sam local) tenants are provisioned inside the request
+    TENANT_PROVISIONING_QUEUE_URL = os.getenv('TENANT_PROVISIONING_QUEUE_URL')
+    # Scripts the template schema (and 'ddl' mode tenants) is built from; both must exist
+    TENANT_DDL_PATH = os.getenv('TENANT_DDL_PATH', os.path.join(BASE_DIR, 'db', 'assets', 'ddl-public.sql'))
+    TENANT_SEED_PATH = os.getenv('TENANT_SEED_PATH', os.path.join(BASE_DIR, 'db', 'assets', 'dml-public.sql'))
+    # 'clone' copies a versioned template schema, 'ddl' replays the scripts
+    TENANT_PROVISIONING_MODE = os.getenv('TENANT_PROVISIONING_MODE', 'clone')
+    # Seconds after which a job stuck in 'creating' may be claimed again
+    TENANT_PROVISIONING_STALE_AFTER = int(os.getenv('TENANT_PROVISIONING_STALE_AFTER', 900))
+
+    # TENANT MIGRATIONS CONFIGURATION
+    MIGRATIONS_PATH = os.getenv('MIGRATIONS_PATH', os.path.join(BASE_DIR, 'db', 'migrations'))
+    # Tenants migrated in parallel, each on its own connection
+    MIGRATION_WORKERS = int(os.getenv('MIGRATION_WORKERS', 4))
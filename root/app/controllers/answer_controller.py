@@ -1,9 +1,12 @@
-from flask import Blueprint, request
+from flask import Blueprint, g, request
 from flask_injector import inject
-from werkzeug.exceptions import BadRequest, NotFound
+from werkzeug.exceptions import BadRequest, NotFound, RequestEntityTooLarge
+from app.config import Config
 from app.services.answer_service import AnswerService
 from app.utils.api_response import ApiResponse
+from app.utils.idempotency_decorator import idempotent
 from app.utils.jwt_decorator import jwt_required 
+from app.utils.ndjson import iter_lines
 from app.utils.permission_decorator import requires_permission
 import logging
 
@@ -14,6 +17,7 @@ answer_bp = Blueprint('answers', __name__)
 @answer_bp.route('/answers', methods=['POST'])
 @jwt_required
 @requires_permission('create_answers') 
+@idempotent()
 @inject
 def create_answers(answer_service: AnswerService):
     try:
@@ -41,6 +45,45 @@ def create_answers(answer_service: AnswerService):
         return ApiResponse.internal_server_error()
 
 
+@answer_bp.route('/answers/stream', methods=['POST'])
+@jwt_required
+@requires_permission('create_answers')
+@inject
+def stream_answers(answer_service: AnswerService):
+    """
+    Endpoint para cargar respuestas en formato NDJSON (un objeto JSON por línea,
+    Content-Type: application/x-ndjson). El cuerpo se lee línea a línea y se
+    inserta por lotes; la respuesta es un reporte con los errores por línea.
+
+    En Lambda el adaptador ya recibe el cuerpo completo en el evento: la lectura
+    por líneas acota la memoria de las respuestas parseadas, no la del cuerpo,
+    que se limita con ANSWER_STREAM_MAX_BYTES: por Content-Length antes de leer y,
+    sin él (chunked), contando los bytes leídos. En el segundo caso la respuesta es
+    413 y los lotes insertados antes de pasar el límite quedan guardados.
+    """
+    try:
+        if request.mimetype != 'application/x-ndjson':
+            raise BadRequest("Content-Type must be application/x-ndjson.")
+        if request.content_length and request.content_length > Config.ANSWER_STREAM_MAX_BYTES:
+            raise RequestEntityTooLarge(f"The upload exceeds {Config.ANSWER_STREAM_MAX_BYTES} bytes.")
+
+        lines = iter_lines(request.stream, Config.ANSWER_STREAM_MAX_LINE_BYTES, Config.ANSWER_STREAM_MAX_BYTES)
+        report = answer_service.ingest_answers_stream(lines, default_user_id=g.current_user.get("user_id"))
+
+        message = "Answers imported." if not report["failed"] else "Answers imported with errors."
+        return ApiResponse.ok(result=report, message=message)
+
+    except RequestEntityTooLarge as e:
+        logger.warning(f"Upload too large: {e}")
+        return ApiResponse.bad_request(message=e.description, status=413)
+    except BadRequest as e:
+        logger.error(f"Bad request: {e}")
+        return ApiResponse.bad_request(message=str(e))
+    except Exception as e:
+        logger.error(f"Error streaming answers: {e}")
+        return ApiResponse.internal_server_error()
+
+
 @answer_bp.route('/answers/<int:answer_id>', methods=['GET'])
 @jwt_required
 @requires_permission('view_answer')
@@ -3,6 +3,7 @@ from flask_injector import inject
 from werkzeug.exceptions import BadRequest, NotFound
 from app.services.feedback_service import FeedbackService
 from app.utils.api_response import ApiResponse
+from app.utils.idempotency_decorator import idempotent
 from app.utils.jwt_decorator import jwt_required
 from app.utils.permission_decorator import requires_permission
 import logging
@@ -12,6 +13,8 @@ logger = logging.getLogger(__name__)
 feedback_bp = Blueprint('feedback', __name__)
 
 @feedback_bp.route('/feedback', methods=['POST'])
+# El worker reintenta con el messageId de SQS; el texto generado puede variar entre intentos
+@idempotent(fingerprint_fields=('id_evaluation', 'id_user'))
 def create_feedback(feedback_service: FeedbackService):
     """
     Endpoint para crear un nuevo feedback.
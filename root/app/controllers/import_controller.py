@@ -0,0 +1,77 @@
+from flask import Blueprint, g, request
+from flask_injector import inject
+from werkzeug.exceptions import BadRequest
+from app.config import Config
+from app.services.import_service import ImportService
+from app.utils.api_response import ApiResponse
+from app.utils.jwt_decorator import jwt_required
+from app.utils.ndjson import iter_lines
+from app.utils.permission_decorator import requires_permission
+import logging
+
+logger = logging.getLogger(__name__)
+
+import_bp = Blueprint('imports', __name__)
+
+ON_ERROR_MODES = ('abort', 'skip')
+
+
+def _run_import(entity_name, import_service):
+    """
+    Importa el cuerpo de la solicitud (text/csv con cabecera o application/x-ndjson)
+    en la entidad indicada. Con ?on_error=abort (por defecto) un archivo con errores
+    no inserta nada; con ?on_error=skip se insertan las filas válidas.
+    """
+    try:
+        on_error = request.args.get('on_error', 'abort')
+        if on_error not in ON_ERROR_MODES:
+            raise BadRequest(f"'on_error' must be one of: {', '.join(ON_ERROR_MODES)}.")
+        skip_invalid = on_error == 'skip'
+        performed_by = g.current_user.get("user_id")
+
+        if request.mimetype == 'text/csv':
+            report = import_service.import_csv(entity_name, request.stream, skip_invalid, performed_by)
+        elif request.mimetype == 'application/x-ndjson':
+            lines = iter_lines(request.stream, Config.IMPORT_MAX_LINE_BYTES)
+            report = import_service.import_ndjson(entity_name, lines, skip_invalid, performed_by)
+        else:
+            raise BadRequest("Content-Type must be text/csv or application/x-ndjson.")
+
+        if report["failed"] and not skip_invalid:
+            return ApiResponse.unprocessable_entity(
+                result=report, message=f"Import aborted: {report['failed']} invalid rows, nothing was imported."
+            )
+        message = "Import completed." if not report["failed"] else "Import completed, invalid rows were skipped."
+        return ApiResponse.ok(result=report, message=message)
+
+    except BadRequest as e:
+        logger.error(f"Bad request: {e}")
+        return ApiResponse.bad_request(message=str(e))
+    except Exception as e:
+        logger.error(f"Error importing {entity_name}: {e}")
+        return ApiResponse.internal_server_error()
+
+
+@import_bp.route('/imports/users', methods=['POST'])
+@jwt_required
+@requires_permission('create_users')
+@inject
+def import_users(import_service: ImportService):
+    """Importa usuarios; 'password' debe venir ya hasheada (scrypt o pbkdf2 de werkzeug)."""
+    return _run_import('users', import_service)
+
+
+@import_bp.route('/imports/questions', methods=['POST'])
+@jwt_required
+@requires_permission('create_questions')
+@inject
+def import_questions(import_service: ImportService):
+    return _run_import('questions', import_service)
+
+
+@import_bp.route('/imports/answers', methods=['POST'])
+@jwt_required
+@requires_permission('create_answers')
+@inject
+def import_answers(import_service: ImportService):
+    return _run_import('answers', import_service)
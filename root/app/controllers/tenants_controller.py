@@ -23,7 +23,8 @@ def create_tenant(tenant_service: TenantService):
             - schema_name (str): The schema name for the tenant.
 
     Returns:
-        JSON: The created tenant data or an error message.
+        JSON: The registered tenant (provisioning_status 'pending') or an error message.
+        The schema is provisioned asynchronously, see GET /tenants/<id>/provisioning.
     """
     try:
         data = request.get_json()
@@ -37,7 +38,11 @@ def create_tenant(tenant_service: TenantService):
 
         new_tenant = tenant_service.create_tenant(tenant_name, schema_name)
 
-        return ApiResponse.created(data=[new_tenant.as_dict()]) 
+        return ApiResponse.created(
+            result=[new_tenant.as_dict()],
+            message="Tenant registered. Schema provisioning in progress.",
+            status=202
+        )
 
     except BadRequest as e:
         return ApiResponse.bad_request(message=str(e))
@@ -89,6 +94,53 @@ def get_tenant_by_id(tenant_id, tenant_service: TenantService):
         return ApiResponse.internal_server_error()
 
 
+@tenant_bp.route('/tenants/<int:tenant_id>/provisioning', methods=['GET'])
+@inject
+def get_tenant_provisioning(tenant_id, tenant_service: TenantService):
+    """
+    Endpoint to retrieve the provisioning state of a tenant schema.
+
+    Args:
+        tenant_id (int): The ID of the tenant.
+
+    Returns:
+        JSON: The provisioning state (pending/creating/ready/failed) or an error message.
+    """
+    try:
+        tenant = tenant_service.get_provisioning_status(tenant_id)
+
+        return ApiResponse.ok(result=tenant.provisioning_as_dict())
+    except NotFound as e:
+        return ApiResponse.not_found(resource='tenant', resource_id=tenant_id)
+    except Exception as e:
+        logger.error(f"Error fetching provisioning status of tenant {tenant_id}: {e}")
+        return ApiResponse.internal_server_error()
+
+
+@tenant_bp.route('/tenants/<int:tenant_id>/provisioning', methods=['POST'])
+@inject
+def retry_tenant_provisioning(tenant_id, tenant_service: TenantService):
+    """
+    Endpoint to retry the provisioning of a tenant schema. It is idempotent:
+    ready tenants are left untouched and a running job is not duplicated.
+
+    Args:
+        tenant_id (int): The ID of the tenant.
+
+    Returns:
+        JSON: The provisioning state or an error message.
+    """
+    try:
+        tenant = tenant_service.retry_provisioning(tenant_id)
+
+        return ApiResponse.ok(result=tenant.provisioning_as_dict(), status=202)
+    except NotFound as e:
+        return ApiResponse.not_found(resource='tenant', resource_id=tenant_id)
+    except Exception as e:
+        logger.error(f"Error retrying provisioning of tenant {tenant_id}: {e}")
+        return ApiResponse.internal_server_error()
+
+
 @tenant_bp.route('/tenants/<int:tenant_id>', methods=['PUT'])
 @inject
 def update_tenant(tenant_id, tenant_service: TenantService):
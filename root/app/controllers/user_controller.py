@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify
 from flask_injector import inject
-from werkzeug.exceptions import BadRequest, NotFound
-from werkzeug.security import check_password_hash
+from werkzeug.exceptions import BadRequest, NotFound, Unauthorized
+from app.config import Config
+from app.services.refresh_token_service import RefreshTokenService
 from app.services.user_service import UserService
 from app.utils.api_response import ApiResponse
 from app.utils.jwt_utils import create_jwt_token
+from app.utils.password_policy import needs_rehash, verify_password
 from app.utils.jwt_decorator import jwt_required
 from app.utils.permission_decorator import requires_permission
 import logging
@@ -14,9 +16,9 @@ logger = logging.getLogger(__name__)
 user_bp = Blueprint('users', __name__)
 
 @user_bp.route('/login', methods=['POST'])
-def login(user_service: UserService):
+def login(user_service: UserService, refresh_token_service: RefreshTokenService):
     """
-    Endpoint to log in and generate a JWT token.
+    Endpoint to log in and generate a JWT access token and a refresh token.
     
     Expected JSON body:
         {
@@ -34,9 +36,13 @@ def login(user_service: UserService):
 
         user = user_service.get_user_by_username(username)
 
-        if user and check_password_hash(user.password, password):
-            token = create_jwt_token({"user_id": user.id, "username": user.username, "role": user.role_id})
-            return jsonify(access_token=token), 200
+        if user and verify_password(user.password, password):
+            if needs_rehash(user.password):
+                user_service.rehash_password(user, password)
+
+            token = create_jwt_token(user_service.get_token_claims(user), expires_in=Config.ACCESS_TOKEN_EXPIRES_MINUTES)
+            refresh_token = refresh_token_service.create_session(user.id)
+            return jsonify(access_token=token, refresh_token=refresh_token), 200
         else:
             return jsonify({"msg": "Invalid credentials"}), 401
 
@@ -47,6 +53,59 @@ def login(user_service: UserService):
         logger.error(f"Error during login: {e}")
         return ApiResponse.internal_server_error()
 
+@user_bp.route('/refresh', methods=['POST'])
+def refresh(refresh_token_service: RefreshTokenService):
+    """
+    Endpoint to exchange a refresh token for a new access token and refresh token.
+
+    Expected JSON body:
+        {
+            "refresh_token": "..."
+        }
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not data or not data.get('refresh_token'):
+            raise BadRequest("A refresh_token must be provided")
+
+        tokens = refresh_token_service.refresh(data['refresh_token'])
+        return jsonify(access_token=tokens['access_token'], refresh_token=tokens['refresh_token']), 200
+
+    except BadRequest as e:
+        logger.error(f"Bad request: {e}")
+        return ApiResponse.bad_request(message=str(e))
+    except Unauthorized as e:
+        logger.warning(f"Refresh rejected: {e.description}")
+        return jsonify({"msg": e.description}), 401
+    except Exception as e:
+        logger.error(f"Error during refresh: {e}")
+        return ApiResponse.internal_server_error()
+
+@user_bp.route('/logout', methods=['POST'])
+def logout(refresh_token_service: RefreshTokenService):
+    """
+    Endpoint to end a session: revokes the refresh token and every token rotated from the same login.
+
+    Expected JSON body:
+        {
+            "refresh_token": "..."
+        }
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not data or not data.get('refresh_token'):
+            raise BadRequest("A refresh_token must be provided")
+
+        refresh_token_service.revoke(data['refresh_token'])
+        return ApiResponse.ok(message="Session closed.")
+
+    except BadRequest as e:
+        logger.error(f"Bad request: {e}")
+        return ApiResponse.bad_request(message=str(e))
+    except Exception as e:
+        logger.error(f"Error during logout: {e}")
+        return ApiResponse.internal_server_error()
+
 @user_bp.route('/users', methods=['POST'])
 #@jwt_required
 #@requires_permission('create_users') 
@@ -1,10 +1,17 @@
 from flask import g, request, abort
-from sqlalchemy import text
 from app.models.tenants import Tenant
-from app.extensions import db
+from app.utils.tenant_cache import tenant_cache
+from app.utils.tenant_routing import route_to_schema
 
 EXCLUDED_PREFIXES = ['/api/v1/tenants']
 
+def _load_tenant(schema_name):
+    """
+    Looks up a tenant in the 'tenants' table of the public schema.
+    """
+    return Tenant.query.filter_by(schema_name=schema_name).first()
+
+
 def tenant_middleware():
     """
     Middleware to set the tenant schema for the current request, excluding routes that start with certain prefixes.
@@ -13,34 +20,32 @@ def tenant_middleware():
     if any(request.path.startswith(prefix) for prefix in EXCLUDED_PREFIXES):
         return  # Skip middleware logic for excluded routes
 
+    # CORS preflights carry no custom headers; flask_cors answers them
+    if request.method == 'OPTIONS':
+        return
+
     tenant_name = request.headers.get('X-Tenant')
 
     if not tenant_name:
         abort(400, description="Tenant name is required in the X-Tenant header")
 
-    # Perform tenant lookup in the "public" schema first
+    # Resolve the tenant from the container cache, querying the "public" schema only on a miss
     try:
-        # Ensure the search_path is set to 'public' to query the 'tenants' table
-        query_public_schema = text('SET search_path TO public')
-        db.session.execute(query_public_schema)
-
-        # Look for the tenant in the 'tenants' table within the public schema
-        tenant = Tenant.query.filter_by(schema_name=tenant_name).first()
+        tenant = tenant_cache.resolve(tenant_name, _load_tenant)
     except Exception as e:
         abort(500, description=f"Error querying tenant information: {str(e)}")
 
     if not tenant:
         abort(404, description=f"Tenant {tenant_name} not found")
 
-    schema_name = tenant.schema_name
+    if tenant.provisioning_status != Tenant.STATUS_READY:
+        abort(503, description=f"Tenant {tenant_name} is not ready (provisioning {tenant.provisioning_status})")
 
     try:
-        # Set the search_path to the tenant schema and 'public'
-        query_set_schema = text(f'SET search_path TO {schema_name}, public')
-        db.session.execute(query_set_schema)
+        # Bind the session to the tenant schema; pooled connections already on it skip the SET
+        route_to_schema(tenant.schema_name)
     except Exception as e:
-        db.session.rollback()
         abort(500, description=f"Error setting search path for tenant schema: {str(e)}")
 
-    # Store the current tenant in the request context (optional)
+    # Store the current tenant (a cached snapshot, not an ORM instance) in the request context
     g.current_tenant = tenant
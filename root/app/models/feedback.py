@@ -8,6 +8,8 @@ class Feedback(db.Model):
     id_evaluation = db.Column(db.Integer, db.ForeignKey('evaluations.id'), nullable=False)
     id_user = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     feedback_text = db.Column(db.Text, nullable=False)
+    # Clave del mensaje (outbox_id o messageId de SQS) con la que el worker lo guardó (FEEDBACK_SINK=database)
+    source_message_id = db.Column(db.String(100), nullable=True, unique=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
 
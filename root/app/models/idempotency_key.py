@@ -0,0 +1,32 @@
+from datetime import datetime
+from app import db
+
+class IdempotencyKey(db.Model):
+    __tablename__ = 'idempotency_keys'
+
+    STATUS_IN_PROGRESS = 'in_progress'
+    STATUS_COMPLETED = 'completed'
+
+    # Endpoint (método y regla de la ruta) al que pertenece la clave
+    scope = db.Column(db.String(255), primary_key=True)
+    idempotency_key = db.Column(db.String(255), primary_key=True)
+    # SHA-256 del usuario, la ruta y el cuerpo de la solicitud original
+    fingerprint = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default=STATUS_IN_PROGRESS)
+    response_status = db.Column(db.Integer, nullable=True)
+    response_body = db.Column(db.Text, nullable=True)
+    response_content_type = db.Column(db.String, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    def __init__(self, scope, idempotency_key, fingerprint, expires_at):
+        self.scope = scope
+        self.idempotency_key = idempotency_key
+        self.fingerprint = fingerprint
+        self.status = self.STATUS_IN_PROGRESS
+        self.expires_at = expires_at
+        self.created_at = datetime.utcnow()
+
+    def __repr__(self):
+        return f"<IdempotencyKey {self.scope} {self.idempotency_key}>"
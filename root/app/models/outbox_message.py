@@ -0,0 +1,29 @@
+from datetime import datetime
+from app import db
+
+class OutboxMessage(db.Model):
+    __tablename__ = 'outbox_messages'
+
+    STATUS_PENDING = 'pending'
+    # Agotó OUTBOX_MAX_ATTEMPTS: no se envía más hasta reencolarlo (outbox_dispatcher, replay_dead)
+    STATUS_DEAD = 'dead'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    # Cuerpo JSON del mensaje para la cola de feedback (SQS_QUEUE_URL)
+    message_body = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # El dispatcher toma el mensaje a partir de este momento (reintentos y mensajes en vuelo)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    status = db.Column(db.String(20), nullable=False, default=STATUS_PENDING)
+    last_error = db.Column(db.Text, nullable=True)
+
+    def __init__(self, message_body):
+        self.message_body = message_body
+        self.created_at = datetime.utcnow()
+        self.available_at = self.created_at
+        self.attempts = 0
+        self.status = self.STATUS_PENDING
+
+    def __repr__(self):
+        return f"<OutboxMessage {self.id}>"
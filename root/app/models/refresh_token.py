@@ -0,0 +1,44 @@
+from datetime import datetime
+from app import db
+
+class RefreshToken(db.Model):
+    __tablename__ = 'refresh_tokens'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    # SHA-256 del token: el token en claro solo lo conoce el cliente
+    token_hash = db.Column(db.String(64), nullable=False, unique=True)
+    # Todos los tokens obtenidos por rotación desde un mismo login comparten la familia
+    family_id = db.Column(db.String(36), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    parent_id = db.Column(db.Integer, nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    used_at = db.Column(db.DateTime, nullable=True)
+    revoked_at = db.Column(db.DateTime, nullable=True)
+    revoked_reason = db.Column(db.String, nullable=True)
+
+    user = db.relationship('User', lazy=True)
+
+    def __init__(self, token_hash, family_id, user_id, expires_at, parent_id=None):
+        self.token_hash = token_hash
+        self.family_id = family_id
+        self.user_id = user_id
+        self.expires_at = expires_at
+        self.parent_id = parent_id
+        self.created_at = datetime.utcnow()
+
+    def as_dict(self):
+        return {
+            "id": self.id,
+            "family_id": self.family_id,
+            "user_id": self.user_id,
+            "parent_id": self.parent_id,
+            "expires_at": self.expires_at,
+            "created_at": self.created_at,
+            "used_at": self.used_at,
+            "revoked_at": self.revoked_at,
+            "revoked_reason": self.revoked_reason
+        }
+
+    def __repr__(self):
+        return f"<RefreshToken {self.id} family={self.family_id}>"
@@ -8,6 +8,8 @@ class Role(db.Model):
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     role_name = db.Column(db.String, nullable=False)
+    # Se incrementa cuando cambian los permisos del rol (revoca los tokens emitidos antes)
+    permissions_version = db.Column(db.Integer, nullable=False, default=1)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
 
@@ -16,6 +18,7 @@ class Role(db.Model):
 
     def __init__(self, role_name):
         self.role_name = role_name
+        self.permissions_version = 1
         self.created_at = datetime.utcnow()
 
     def as_dict(self):
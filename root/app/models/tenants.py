@@ -3,23 +3,52 @@ from app import db
 
 class Tenant(db.Model):
     __tablename__ = 'tenants'
+    # The registry always lives in 'public', whatever schema the session is routed to
+    __table_args__ = {'schema': 'public'}
+
+    # Provisioning states of the tenant schema
+    STATUS_PENDING = 'pending'
+    STATUS_CREATING = 'creating'
+    STATUS_READY = 'ready'
+    STATUS_FAILED = 'failed'
     
     tenant_id = db.Column(db.Integer, primary_key=True)
     tenant_name = db.Column(db.String(255), nullable=False)
     schema_name = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    provisioning_status = db.Column(db.String(16), nullable=False, default=STATUS_PENDING)
+    provisioning_error = db.Column(db.Text, nullable=True)
+    provisioning_updated_at = db.Column(db.DateTime, nullable=True)
+    # Last migration of MIGRATIONS_PATH applied to the tenant schema
+    schema_version = db.Column(db.Integer, nullable=False, default=0)
+    migrated_at = db.Column(db.DateTime, nullable=True)
+    migration_error = db.Column(db.Text, nullable=True)
     
-    def __init__(self, tenant_name, schema_name, created_at=None):
+    def __init__(self, tenant_name, schema_name, created_at=None, provisioning_status=STATUS_PENDING):
         self.tenant_name = tenant_name
         self.schema_name = schema_name
         self.created_at = created_at or datetime.utcnow()
+        self.provisioning_status = provisioning_status
+        self.provisioning_updated_at = self.created_at
+        self.schema_version = 0
 
     def as_dict(self):
         return {
             "tenant_id": self.tenant_id,
             "tenant_name": self.tenant_name,
             "schema_name": self.schema_name,
-            "created_at": self.created_at
+            "created_at": self.created_at,
+            "provisioning_status": self.provisioning_status,
+            "schema_version": self.schema_version
+        }
+
+    def provisioning_as_dict(self):
+        return {
+            "tenant_id": self.tenant_id,
+            "schema_name": self.schema_name,
+            "status": self.provisioning_status,
+            "error": self.provisioning_error,
+            "updated_at": self.provisioning_updated_at
         }
 
     def __repr__(self):
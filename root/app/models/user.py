@@ -14,6 +14,8 @@ class User(db.Model):
     updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
     # Clave foránea que referencia a la tabla roles
     role_id = db.Column(db.Integer, db.ForeignKey('roles.id'), nullable=False)
+    # Se incrementa al cambiar el rol o la contraseña (revoca los tokens emitidos antes)
+    token_version = db.Column(db.Integer, nullable=False, default=1)
     
     # Relación con el modelo Role
     role = db.relationship('Role', backref='users', lazy=True)
@@ -25,6 +27,7 @@ class User(db.Model):
         self.mail = mail
         self.dni = dni
         self.role_id = role_id  # Asignar el rol
+        self.token_version = 1
         self.created_at = created_at or datetime.utcnow()
 
     def as_dict(self):
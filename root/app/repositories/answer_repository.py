@@ -1,3 +1,5 @@
+from datetime import datetime
+from sqlalchemy import insert
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
 from app.models.answers import Answer
@@ -24,6 +26,69 @@ class AnswerRepository:
             db.session.rollback()
             raise e
 
+    @staticmethod
+    def create_answers(answers_data, outbox_messages=()):
+        """
+        Crea varias respuestas con un único INSERT multi-fila ... RETURNING en una sola
+        transacción: se guardan todas o ninguna.
+
+        Parameters:
+            answers_data (list[dict]): Respuestas con answer_description, id_evaluation,
+                id_question, id_user y score (opcional).
+            outbox_messages (list[OutboxMessage]): Mensajes SQS que se guardan en el
+                outbox en la misma transacción; al volver tienen su id asignado.
+
+        Returns:
+            list[Answer]: Las respuestas creadas, en el orden recibido.
+        """
+        try:
+            created_at = datetime.utcnow()
+            rows = [
+                {
+                    "answer_description": answer_data.get('answer_description'),
+                    "id_evaluation": answer_data.get('id_evaluation'),
+                    "id_question": answer_data.get('id_question'),
+                    "id_user": answer_data.get('id_user'),
+                    "score": answer_data.get('score'),
+                    "created_at": created_at
+                }
+                for answer_data in answers_data
+            ]
+            new_answers = db.session.scalars(
+                insert(Answer).returning(Answer, sort_by_parameter_order=True), rows
+            ).all()
+
+            # Se separan de la sesión antes del commit para que no se vuelvan a leer una a una
+            for new_answer in new_answers:
+                db.session.expunge(new_answer)
+            # El flush asigna el id de los mensajes del outbox, que se separan igual
+            db.session.add_all(outbox_messages)
+            db.session.flush()
+            for outbox_message in outbox_messages:
+                db.session.expunge(outbox_message)
+            db.session.commit()
+            return new_answers
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def insert_answers_batch(rows):
+        """
+        Inserta un lote de respuestas (diccionarios con las columnas) en una transacción,
+        sin cargar los objetos creados.
+
+        Returns:
+            int: El número de respuestas insertadas.
+        """
+        try:
+            db.session.execute(insert(Answer), rows)
+            db.session.commit()
+            return len(rows)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
     @staticmethod
     def get_answer_by_id(answer_id):
         """
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.extensions import db
+from app.models.idempotency_key import IdempotencyKey
+
+class IdempotencyRepository:
+
+    @staticmethod
+    def claim_key(scope, idempotency_key, fingerprint, expires_at, lock_timeout):
+        """
+        Registra una clave como en curso. Las claves vencidas, y las que quedaron
+        en curso por más de `lock_timeout` segundos (e.g. una invocación que
+        agotó su tiempo), se vuelven a reclamar.
+
+        Returns:
+            bool: True si se reclamó la clave, False si ya estaba registrada.
+        """
+        try:
+            now = datetime.utcnow()
+            IdempotencyKey.query.filter(
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.idempotency_key == idempotency_key,
+                or_(
+                    IdempotencyKey.expires_at < now,
+                    and_(
+                        IdempotencyKey.status == IdempotencyKey.STATUS_IN_PROGRESS,
+                        IdempotencyKey.created_at < now - timedelta(seconds=lock_timeout)
+                    )
+                )
+            ).delete(synchronize_session=False)
+
+            db.session.add(IdempotencyKey(scope, idempotency_key, fingerprint, expires_at))
+            db.session.commit()
+            return True
+        except IntegrityError:
+            # La clave primaria (scope, clave) ya existe: una solicitud anterior o concurrente
+            db.session.rollback()
+            return False
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def get_key(scope, idempotency_key):
+        try:
+            return db.session.get(IdempotencyKey, (scope, idempotency_key))
+        except SQLAlchemyError as e:
+            raise e
+
+    @staticmethod
+    def complete_key(scope, idempotency_key, response_status, response_body, response_content_type):
+        """Guarda la respuesta de la solicitud que reclamó la clave."""
+        try:
+            IdempotencyKey.query.filter_by(scope=scope, idempotency_key=idempotency_key).update({
+                IdempotencyKey.status: IdempotencyKey.STATUS_COMPLETED,
+                IdempotencyKey.response_status: response_status,
+                IdempotencyKey.response_body: response_body,
+                IdempotencyKey.response_content_type: response_content_type,
+                IdempotencyKey.completed_at: datetime.utcnow()
+            }, synchronize_session=False)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def release_key(scope, idempotency_key):
+        """Elimina la clave de una solicitud fallida, para que un reintento vuelva a ejecutarla."""
+        try:
+            db.session.rollback()
+            IdempotencyKey.query.filter_by(scope=scope, idempotency_key=idempotency_key).delete(synchronize_session=False)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
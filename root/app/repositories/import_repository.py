@@ -0,0 +1,204 @@
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from app.extensions import db
+from app.utils.lazy_import import lazy_import
+
+# Los errores de COPY vienen del cursor de psycopg2, sin envolver por SQLAlchemy
+psycopg2 = lazy_import("psycopg2")
+
+STAGING_TABLE = 'import_staging'
+
+_INTEGER = r"'^[0-9]{1,9}$'"
+_NUMBER = r"'^-?[0-9]+(\.[0-9]+)?$'"
+# Hashes que check_password_hash de werkzeug puede verificar (método$salt$hash),
+# con el largo en hex que produce cada método. Sin "(:" delante de un nombre: text()
+# lo tomaría como parámetro
+_PASSWORD_HASH_FORMATS = (
+    r"scrypt(:[1-9][0-9]*:[1-9][0-9]*:[1-9][0-9]*)?\$[A-Za-z0-9]+\$[0-9a-f]{128}",
+    r"pbkdf2\$[A-Za-z0-9]+\$[0-9a-f]{64}",
+    r"pbkdf2:sha256(:[1-9][0-9]*)?\$[A-Za-z0-9]+\$[0-9a-f]{64}",
+    r"pbkdf2:sha512(:[1-9][0-9]*)?\$[A-Za-z0-9]+\$[0-9a-f]{128}",
+    r"pbkdf2:sha1(:[1-9][0-9]*)?\$[A-Za-z0-9]+\$[0-9a-f]{40}",
+)
+_PASSWORD_HASH = "'^(" + "|".join(_PASSWORD_HASH_FORMATS) + ")$'"
+
+
+def _as_integer(column):
+    # CASE garantiza que el cast solo se evalúe sobre valores válidos
+    return f"(CASE WHEN s.{column} ~ {_INTEGER} THEN s.{column}::integer END)"
+
+
+def _duplicated_in_file(column):
+    # Ventana en vez de un EXISTS correlacionado: la tabla de staging no tiene índices
+    return (
+        f"s.row_number IN (SELECT d.row_number FROM (SELECT row_number, "
+        f"row_number() OVER (PARTITION BY {column} ORDER BY row_number) AS occurrence "
+        f"FROM {STAGING_TABLE} WHERE error IS NULL) d WHERE d.occurrence > 1)"
+    )
+
+
+ImportEntity = namedtuple('ImportEntity', ['table', 'columns', 'required', 'checks', 'insert_columns', 'select_columns'])
+
+# Columnas (en texto) que acepta cada importación, validaciones por conjunto
+# (mensaje, condición sobre la fila s de staging) en orden, y cómo se insertan
+IMPORT_ENTITIES = {
+    'users': ImportEntity(
+        table='users',
+        columns=('username', 'password', 'full_name', 'mail', 'dni', 'role_id'),
+        required=('username', 'password', 'full_name', 'mail', 'dni', 'role_id'),
+        checks=(
+            ("'role_id' must be a positive integer", f"s.role_id !~ {_INTEGER}"),
+            ("'password' must be a werkzeug password hash (scrypt or pbkdf2)", f"s.password !~ {_PASSWORD_HASH}"),
+            ("Role does not exist", f"NOT EXISTS (SELECT 1 FROM roles r WHERE r.id = {_as_integer('role_id')})"),
+            ("Duplicated 'username' in the file", _duplicated_in_file('username')),
+            ("Duplicated 'mail' in the file", _duplicated_in_file('mail')),
+            ("Duplicated 'dni' in the file", _duplicated_in_file('dni')),
+            ("Username already exists", "EXISTS (SELECT 1 FROM users u WHERE u.username = s.username)"),
+            ("Mail already exists", "EXISTS (SELECT 1 FROM users u WHERE u.mail = s.mail)"),
+            ("DNI already exists", "EXISTS (SELECT 1 FROM users u WHERE u.dni = s.dni)"),
+        ),
+        insert_columns=('username', 'password', 'full_name', 'mail', 'dni', 'role_id', 'created_at'),
+        select_columns=('s.username', 's.password', 's.full_name', 's.mail', 's.dni', 's.role_id::integer', ':created_at'),
+    ),
+    'questions': ImportEntity(
+        table='questions',
+        columns=('name', 'value', 'id_evaluation'),
+        required=('name', 'value', 'id_evaluation'),
+        checks=(
+            ("'value' must be a number", f"s.value !~ {_NUMBER}"),
+            ("'id_evaluation' must be a positive integer", f"s.id_evaluation !~ {_INTEGER}"),
+            ("Evaluation does not exist",
+             f"NOT EXISTS (SELECT 1 FROM evaluations e WHERE e.id = {_as_integer('id_evaluation')})"),
+        ),
+        insert_columns=('name', 'value', 'id_evaluation', 'created_at'),
+        select_columns=('s.name', 's.value::float', 's.id_evaluation::integer', ':created_at'),
+    ),
+    'answers': ImportEntity(
+        table='answers',
+        columns=('answer_description', 'id_evaluation', 'id_question', 'id_user', 'score'),
+        required=('answer_description', 'id_evaluation', 'id_question', 'id_user'),
+        checks=(
+            ("'id_evaluation' must be a positive integer", f"s.id_evaluation !~ {_INTEGER}"),
+            ("'id_question' must be a positive integer", f"s.id_question !~ {_INTEGER}"),
+            ("'id_user' must be a positive integer", f"s.id_user !~ {_INTEGER}"),
+            ("'score' must be a number", f"btrim(s.score) <> '' AND s.score !~ {_NUMBER}"),
+            ("Question does not exist",
+             f"NOT EXISTS (SELECT 1 FROM questions q WHERE q.id = {_as_integer('id_question')})"),
+            ("Question does not belong to the evaluation",
+             f"NOT EXISTS (SELECT 1 FROM questions q WHERE q.id = {_as_integer('id_question')}"
+             f" AND q.id_evaluation = {_as_integer('id_evaluation')})"),
+            ("User does not exist", f"NOT EXISTS (SELECT 1 FROM users u WHERE u.id = {_as_integer('id_user')})"),
+        ),
+        insert_columns=('answer_description', 'id_evaluation', 'id_question', 'id_user', 'score', 'created_at'),
+        select_columns=(
+            's.answer_description', 's.id_evaluation::integer', 's.id_question::integer', 's.id_user::integer',
+            "NULLIF(btrim(s.score), '')::float", ':created_at'
+        ),
+    ),
+}
+
+
+class ImportRepository:
+
+    @staticmethod
+    def import_rows(entity_name, source, columns, skip_invalid=False, max_errors=1000):
+        """
+        Importa filas a una tabla del tenant en una sola transacción:
+
+        1. COPY del archivo (CSV, columnas `columns`) a una tabla temporal de staging.
+        2. Validación por conjunto con UPDATEs que marcan el error de cada fila.
+        3. INSERT ... SELECT de las filas válidas en la tabla real, en el orden del archivo.
+
+        Si hay filas con errores y no se pide `skip_invalid`, no se inserta nada.
+        La conexión ya está fijada al schema del tenant (search_path).
+
+        Parameters:
+            entity_name (str): 'users', 'questions' o 'answers'.
+            source: Objeto tipo archivo (read) con las filas en CSV, sin cabecera.
+            columns (tuple[str]): Columnas de staging en el orden del archivo; puede
+                incluir 'row_number' y 'error' (filas ya numeradas o con error de parseo).
+            skip_invalid (bool): Insertar las filas válidas aunque otras fallen.
+            max_errors (int): Errores de fila devueltos (el resto solo se cuenta).
+
+        Returns:
+            dict: received, inserted, failed, errors (lista de {row, error}) y
+            evaluations (IDs de evaluación de las filas insertadas).
+        """
+        entity = IMPORT_ENTITIES[entity_name]
+        staging_columns = ', '.join(f"{column} TEXT" for column in entity.columns)
+        try:
+            session = db.session
+            session.execute(text(
+                f"CREATE TEMP TABLE {STAGING_TABLE} ("
+                f"row_number BIGINT GENERATED BY DEFAULT AS IDENTITY, {staging_columns}, error TEXT"
+                f") ON COMMIT DROP"
+            ))
+
+            # COPY necesita el cursor de psycopg2 de la conexión de la sesión (misma transacción)
+            cursor = session.connection().connection.cursor()
+            try:
+                cursor.copy_expert(
+                    f"COPY {STAGING_TABLE} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", source
+                )
+                received = cursor.rowcount
+            finally:
+                cursor.close()
+            # Las tablas temporales no se analizan solas: estadísticas para los joins de validación
+            session.execute(text(f"ANALYZE {STAGING_TABLE}"))
+
+            ImportRepository._mark_invalid_rows(session, entity)
+
+            failed = session.execute(text(
+                f"SELECT count(*) FROM {STAGING_TABLE} WHERE error IS NOT NULL"
+            )).scalar()
+            errors = [
+                {"row": row.row_number, "error": row.error}
+                for row in session.execute(text(
+                    f"SELECT row_number, error FROM {STAGING_TABLE} WHERE error IS NOT NULL "
+                    f"ORDER BY row_number LIMIT :limit"
+                ), {"limit": max_errors})
+            ]
+
+            if failed and not skip_invalid:
+                db.session.rollback()
+                return {"received": received, "inserted": 0, "failed": failed, "errors": errors, "evaluations": []}
+
+            evaluations = []
+            if 'id_evaluation' in entity.columns:
+                evaluations = session.execute(text(
+                    f"SELECT DISTINCT id_evaluation::integer FROM {STAGING_TABLE} WHERE error IS NULL"
+                )).scalars().all()
+
+            inserted = session.execute(text(
+                f"INSERT INTO {entity.table} ({', '.join(entity.insert_columns)}) "
+                f"SELECT {', '.join(entity.select_columns)} FROM {STAGING_TABLE} s "
+                f"WHERE s.error IS NULL ORDER BY s.row_number"
+            ), {"created_at": datetime.utcnow()}).rowcount
+
+            db.session.commit()
+            return {
+                "received": received, "inserted": inserted, "failed": failed, "errors": errors, "evaluations": evaluations
+            }
+        except (SQLAlchemyError, psycopg2.Error) as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def _mark_invalid_rows(session, entity):
+        """Marca en staging el primer error de cada fila; las validaciones corren sobre todo el archivo."""
+        missing = ', '.join(
+            f"CASE WHEN coalesce(btrim(s.{column}), '') = '' THEN '{column}' END" for column in entity.required
+        )
+        any_missing = ' OR '.join(f"coalesce(btrim(s.{column}), '') = ''" for column in entity.required)
+        session.execute(text(
+            f"UPDATE {STAGING_TABLE} s SET error = 'Missing required field(s): ' || concat_ws(', ', {missing}) "
+            f"WHERE s.error IS NULL AND ({any_missing})"
+        ))
+
+        for message, condition in entity.checks:
+            session.execute(
+                text(f"UPDATE {STAGING_TABLE} s SET error = :message WHERE s.error IS NULL AND ({condition})"),
+                {"message": message}
+            )
@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from app.extensions import db
+from app.models.outbox_message import OutboxMessage
+
+class OutboxRepository:
+
+    @staticmethod
+    def claim_messages(limit, lease_seconds, message_ids=None):
+        """
+        Toma hasta `limit` mensajes pendientes, en orden de creación, y los aparta
+        durante `lease_seconds` (available_at) contando un intento más. Los mensajes
+        tomados por otro dispatcher se saltan (FOR UPDATE SKIP LOCKED); si el
+        dispatcher termina sin confirmarlos, vuelven a estar disponibles al vencer
+        el plazo (entrega al menos una vez).
+
+        Parameters:
+            message_ids (list[int]): Si se indica, solo se toman esos mensajes.
+
+        Returns:
+            list: Filas (id, message_body, attempts) de los mensajes tomados.
+        """
+        try:
+            now = datetime.utcnow()
+            pending = (
+                select(OutboxMessage.id)
+                .where(OutboxMessage.status == OutboxMessage.STATUS_PENDING, OutboxMessage.available_at <= now)
+                .order_by(OutboxMessage.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            if message_ids is not None:
+                pending = pending.where(OutboxMessage.id.in_(list(message_ids)))
+            claimed = db.session.execute(
+                update(OutboxMessage)
+                .where(OutboxMessage.id.in_(pending.scalar_subquery()))
+                .values(available_at=now + timedelta(seconds=lease_seconds), attempts=OutboxMessage.attempts + 1)
+                .returning(OutboxMessage.id, OutboxMessage.message_body, OutboxMessage.attempts),
+                execution_options={"synchronize_session": False}
+            ).all()
+            db.session.commit()
+            return sorted(claimed, key=lambda message: message.id)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def delete_messages(message_ids):
+        """Elimina los mensajes ya enviados."""
+        try:
+            db.session.execute(
+                OutboxMessage.__table__.delete().where(OutboxMessage.id.in_(list(message_ids)))
+            )
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def reschedule_messages(failures):
+        """
+        Registra el error de los mensajes que no se pudieron enviar y los deja
+        disponibles de nuevo a partir de la fecha indicada.
+
+        Parameters:
+            failures (list[tuple]): (id, error, available_at) de cada mensaje.
+        """
+        try:
+            for message_id, error, available_at in failures:
+                db.session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id == message_id)
+                    .values(last_error=error, available_at=available_at),
+                    execution_options={"synchronize_session": False}
+                )
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def mark_dead(failures):
+        """
+        Marca como 'dead' los mensajes que agotaron sus intentos, con su último
+        error. Quedan en la tabla, fuera del envío, hasta que se reencolan.
+
+        Parameters:
+            failures (list[tuple]): (id, error) de cada mensaje.
+        """
+        try:
+            for message_id, error in failures:
+                db.session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id == message_id)
+                    .values(status=OutboxMessage.STATUS_DEAD, last_error=error),
+                    execution_options={"synchronize_session": False}
+                )
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def count_dead():
+        """Cantidad de mensajes en estado 'dead'."""
+        try:
+            return db.session.scalar(
+                select(func.count()).select_from(OutboxMessage).where(OutboxMessage.status == OutboxMessage.STATUS_DEAD)
+            )
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def requeue_dead():
+        """
+        Vuelve a poner pendientes los mensajes 'dead', con los intentos en cero y
+        disponibles de inmediato (e.g. después de corregir la causa del error).
+
+        Returns:
+            int: Cantidad de mensajes reencolados.
+        """
+        try:
+            result = db.session.execute(
+                update(OutboxMessage)
+                .where(OutboxMessage.status == OutboxMessage.STATUS_DEAD)
+                .values(status=OutboxMessage.STATUS_PENDING, attempts=0, available_at=datetime.utcnow()),
+                execution_options={"synchronize_session": False}
+            )
+            db.session.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
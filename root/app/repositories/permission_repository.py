@@ -1,7 +1,11 @@
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
 from app.models.permissions import Permission
+from app.models.role_permissions import role_permissions
 from app.models.roles import Role
+from app.models.user import User
+from app.utils.permission_cache import CachedPermissions, permission_cache, permission_catalog_cache
+from app.utils.tenant_routing import current_schema
 
 
 class PermissionRepository:
@@ -28,6 +32,7 @@ class PermissionRepository:
             new_permission = Permission(name=permission_name, description=description)
             db.session.add(new_permission)
             db.session.commit()
+            permission_catalog_cache.invalidate(current_schema())
             return new_permission
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -99,6 +104,9 @@ class PermissionRepository:
             if description:
                 permission.description = description
             db.session.commit()
+            if permission_name:
+                permission_cache.invalidate_tenant(current_schema())
+                permission_catalog_cache.invalidate(current_schema())
             return permission
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -123,7 +131,47 @@ class PermissionRepository:
                 return None
             db.session.delete(permission)
             db.session.commit()
+            permission_cache.invalidate_tenant(current_schema())
+            permission_catalog_cache.invalidate(current_schema())
             return permission
         except SQLAlchemyError as e:
             db.session.rollback()
+            raise e
+
+    @staticmethod
+    def get_user_permissions(user_id):
+        """
+        Recupera el rol y los nombres de los permisos de un usuario en una sola consulta.
+
+        Parameters:
+            user_id (int): El ID del usuario.
+
+        Returns:
+            CachedPermissions or None: El rol y el conjunto de permisos, o None si el usuario no existe.
+        """
+        try:
+            rows = (
+                db.session.query(User.role_id, Permission.name)
+                .outerjoin(role_permissions, role_permissions.c.role_id == User.role_id)
+                .outerjoin(Permission, Permission.id == role_permissions.c.permission_id)
+                .filter(User.id == user_id)
+                .all()
+            )
+            if not rows:
+                return None
+            return CachedPermissions(rows[0].role_id, frozenset(row.name for row in rows if row.name is not None))
+        except SQLAlchemyError as e:
+            raise e
+
+    @staticmethod
+    def get_permission_catalog():
+        """
+        Recupera el catálogo de permisos como un diccionario nombre -> ID.
+
+        Returns:
+            dict: Los IDs de los permisos por nombre.
+        """
+        try:
+            return {row.name: row.id for row in db.session.query(Permission.name, Permission.id).all()}
+        except SQLAlchemyError as e:
             raise e
\ No newline at end of file
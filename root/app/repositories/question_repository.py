@@ -1,6 +1,9 @@
+from sqlalchemy import or_
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
 from app.models.questions import Question
+from app.utils.question_cache import question_cache
+from app.utils.tenant_routing import current_schema
 
 class QuestionRepository:
 
@@ -13,6 +16,7 @@ class QuestionRepository:
             new_question = Question(name=name, value=value, id_evaluation=id_evaluation)
             db.session.add(new_question)
             db.session.commit()
+            question_cache.invalidate(current_schema(), id_evaluation)
             return new_question
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -28,6 +32,39 @@ class QuestionRepository:
         except SQLAlchemyError as e:
             raise e
 
+    @staticmethod
+    def get_question_names(id_evaluation, question_ids):
+        """
+        Devuelve en una sola consulta el ID, el nombre y la evaluación de las preguntas
+        de una evaluación y de las preguntas indicadas (IN (...)).
+        """
+        try:
+            return (
+                db.session.query(Question.id, Question.name, Question.id_evaluation)
+                .filter(or_(Question.id_evaluation == id_evaluation, Question.id.in_(list(question_ids))))
+                .all()
+            )
+        except SQLAlchemyError as e:
+            raise e
+
+    @staticmethod
+    def get_question_evaluations(question_ids):
+        """
+        Devuelve la evaluación de cada pregunta indicada, en una sola consulta.
+
+        Returns:
+            dict: El ID de la evaluación por ID de pregunta (las preguntas inexistentes no aparecen).
+        """
+        try:
+            rows = (
+                db.session.query(Question.id, Question.id_evaluation)
+                .filter(Question.id.in_(list(question_ids)))
+                .all()
+            )
+            return {row.id: row.id_evaluation for row in rows}
+        except SQLAlchemyError as e:
+            raise e
+
     @staticmethod
     def get_questions_paginated(page, per_page, name=None):
         """
@@ -58,6 +95,8 @@ class QuestionRepository:
             if question is None:
                 return None
 
+            previous_evaluation = question.id_evaluation
+
             # Actualizar los campos proporcionados
             if name:
                 question.name = name
@@ -67,6 +106,7 @@ class QuestionRepository:
                 question.id_evaluation = id_evaluation
 
             db.session.commit()
+            question_cache.invalidate(current_schema(), previous_evaluation, id_evaluation or previous_evaluation)
             return question
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -84,6 +124,7 @@ class QuestionRepository:
 
             db.session.delete(question)
             db.session.commit()
+            question_cache.invalidate(current_schema(), question.id_evaluation)
             return question
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -0,0 +1,137 @@
+from datetime import datetime
+from sqlalchemy.exc import SQLAlchemyError
+from app.extensions import db
+from app.models.refresh_token import RefreshToken
+
+class RefreshTokenRepository:
+
+    @staticmethod
+    def create_token(token_hash, family_id, user_id, expires_at, parent_id=None, commit=True):
+        """
+        Stores a new refresh token.
+
+        Parameters:
+            token_hash (str): The SHA-256 of the token.
+            family_id (str): The family (login session) of the token.
+            user_id (int): The owner of the token.
+            expires_at (datetime): The expiration date.
+            parent_id (int, optional): The token this one was rotated from.
+            commit (bool): Whether to commit the transaction.
+
+        Returns:
+            RefreshToken: The stored token.
+        """
+        try:
+            new_token = RefreshToken(
+                token_hash=token_hash,
+                family_id=family_id,
+                user_id=user_id,
+                expires_at=expires_at,
+                parent_id=parent_id
+            )
+            db.session.add(new_token)
+            if commit:
+                db.session.commit()
+            return new_token
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def get_token_by_hash(token_hash):
+        """
+        Retrieves a refresh token by its hash.
+
+        Returns:
+            RefreshToken or None: The token if found, otherwise None.
+        """
+        try:
+            return RefreshToken.query.filter_by(token_hash=token_hash).first()
+        except SQLAlchemyError as e:
+            raise e
+
+    @staticmethod
+    def mark_as_used(token_id):
+        """
+        Marks a token as used, only if it was still unused and not revoked.
+        The change is flushed but not committed.
+
+        Returns:
+            bool: True if this call consumed the token, False if it was already used or revoked.
+        """
+        try:
+            updated = RefreshToken.query.filter(
+                RefreshToken.id == token_id,
+                RefreshToken.used_at.is_(None),
+                RefreshToken.revoked_at.is_(None)
+            ).update({RefreshToken.used_at: datetime.utcnow()}, synchronize_session=False)
+            return updated == 1
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def revoke_family(family_id, reason, commit=True):
+        """
+        Revokes every active token of a family.
+
+        Returns:
+            int: The number of revoked tokens.
+        """
+        try:
+            revoked = RefreshToken.query.filter(
+                RefreshToken.family_id == family_id,
+                RefreshToken.revoked_at.is_(None)
+            ).update(
+                {RefreshToken.revoked_at: datetime.utcnow(), RefreshToken.revoked_reason: reason},
+                synchronize_session=False
+            )
+            if commit:
+                db.session.commit()
+            return revoked
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def revoke_user_tokens(user_id, reason, commit=True):
+        """
+        Revokes every active token of a user.
+
+        Returns:
+            int: The number of revoked tokens.
+        """
+        try:
+            revoked = RefreshToken.query.filter(
+                RefreshToken.user_id == user_id,
+                RefreshToken.revoked_at.is_(None)
+            ).update(
+                {RefreshToken.revoked_at: datetime.utcnow(), RefreshToken.revoked_reason: reason},
+                synchronize_session=False
+            )
+            if commit:
+                db.session.commit()
+            return revoked
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def delete_expired_tokens(user_id, commit=True):
+        """
+        Deletes the expired tokens of a user.
+
+        Returns:
+            int: The number of deleted tokens.
+        """
+        try:
+            deleted = RefreshToken.query.filter(
+                RefreshToken.user_id == user_id,
+                RefreshToken.expires_at < datetime.utcnow()
+            ).delete(synchronize_session=False)
+            if commit:
+                db.session.commit()
+            return deleted
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
@@ -2,6 +2,9 @@ from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
 from app.models.roles import Role
 from app.models.permissions import Permission  # Importar el modelo de permisos
+from app.models.role_permissions import role_permissions
+from app.utils.permission_cache import permission_cache, role_version_cache
+from app.utils.tenant_routing import current_schema
 
 class RoleRepository:
 
@@ -44,7 +47,13 @@ class RoleRepository:
                 if permission:
                     role.permissions.append(permission)
 
+            # Revoca los tokens emitidos con los permisos anteriores
+            role.permissions_version = (role.permissions_version or 1) + 1
+
             db.session.commit()
+            # Los permisos del rol cambian para todos sus usuarios
+            permission_cache.invalidate_tenant(current_schema())
+            role_version_cache.invalidate(current_schema(), role_id)
             return role
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -112,7 +121,40 @@ class RoleRepository:
 
             db.session.delete(role)
             db.session.commit()
+            permission_cache.invalidate_tenant(current_schema())
+            role_version_cache.invalidate(current_schema(), role_id)
             return role
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
+
+    @staticmethod
+    def get_permissions_version(role_id):
+        """
+        Devuelve la versión de permisos de un rol, o None si el rol no existe.
+        """
+        try:
+            return db.session.query(Role.permissions_version).filter(Role.id == role_id).scalar()
+        except SQLAlchemyError as e:
+            raise e
+
+    @staticmethod
+    def get_role_claims(role_id):
+        """
+        Devuelve en una sola consulta la versión de permisos y los IDs de los permisos de un rol.
+
+        Returns:
+            tuple(int, list[int]) or None: La versión y los IDs de permisos, o None si el rol no existe.
+        """
+        try:
+            rows = (
+                db.session.query(Role.permissions_version, role_permissions.c.permission_id)
+                .outerjoin(role_permissions, role_permissions.c.role_id == Role.id)
+                .filter(Role.id == role_id)
+                .all()
+            )
+            if not rows:
+                return None
+            return rows[0].permissions_version, [row.permission_id for row in rows if row.permission_id is not None]
+        except SQLAlchemyError as e:
+            raise e
@@ -1,4 +1,6 @@
+from datetime import datetime, timedelta
 from app.models.tenants import Tenant
+from sqlalchemy import and_, or_
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
 
@@ -44,6 +46,18 @@ class TenantRepository:
         """
         return db.session.query(Tenant).all()  # Cambia self.db_session a db.session
 
+    def get_ready_schema_names(self):
+        """
+        Retrieves the schema names of the tenants whose schema is provisioned.
+
+        Returns:
+            list[str]: The schema names, ordered by tenant ID.
+        """
+        rows = db.session.query(Tenant.schema_name).filter(
+            Tenant.provisioning_status == Tenant.STATUS_READY
+        ).order_by(Tenant.tenant_id).all()
+        return [row.schema_name for row in rows]
+
     def get_tenant_by_id(self, tenant_id):
         """
         Retrieves a tenant by its ID.
@@ -105,3 +119,71 @@ class TenantRepository:
         except SQLAlchemyError as e:
             db.session.rollback()  # Cambia self.db_session a db.session
             raise e
+
+
+    def claim_provisioning(self, tenant_id, stale_after):
+        """
+        Atomically moves a tenant to the 'creating' state so only one job provisions it.
+
+        A tenant can be claimed when it is 'pending' or 'failed', or when it has
+        been 'creating' for longer than `stale_after` seconds (a crashed job).
+
+        Args:
+            tenant_id (int): The ID of the tenant.
+            stale_after (int): Seconds after which a 'creating' job is considered dead.
+
+        Returns:
+            bool: True if this caller claimed the tenant, otherwise False.
+        """
+        try:
+            now = datetime.utcnow()
+            claimable = or_(
+                Tenant.provisioning_status.in_([Tenant.STATUS_PENDING, Tenant.STATUS_FAILED]),
+                and_(
+                    Tenant.provisioning_status == Tenant.STATUS_CREATING,
+                    Tenant.provisioning_updated_at < now - timedelta(seconds=stale_after),
+                ),
+            )
+            claimed = db.session.query(Tenant).filter(Tenant.tenant_id == tenant_id, claimable).update(
+                {
+                    Tenant.provisioning_status: Tenant.STATUS_CREATING,
+                    Tenant.provisioning_error: None,
+                    Tenant.provisioning_updated_at: now,
+                },
+                synchronize_session=False,
+            )
+            db.session.commit()
+            return claimed == 1
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    def update_provisioning_status(self, tenant_id, status, error=None, schema_version=None):
+        """
+        Records the provisioning state of a tenant.
+
+        Args:
+            tenant_id (int): The ID of the tenant.
+            status (str): One of the Tenant.STATUS_* values.
+            error (str): The failure reason (optional).
+            schema_version (int): The migration version the schema was built at (optional).
+
+        Returns:
+            Tenant: The updated tenant object, or None if it does not exist.
+        """
+        try:
+            tenant = db.session.get(Tenant, tenant_id)
+            if tenant is None:
+                return None
+
+            tenant.provisioning_status = status
+            tenant.provisioning_error = error
+            tenant.provisioning_updated_at = datetime.utcnow()
+            if schema_version is not None:
+                tenant.schema_version = schema_version
+
+            db.session.commit()
+            return tenant
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
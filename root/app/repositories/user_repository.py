@@ -1,6 +1,9 @@
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
 from app.models.user import User
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.utils.permission_cache import permission_cache, user_version_cache
+from app.utils.tenant_routing import current_schema
 
 class UserRepository:
 
@@ -115,16 +118,27 @@ class UserRepository:
                 user.username = username
             if password:
                 user.password = password
+                # Un cambio de contraseña cierra todas las sesiones del usuario
+                RefreshTokenRepository.revoke_user_tokens(user_id, reason="password_changed", commit=False)
             if full_name:
                 user.full_name = full_name
             if mail:
                 user.mail = mail
             if dni:
                 user.dni = dni
+            previous_role_id = user.role_id
+            role_changed = bool(role_id) and role_id != previous_role_id
             if role_id:
                 user.role_id = role_id  # Actualizar role_id
+            if role_changed or password:
+                # Se revocan los access tokens de este usuario (llevan los permisos del rol
+                # anterior); los de los demás usuarios del rol siguen siendo válidos
+                user.token_version = (user.token_version or 1) + 1
 
             db.session.commit()
+            if role_changed or password:
+                permission_cache.invalidate_user(current_schema(), user_id)
+                user_version_cache.invalidate(current_schema(), user_id)
             return user
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -148,6 +162,9 @@ class UserRepository:
 
             db.session.delete(user)
             db.session.commit()
+            # Sin la fila, los tokens del usuario se rechazan (ver requires_permission)
+            permission_cache.invalidate_user(current_schema(), user_id)
+            user_version_cache.invalidate(current_schema(), user_id)
             return user
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -167,4 +184,31 @@ class UserRepository:
         try:
             return User.query.filter_by(username=username).first()
         except SQLAlchemyError as e:
+            raise e
+
+    @staticmethod
+    def get_token_version(user_id):
+        """
+        Returns the token version of a user, or None if the user does not exist.
+        """
+        try:
+            return db.session.query(User.token_version).filter(User.id == user_id).scalar()
+        except SQLAlchemyError as e:
+            raise e
+
+    @staticmethod
+    def update_password_hash(user_id, password_hash):
+        """
+        Replaces the stored hash of an unchanged password (hash policy upgrade).
+        Unlike a password change, the sessions of the user stay open.
+
+        Parameters:
+            user_id (int): The ID of the user.
+            password_hash (str): The new hash.
+        """
+        try:
+            User.query.filter(User.id == user_id).update({User.password: password_hash}, synchronize_session=False)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
             raise e
\ No newline at end of file
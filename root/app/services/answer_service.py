@@ -1,73 +1,206 @@
+import json
 import logging
 from flask_injector import inject
 from werkzeug.exceptions import InternalServerError, NotFound
+from app.models.outbox_message import OutboxMessage
 from app.repositories.answer_repository import AnswerRepository
+from app.services.outbox_service import OutboxService
 from app.services.usage_log_service import UsageLogService
 from app.services.question_service import QuestionService
-from app.utils.sqs_utils import SQSUtils
+from app.config import Config
+from app.utils.prompt_builder import PromptEntry, feedback_prompt_builder
+from app.utils.tenant_routing import current_schema
 
 logger = logging.getLogger(__name__)
 
+
+def _is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
 class AnswerService:
 
     @inject
-    def __init__(self, answer_repository: AnswerRepository, usage_log_service: UsageLogService, question_service: QuestionService):
+    def __init__(self, answer_repository: AnswerRepository, usage_log_service: UsageLogService, question_service: QuestionService,
+                 outbox_service: OutboxService):
         self.answer_repository = answer_repository
         self.usage_log_service = usage_log_service
         self.question_service = question_service
+        self.outbox_service = outbox_service
 
     def create_answers(self, answers_data):
         try:
             logger.info(f"Creating multiple answers. Total: {len(answers_data)}")
-            new_answers = []
 
             for answer_data in answers_data:
                 # Asegurar que cada respuesta tenga id_user = 1
                 answer_data['id_user'] = answer_data.get('id_user', 1)
 
-                new_answer = self.answer_repository.create_answer(
-                    answer_description=answer_data.get('answer_description'),
-                    id_evaluation=answer_data.get('id_evaluation'),
-                    id_question=answer_data.get('id_question'),
-                    id_user=answer_data['id_user'],  # Siempre tendrá un valor
-                    score=answer_data.get('score')
+            # Preparar datos para el mensaje SQS
+            # Nombres de todas las preguntas en una sola consulta (o desde la cache)
+            id_evaluation = answers_data[0]['id_evaluation']
+            question_names = self.question_service.get_question_names(
+                id_evaluation, {answer_data['id_question'] for answer_data in answers_data}
+            )
+            # Prompt acotado por PROMPT_MAX_TOKENS: las descripciones largas se recortan
+            prompt = feedback_prompt_builder.build([
+                PromptEntry(
+                    answer_data['answer_description'],
+                    answer_data.get('score'),
+                    question_names.get(answer_data['id_question']),
                 )
-                new_answers.append(new_answer)
-
-                # Registrar cada acción en el log de uso
-                self.usage_log_service.create_usage_log(
-                    action=f"Created answer for evaluation {answer_data.get('id_evaluation')}",
-                    performed_by=answer_data['id_user']
+                for answer_data in answers_data
+            ])
+            if prompt.truncated or prompt.omitted:
+                logger.info(
+                    f"Feedback prompt truncated: {prompt.truncated} of {len(answers_data)} answers shortened, "
+                    f"{prompt.omitted} omitted, ~{prompt.estimated_tokens} tokens"
                 )
 
-            # Preparar datos para el mensaje SQS
-            string_data = ""
-            for answer in new_answers:
-                question = self.question_service.get_question_by_id(answer.id_question).name
-                string_data += f"Descripción: {answer.answer_description}, Puntaje: {answer.score}, Pregunta: {question}\n"
-
-            # Generar el prompt para feedback
-            prompt = f"Generate feedback for the following responses: {string_data}"
-
             # Construir mensaje para SQS
             message_body = {
-                "id_evaluation": new_answers[0].id_evaluation,
-                "id_user": new_answers[0].id_user,
-                "prompt_string": prompt,
+                "id_evaluation": id_evaluation,
+                "id_user": answers_data[0]['id_user'],
+                "prompt_string": prompt.text,
+                "prompt_version": prompt.version,
                 "performed_by": "system",  # Opcional, cambiar según lógica
+                "tenant": current_schema(),
             }
 
-            # Enviar mensaje a SQS
-            logger.info("Sending message to SQS.")
-            SQSUtils.send_message(message_body)
+            # Un solo INSERT en una transacción, junto con el mensaje en el outbox:
+            # se guardan todas las respuestas y el mensaje, o nada
+            outbox_message = OutboxMessage(json.dumps(message_body))
+            new_answers = self.answer_repository.create_answers(answers_data, outbox_messages=[outbox_message])
 
-            logger.info("Answers created and message sent to SQS.")
+            self.usage_log_service.create_usage_log(
+                action=f"Created {len(new_answers)} answers for evaluation {new_answers[0].id_evaluation}",
+                performed_by=new_answers[0].id_user
+            )
+
+            # Envío inmediato (sin esperar a outbox_dispatcher); si falla, el mensaje
+            # queda en el outbox y lo envía el dispatcher
+            self.outbox_service.dispatch_messages([outbox_message.id])
+
+            logger.info("Answers created and feedback message queued in the outbox.")
             return new_answers
         except Exception as e:
             logger.error(f"Error creating multiple answers: {e}")
             raise InternalServerError("An internal error occurred while creating answers.")
 
 
+    def ingest_answers_stream(self, lines, default_user_id):
+        """
+        Inserts the answers of an NDJSON upload (one JSON object per line) in
+        batches of ANSWER_STREAM_BATCH_SIZE, each batch in its own transaction.
+
+        Lines are parsed and validated one at a time and only the current batch
+        of parsed answers is kept in memory; the raw body itself is bounded by
+        ANSWER_STREAM_MAX_BYTES (on Lambda it is already in memory as a whole,
+        see lambda_adapter). Invalid lines, and lines of a batch the database
+        rejects, are reported and skipped; the other lines are inserted. Streamed
+        uploads do not request feedback generation.
+
+        Args:
+            lines (iterable[bytes]): The lines of the upload.
+            default_user_id (int): The id_user of lines that do not set one.
+
+        Returns:
+            dict: The report: received, inserted and failed line counts, and the
+                line errors (line number and message).
+        """
+        report = {"received": 0, "inserted": 0, "failed": 0, "errors": [], "errors_truncated": False}
+        batch = []
+
+        for line_number, raw_line in enumerate(lines, start=1):
+            if not raw_line.strip():
+                continue
+            report["received"] += 1
+
+            row, error = self._parse_answer_line(raw_line, default_user_id)
+            if error:
+                self._report_error(report, line_number, error)
+                continue
+
+            batch.append((line_number, row))
+            if len(batch) >= Config.ANSWER_STREAM_BATCH_SIZE:
+                self._insert_stream_batch(batch, report)
+                batch = []
+
+        if batch:
+            self._insert_stream_batch(batch, report)
+        # Batch errors are found after the parse errors of later lines
+        report["errors"].sort(key=lambda error: error["line"])
+
+        logger.info(f"Answers stream ingested: {report['inserted']} inserted, {report['failed']} failed")
+        if report["inserted"]:
+            self.usage_log_service.create_usage_log(
+                action=f"Imported {report['inserted']} answers from an NDJSON stream",
+                performed_by=default_user_id
+            )
+        return report
+
+    def _parse_answer_line(self, raw_line, default_user_id):
+        """Returns (row, None) for a valid line or (None, error message)."""
+        if len(raw_line.rstrip(b'\r\n')) > Config.ANSWER_STREAM_MAX_LINE_BYTES:
+            return None, f"Line exceeds {Config.ANSWER_STREAM_MAX_LINE_BYTES} bytes"
+        try:
+            data = json.loads(raw_line)
+        except ValueError as e:
+            return None, f"Invalid JSON: {e}"
+        if not isinstance(data, dict):
+            return None, "Each line must be a JSON object"
+
+        description = data.get('answer_description')
+        if not isinstance(description, str) or not description.strip():
+            return None, "'answer_description' must be a non-empty string"
+        for key in ('id_evaluation', 'id_question'):
+            if not _is_id(data.get(key)):
+                return None, f"'{key}' must be a positive integer"
+        id_user = data.get('id_user', default_user_id)
+        if not _is_id(id_user):
+            return None, "'id_user' must be a positive integer"
+        score = data.get('score')
+        if score is not None and (isinstance(score, bool) or not isinstance(score, (int, float))):
+            return None, "'score' must be a number"
+
+        return {
+            "answer_description": description,
+            "id_evaluation": data['id_evaluation'],
+            "id_question": data['id_question'],
+            "id_user": id_user,
+            "score": score
+        }, None
+
+    def _insert_stream_batch(self, batch, report):
+        # Set-wise check of the questions of the batch: one query instead of a failed INSERT
+        question_evaluations = self.question_service.get_question_evaluations({row["id_question"] for _, row in batch})
+        rows = []
+        for line_number, row in batch:
+            id_evaluation = question_evaluations.get(row["id_question"])
+            if id_evaluation is None:
+                self._report_error(report, line_number, f"Question {row['id_question']} does not exist")
+            elif id_evaluation != row["id_evaluation"]:
+                self._report_error(report, line_number, f"Question {row['id_question']} does not belong to evaluation {row['id_evaluation']}")
+            else:
+                rows.append((line_number, row))
+
+        if not rows:
+            return
+        try:
+            report["inserted"] += self.answer_repository.insert_answers_batch([row for _, row in rows])
+        except Exception as e:
+            logger.error(f"Error inserting a batch of {len(rows)} streamed answers: {e}")
+            for line_number, _ in rows:
+                self._report_error(report, line_number, "Batch rejected by the database")
+
+    @staticmethod
+    def _report_error(report, line_number, message):
+        report["failed"] += 1
+        if len(report["errors"]) < Config.ANSWER_STREAM_MAX_ERRORS:
+            report["errors"].append({"line": line_number, "error": message})
+        else:
+            report["errors_truncated"] = True
+
     def get_answer_by_id(self, answer_id, id_user=None):
         try:
             logger.info(f"Fetching answer with ID: {answer_id}")
@@ -0,0 +1,180 @@
+import csv
+import io
+import json
+import logging
+from flask_injector import inject
+from werkzeug.exceptions import BadRequest, InternalServerError
+from app.config import Config
+from app.repositories.import_repository import IMPORT_ENTITIES, ImportRepository, psycopg2
+from app.services.usage_log_service import UsageLogService
+from app.utils.question_cache import question_cache
+from app.utils.tenant_routing import current_schema
+
+logger = logging.getLogger(__name__)
+
+
+class NdjsonCsvSource:
+    """
+    Objeto tipo archivo (read) que convierte, a medida que COPY lo lee,
+    las líneas NDJSON de una carga en filas CSV de staging: número de línea,
+    columnas de la entidad y el error de parseo de la línea, si lo hay.
+    """
+
+    def __init__(self, lines, columns, max_line_bytes):
+        self._lines = lines
+        self._columns = columns
+        self._max_line_bytes = max_line_bytes
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator='\n')
+        self._pending = ''
+        self._line_number = 0
+
+    def _next_rows(self):
+        """Convierte la siguiente línea no vacía; devuelve False al terminar."""
+        for raw_line in self._lines:
+            self._line_number += 1
+            if not raw_line.strip():
+                continue
+            values, error = self._parse_line(raw_line)
+            self._writer.writerow([self._line_number, *values, error])
+            self._pending += self._buffer.getvalue()
+            self._buffer.seek(0)
+            self._buffer.truncate()
+            return True
+        return False
+
+    def _parse_line(self, raw_line):
+        empty = [None] * len(self._columns)
+        if len(raw_line.rstrip(b'\r\n')) > self._max_line_bytes:
+            return empty, f"Line exceeds {self._max_line_bytes} bytes"
+        try:
+            data = json.loads(raw_line)
+        except ValueError as e:
+            return empty, f"Invalid JSON: {e}"
+        if not isinstance(data, dict):
+            return empty, "Each line must be a JSON object"
+
+        unknown = sorted(set(data) - set(self._columns))
+        if unknown:
+            return empty, f"Unknown field(s): {', '.join(unknown)}"
+
+        values = []
+        for column in self._columns:
+            value = data.get(column)
+            if isinstance(value, (dict, list)):
+                return empty, f"'{column}' must be a scalar value"
+            if value is not None and not isinstance(value, str):
+                value = json.dumps(value)
+            if value is not None and '\x00' in value:
+                return empty, f"'{column}' contains a NUL character"
+            values.append(value)
+        return values, None
+
+    def read(self, size=-1):
+        while size < 0 or len(self._pending) < size:
+            if not self._next_rows():
+                break
+        if size < 0:
+            size = len(self._pending)
+        chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+
+class ImportService:
+
+    @inject
+    def __init__(self, import_repository: ImportRepository, usage_log_service: UsageLogService):
+        self.import_repository = import_repository
+        self.usage_log_service = usage_log_service
+
+    def import_csv(self, entity_name, stream, skip_invalid=False, performed_by=None):
+        """
+        Importa un CSV (con cabecera) de usuarios, preguntas o respuestas.
+
+        Solo se lee la cabecera en Python: el resto del cuerpo va directo a
+        COPY. Las columnas pueden venir en cualquier orden; las opcionales
+        pueden omitirse.
+
+        Args:
+            entity_name (str): 'users', 'questions' o 'answers'.
+            stream: El cuerpo de la solicitud.
+            skip_invalid (bool): Insertar las filas válidas aunque otras fallen.
+            performed_by (int, optional): El usuario que realiza la importación.
+
+        Returns:
+            dict: El reporte de la importación (ver `ImportRepository.import_rows`).
+        """
+        entity = IMPORT_ENTITIES[entity_name]
+        reader = io.BufferedReader(stream, buffer_size=64 * 1024)
+
+        header_line = reader.readline(Config.IMPORT_MAX_LINE_BYTES + 1)
+        if len(header_line) > Config.IMPORT_MAX_LINE_BYTES:
+            raise BadRequest(f"The CSV header exceeds {Config.IMPORT_MAX_LINE_BYTES} bytes.")
+        try:
+            header = next(csv.reader([header_line.decode('utf-8-sig')]), [])
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise BadRequest(f"Invalid CSV header: {e}")
+
+        columns = tuple(column.strip().lower() for column in header)
+        if not columns:
+            raise BadRequest("The CSV must start with a header row.")
+        unknown = [column for column in columns if column not in entity.columns]
+        if unknown:
+            raise BadRequest(f"Unknown column(s): {', '.join(unknown)}. Allowed: {', '.join(entity.columns)}.")
+        if len(set(columns)) != len(columns):
+            raise BadRequest("The CSV header has duplicated columns.")
+        missing = [column for column in entity.required if column not in columns]
+        if missing:
+            raise BadRequest(f"Missing required column(s): {', '.join(missing)}.")
+
+        return self._import(entity_name, reader, columns, skip_invalid, performed_by)
+
+    def import_ndjson(self, entity_name, lines, skip_invalid=False, performed_by=None):
+        """
+        Importa usuarios, preguntas o respuestas de una carga NDJSON (un objeto
+        JSON por línea). Las líneas se convierten a CSV a medida que COPY las
+        lee; los errores se reportan con el número de línea.
+
+        Args:
+            entity_name (str): 'users', 'questions' o 'answers'.
+            lines (iterable[bytes]): Las líneas de la carga.
+            skip_invalid (bool): Insertar las filas válidas aunque otras fallen.
+            performed_by (int, optional): El usuario que realiza la importación.
+
+        Returns:
+            dict: El reporte de la importación (ver `ImportRepository.import_rows`).
+        """
+        entity = IMPORT_ENTITIES[entity_name]
+        source = NdjsonCsvSource(lines, entity.columns, Config.IMPORT_MAX_LINE_BYTES)
+        columns = ('row_number', *entity.columns, 'error')
+        return self._import(entity_name, source, columns, skip_invalid, performed_by)
+
+    def _import(self, entity_name, source, columns, skip_invalid, performed_by):
+        try:
+            result = self.import_repository.import_rows(
+                entity_name, source, columns, skip_invalid=skip_invalid, max_errors=Config.IMPORT_MAX_ERRORS
+            )
+        except psycopg2.DataError as e:
+            # Archivo mal formado (columnas de más, comillas sin cerrar, codificación...)
+            logger.warning(f"Malformed {entity_name} import: {e}")
+            raise BadRequest(f"Malformed file: {(e.pgerror or str(e)).strip()}")
+        except Exception as e:
+            logger.error(f"Error importing {entity_name}: {e}")
+            raise InternalServerError(f"An internal error occurred while importing {entity_name}.")
+
+        evaluations = result.pop("evaluations")
+        if entity_name == 'questions' and evaluations:
+            question_cache.invalidate(current_schema(), *evaluations)
+
+        result["entity"] = entity_name
+        result["errors_truncated"] = result["failed"] > len(result["errors"])
+        logger.info(
+            f"Import of {entity_name}: {result['received']} received, {result['inserted']} inserted, "
+            f"{result['failed']} failed"
+        )
+        if result["inserted"]:
+            self.usage_log_service.create_usage_log(
+                action=f"Imported {result['inserted']} {entity_name}",
+                performed_by=performed_by
+            )
+        return result
@@ -0,0 +1,124 @@
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from flask_injector import inject
+from app.config import Config
+from app.repositories.outbox_repository import OutboxRepository
+from app.utils.sqs_utils import SQSUtils
+from app.utils.tenant_routing import current_schema
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY_SECONDS = 3600
+
+
+class OutboxService:
+
+    @inject
+    def __init__(self, outbox_repository: OutboxRepository):
+        self.outbox_repository = outbox_repository
+
+    def dispatch_pending(self, deadline=None):
+        """
+        Envía a SQS los mensajes pendientes del outbox del schema actual, por lotes
+        de OUTBOX_BATCH_SIZE, hasta vaciarlo o alcanzar `deadline` (time.monotonic()).
+
+        Los mensajes enviados se eliminan; los que fallan se reprograman con
+        espera exponencial y, al agotar OUTBOX_MAX_ATTEMPTS, quedan en estado
+        'dead'. Si el proceso termina entre el envío y la confirmación, el mensaje
+        se vuelve a enviar al vencer OUTBOX_LEASE_SECONDS como un mensaje SQS nuevo
+        (otro messageId). Por eso cada mensaje lleva `outbox_id` ("<schema>:<id>"),
+        igual en todos sus envíos: el consumidor deduplica por él.
+
+        Returns:
+            dict: Mensajes enviados, fallidos y pasados a 'dead'.
+        """
+        report = {"sent": 0, "failed": 0, "dead": 0}
+        while deadline is None or time.monotonic() < deadline:
+            messages = self.outbox_repository.claim_messages(Config.OUTBOX_BATCH_SIZE, Config.OUTBOX_LEASE_SECONDS)
+            if not messages:
+                break
+
+            self._send(messages, report)
+            if len(messages) < Config.OUTBOX_BATCH_SIZE:
+                break
+        return report
+
+    def dispatch_messages(self, message_ids):
+        """
+        Intenta enviar enseguida los mensajes recién confirmados, para no esperar
+        a la siguiente ejecución de outbox_dispatcher (hasta un minuto). Es un
+        intento: los errores se registran y no se propagan, y lo que no se envía
+        queda en el outbox para el dispatcher.
+
+        Returns:
+            dict: Mensajes enviados, fallidos y pasados a 'dead'.
+        """
+        report = {"sent": 0, "failed": 0, "dead": 0}
+        if not message_ids or not Config.OUTBOX_DISPATCH_ON_COMMIT:
+            return report
+        try:
+            messages = self.outbox_repository.claim_messages(
+                len(message_ids), Config.OUTBOX_LEASE_SECONDS, message_ids=message_ids
+            )
+            if messages:
+                self._send(messages, report)
+        except Exception as e:
+            logger.warning(f"Immediate dispatch of outbox messages {message_ids} failed, left to the dispatcher: {e}")
+        return report
+
+    def count_dead(self):
+        """Mensajes del outbox del schema actual en estado 'dead'."""
+        return self.outbox_repository.count_dead()
+
+    def requeue_dead(self):
+        """Reencola los mensajes 'dead' del schema actual; devuelve cuántos."""
+        requeued = self.outbox_repository.requeue_dead()
+        if requeued:
+            logger.info(f"Requeued {requeued} dead outbox messages of schema {current_schema()}")
+        return requeued
+
+    def _send(self, messages, report):
+        """Envía mensajes ya tomados y registra el resultado de cada uno en el outbox."""
+        schema = current_schema()
+        results = SQSUtils.send_message_batch(
+            [
+                (message.id, {**json.loads(message.message_body), "outbox_id": f"{schema}:{message.id}"})
+                for message in messages
+            ]
+        )
+        sent = [result.id for result in results if result.success]
+        if sent:
+            self.outbox_repository.delete_messages(sent)
+
+        # Los rechazados por el propio mensaje (SenderFault, demasiado largo) no se
+        # van a enviar nunca: pasan a 'dead' sin esperar a agotar los intentos
+        attempts = {message.id: message.attempts for message in messages}
+        dead, retried = [], []
+        for result in results:
+            if result.success:
+                continue
+            if result.sender_fault or attempts[result.id] >= Config.OUTBOX_MAX_ATTEMPTS:
+                dead.append((result.id, result.error))
+            else:
+                retried.append((result.id, result.error))
+        if retried:
+            now = datetime.utcnow()
+            self.outbox_repository.reschedule_messages([
+                (message_id, error, now + timedelta(seconds=self.retry_delay(attempts[message_id])))
+                for message_id, error in retried
+            ])
+        if dead:
+            self.outbox_repository.mark_dead(dead)
+            for message_id, error in dead:
+                logger.error(f"Outbox message {schema}:{message_id} is dead after {attempts[message_id]} attempts: {error}")
+
+        report["sent"] += len(sent)
+        report["failed"] += len(dead) + len(retried)
+        report["dead"] += len(dead)
+
+    @staticmethod
+    def retry_delay(attempts):
+        """Segundos hasta el siguiente intento de un mensaje que falló `attempts` veces."""
+        return min(Config.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS)
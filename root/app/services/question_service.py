@@ -3,6 +3,8 @@ from flask_injector import inject
 from werkzeug.exceptions import InternalServerError, NotFound
 from app.repositories.question_repository import QuestionRepository
 from app.services.usage_log_service import UsageLogService
+from app.utils.question_cache import question_cache
+from app.utils.tenant_routing import current_schema
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +52,42 @@ class QuestionService:
             logger.error(f"Error fetching question by ID {question_id}: {e}")
             raise InternalServerError("An internal error occurred while fetching the question.")
 
+    def get_question_names(self, id_evaluation, question_ids):
+        """
+        Returns the names of the given questions, using the cached question map of the evaluation.
+
+        On a miss, the questions of the evaluation and `question_ids` are loaded
+        with a single query; only the questions of the evaluation are cached.
+
+        Returns:
+            dict: Question names by question ID.
+        """
+        try:
+            schema = current_schema()
+            question_names = question_cache.get(schema, id_evaluation)
+            if question_names is not None and all(question_id in question_names for question_id in question_ids):
+                return question_names
+
+            rows = self.question_repository.get_question_names(id_evaluation, question_ids)
+            question_cache.set(schema, id_evaluation, {row.id: row.name for row in rows if row.id_evaluation == id_evaluation})
+            return {row.id: row.name for row in rows}
+        except Exception as e:
+            logger.error(f"Error fetching question names for evaluation {id_evaluation}: {e}")
+            raise InternalServerError("An internal error occurred while fetching the questions.")
+
+    def get_question_evaluations(self, question_ids):
+        """
+        Returns the evaluation of each of the given questions (one query).
+
+        Returns:
+            dict: Evaluation IDs by question ID; missing questions are left out.
+        """
+        try:
+            return self.question_repository.get_question_evaluations(question_ids)
+        except Exception as e:
+            logger.error(f"Error fetching the evaluations of questions: {e}")
+            raise InternalServerError("An internal error occurred while fetching the questions.")
+
     def get_questions_paginated(self, page, per_page, name=None):
         try:
             logger.info(f"Fetching questions with filters - page: {page}, per_page: {per_page}, name: {name}")
@@ -0,0 +1,133 @@
+import hashlib
+import logging
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from flask_injector import inject
+from werkzeug.exceptions import InternalServerError, Unauthorized
+from app.config import Config
+from app.extensions import db
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.services.user_service import UserService
+from app.utils.jwt_utils import create_jwt_token
+from app.utils.tenant_routing import current_schema
+
+logger = logging.getLogger(__name__)
+
+class RefreshTokenService:
+    """
+    Refresh tokens extend a session without checking the password again.
+
+    Tokens are random, stored as SHA-256 hashes and single use: each refresh
+    rotates the token within its family (one family per login). Presenting an
+    already used token means it was leaked, so the whole family is revoked.
+
+    Tokens are prefixed with the tenant schema they were issued in
+    ("<schema>.<random>") and only accepted in that tenant.
+    """
+
+    @inject
+    def __init__(self, refresh_token_repository: RefreshTokenRepository, user_service: UserService):
+        self.refresh_token_repository = refresh_token_repository
+        self.user_service = user_service
+
+    def create_session(self, user_id):
+        """
+        Issues the first refresh token of a new session (login).
+
+        Parameters:
+            user_id (int): The authenticated user.
+
+        Returns:
+            str: The refresh token.
+        """
+        try:
+            self.refresh_token_repository.delete_expired_tokens(user_id, commit=False)
+            token = self._issue_token(user_id, family_id=str(uuid.uuid4()))
+            db.session.commit()
+            return token
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error creating refresh token for user {user_id}: {e}")
+            raise InternalServerError("An internal error occurred while creating the session.")
+
+    def refresh(self, token):
+        """
+        Exchanges a refresh token for a new access token and a new refresh token.
+
+        Parameters:
+            token (str): The refresh token presented by the client.
+
+        Returns:
+            dict: The new "access_token" and "refresh_token".
+
+        Raises:
+            Unauthorized: If the token is unknown, expired, revoked or reused.
+        """
+        if not self._is_for_current_tenant(token):
+            raise Unauthorized("Invalid refresh token")
+
+        stored = self.refresh_token_repository.get_token_by_hash(self._hash(token))
+        if stored is None or stored.revoked_at is not None:
+            raise Unauthorized("Invalid refresh token")
+        if stored.expires_at <= datetime.utcnow():
+            raise Unauthorized("Refresh token has expired")
+
+        # Atomic consume: of two concurrent refreshes with the same token only one wins
+        if stored.used_at is not None or not self.refresh_token_repository.mark_as_used(stored.id):
+            db.session.rollback()
+            logger.warning(f"Refresh token reuse detected for user {stored.user_id}, revoking family {stored.family_id}")
+            self.refresh_token_repository.revoke_family(stored.family_id, reason="reuse_detected")
+            raise Unauthorized("Invalid refresh token")
+
+        try:
+            new_token = self._issue_token(stored.user_id, family_id=stored.family_id, parent_id=stored.id)
+            # Claims fresh from the database: permissions and role version may have changed
+            access_token = create_jwt_token(
+                self.user_service.get_token_claims(stored.user),
+                expires_in=Config.ACCESS_TOKEN_EXPIRES_MINUTES
+            )
+            db.session.commit()
+            return {"access_token": access_token, "refresh_token": new_token}
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error refreshing session of user {stored.user_id}: {e}")
+            raise InternalServerError("An internal error occurred while refreshing the session.")
+
+    def revoke(self, token):
+        """
+        Ends the session of a refresh token (logout) by revoking its family.
+
+        Returns:
+            bool: True if the token was known, otherwise False.
+        """
+        if not self._is_for_current_tenant(token):
+            return False
+
+        stored = self.refresh_token_repository.get_token_by_hash(self._hash(token))
+        if stored is None:
+            return False
+        self.refresh_token_repository.revoke_family(stored.family_id, reason="logout")
+        return True
+
+    def _issue_token(self, user_id, family_id, parent_id=None):
+        token = f"{current_schema()}.{secrets.token_urlsafe(32)}"
+        self.refresh_token_repository.create_token(
+            token_hash=self._hash(token),
+            family_id=family_id,
+            user_id=user_id,
+            expires_at=datetime.utcnow() + timedelta(days=Config.REFRESH_TOKEN_EXPIRES_DAYS),
+            parent_id=parent_id,
+            commit=False
+        )
+        return token
+
+    @staticmethod
+    def _is_for_current_tenant(token):
+        schema_name, separator, _ = token.partition('.')
+        return bool(separator) and schema_name == current_schema()
+
+    @staticmethod
+    def _hash(token):
+        # The tokens carry 256 random bits: a fast hash is enough, no KDF needed
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
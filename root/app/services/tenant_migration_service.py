@@ -0,0 +1,153 @@
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from flask_injector import inject
+from sqlalchemy import text
+from app.config import Config
+from app.models.tenants import Tenant
+
+Migration = namedtuple('Migration', ['version', 'name', 'sql'])
+
+_MIGRATION_FILE = re.compile(r'^(\d+)_([\w-]+)\.sql$')
+
+
+class TenantMigrationService:
+    """
+    Applies the SQL migrations of MIGRATIONS_PATH to every tenant schema.
+
+    Files are named `<version>_<description>.sql` and applied in version order.
+    Each migration runs in its own transaction together with the update of
+    `public.tenants.schema_version`, so a failed run resumes where it stopped.
+    """
+
+    @inject
+    def __init__(self):
+        pass
+
+    def load_migrations(self):
+        """
+        Reads the migration files.
+
+        Returns:
+            list[Migration]: The migrations sorted by version.
+        """
+        migrations_path = Config.MIGRATIONS_PATH
+        if not os.path.isdir(migrations_path):
+            return []
+
+        migrations = []
+        for file_name in os.listdir(migrations_path):
+            match = _MIGRATION_FILE.match(file_name)
+            if not match:
+                continue
+            with open(os.path.join(migrations_path, file_name), 'r') as migration_file:
+                migrations.append(Migration(int(match.group(1)), match.group(2), migration_file.read()))
+
+        migrations.sort(key=lambda migration: migration.version)
+        versions = [migration.version for migration in migrations]
+        if len(versions) != len(set(versions)):
+            raise ValueError(f"Duplicated migration versions in {migrations_path}")
+
+        return migrations
+
+    def latest_version(self, migrations=None):
+        migrations = self.load_migrations() if migrations is None else migrations
+        return migrations[-1].version if migrations else 0
+
+    def migrate_all(self, engine, workers=None, tenant_ids=None):
+        """
+        Applies the pending migrations to every ready tenant.
+
+        Tenants are migrated in parallel, each on its own pooled connection,
+        with at most `workers` tenants in flight.
+
+        Args:
+            engine: The SQLAlchemy engine (its pool must hold `workers` connections).
+            workers (int, optional): Maximum parallelism (defaults to MIGRATION_WORKERS).
+            tenant_ids (list[int], optional): Restrict the run to these tenants.
+
+        Returns:
+            list[dict]: One report per tenant (versions, applied migrations, timing, error).
+        """
+        migrations = self.load_migrations()
+        latest = self.latest_version(migrations)
+        workers = workers or Config.MIGRATION_WORKERS
+
+        with engine.connect() as connection:
+            query = (
+                "SELECT tenant_id, schema_name FROM public.tenants "
+                "WHERE provisioning_status = :ready AND schema_version < :latest"
+            )
+            params = {"ready": Tenant.STATUS_READY, "latest": latest}
+            if tenant_ids:
+                query += " AND tenant_id = ANY(:tenant_ids)"
+                params["tenant_ids"] = list(tenant_ids)
+            tenants = connection.execute(text(query + " ORDER BY tenant_id"), params).all()
+
+        print(f"Migrating {len(tenants)} tenant(s) to version {latest} with {workers} worker(s)")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                lambda tenant: self.migrate_tenant(engine, tenant.tenant_id, tenant.schema_name, migrations),
+                tenants,
+            ))
+
+    def migrate_tenant(self, engine, tenant_id, schema_name, migrations=None):
+        """
+        Applies the pending migrations to one tenant schema.
+
+        Returns:
+            dict: The migration report of the tenant.
+        """
+        migrations = self.load_migrations() if migrations is None else migrations
+        started = time.perf_counter()
+        report = {
+            "tenant_id": tenant_id,
+            "schema_name": schema_name,
+            "from_version": None,
+            "to_version": None,
+            "applied": [],
+            "status": "ok",
+            "error": None,
+        }
+
+        try:
+            for migration in migrations:
+                with engine.begin() as connection:
+                    # Row lock: concurrent runners migrate a tenant one at a time
+                    current_version = connection.execute(
+                        text("SELECT schema_version FROM public.tenants WHERE tenant_id = :tenant_id FOR UPDATE"),
+                        {"tenant_id": tenant_id},
+                    ).scalar_one()
+                    if report["from_version"] is None:
+                        report["from_version"] = current_version
+                    report["to_version"] = current_version
+                    if migration.version <= current_version:
+                        continue
+
+                    quoted_schema = connection.dialect.identifier_preparer.quote(schema_name)
+                    connection.exec_driver_sql(f"SET LOCAL search_path TO {quoted_schema}, public")
+                    connection.exec_driver_sql(migration.sql)
+                    connection.execute(
+                        text(
+                            "UPDATE public.tenants SET schema_version = :version, migrated_at = now(), "
+                            "migration_error = NULL WHERE tenant_id = :tenant_id"
+                        ),
+                        {"version": migration.version, "tenant_id": tenant_id},
+                    )
+
+                report["applied"].append(migration.version)
+                report["to_version"] = migration.version
+        except Exception as e:
+            report["status"] = "failed"
+            report["error"] = str(e)
+            print(f"Migration of tenant {tenant_id} ({schema_name}) failed: {e}")
+            with engine.begin() as connection:
+                connection.execute(
+                    text("UPDATE public.tenants SET migration_error = :error WHERE tenant_id = :tenant_id"),
+                    {"error": str(e), "tenant_id": tenant_id},
+                )
+
+        report["seconds"] = round(time.perf_counter() - started, 3)
+        return report
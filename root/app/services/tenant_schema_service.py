@@ -0,0 +1,217 @@
+import hashlib
+import os
+from flask_injector import inject
+from sqlalchemy import text
+from sqlalchemy.schema import CreateSchema
+from app.config import Config
+from app.extensions import db
+from app.services.tenant_migration_service import TenantMigrationService
+
+TEMPLATE_SCHEMA_PREFIX = 'tenant_template_'
+
+PROVISIONING_MODE_CLONE = 'clone'
+PROVISIONING_MODE_DDL = 'ddl'
+
+# Server-side copy of a schema: sequences, tables (columns, defaults, indexes and
+# constraints), rows and foreign keys. Cloning a tenant is then one statement
+# from the API side no matter how many tables the schema has.
+CLONE_SCHEMA_FUNCTION = """
+CREATE OR REPLACE FUNCTION public.clone_schema(source_schema text, dest_schema text)
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    obj record;
+    seq_last_value bigint;
+    seq_is_called boolean;
+    source_prefix text := quote_ident(source_schema) || '.';
+    dest_prefix text := quote_ident(dest_schema) || '.';
+BEGIN
+    -- Empty search_path so catalog functions print schema-qualified names
+    PERFORM set_config('search_path', '', true);
+
+    EXECUTE format('CREATE SCHEMA %I', dest_schema);
+
+    FOR obj IN
+        SELECT c.relname AS seq_name
+        FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = source_schema AND c.relkind = 'S'
+    LOOP
+        EXECUTE format('CREATE SEQUENCE %I.%I', dest_schema, obj.seq_name);
+        EXECUTE format('SELECT last_value, is_called FROM %I.%I', source_schema, obj.seq_name)
+            INTO seq_last_value, seq_is_called;
+        PERFORM setval(format('%I.%I', dest_schema, obj.seq_name)::regclass, seq_last_value, seq_is_called);
+    END LOOP;
+
+    FOR obj IN
+        SELECT c.relname AS table_name
+        FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = source_schema AND c.relkind = 'r'
+    LOOP
+        EXECUTE format('CREATE TABLE %I.%I (LIKE %I.%I INCLUDING ALL)',
+                       dest_schema, obj.table_name, source_schema, obj.table_name);
+        EXECUTE format('INSERT INTO %I.%I SELECT * FROM %I.%I',
+                       dest_schema, obj.table_name, source_schema, obj.table_name);
+    END LOOP;
+
+    -- LIKE keeps defaults pointing at the source sequences (SERIAL columns)
+    FOR obj IN
+        SELECT c.relname AS table_name, a.attname AS column_name, pg_get_expr(d.adbin, d.adrelid) AS expr
+        FROM pg_attrdef d
+        JOIN pg_class c ON c.oid = d.adrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = d.adnum
+        WHERE n.nspname = dest_schema AND pg_get_expr(d.adbin, d.adrelid) LIKE '%' || source_prefix || '%'
+    LOOP
+        EXECUTE format('ALTER TABLE %I.%I ALTER COLUMN %I SET DEFAULT %s',
+                       dest_schema, obj.table_name, obj.column_name,
+                       replace(obj.expr, source_prefix, dest_prefix));
+    END LOOP;
+
+    FOR obj IN
+        SELECT s.relname AS seq_name, t.relname AS table_name, a.attname AS column_name
+        FROM pg_class s
+        JOIN pg_namespace n ON n.oid = s.relnamespace
+        JOIN pg_depend dep ON dep.objid = s.oid AND dep.deptype = 'a'
+        JOIN pg_class t ON t.oid = dep.refobjid
+        JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = dep.refobjsubid
+        WHERE n.nspname = source_schema AND s.relkind = 'S'
+    LOOP
+        EXECUTE format('ALTER SEQUENCE %I.%I OWNED BY %I.%I.%I',
+                       dest_schema, obj.seq_name, dest_schema, obj.table_name, obj.column_name);
+    END LOOP;
+
+    -- Foreign keys last, once every table holds its rows
+    FOR obj IN
+        SELECT c.relname AS table_name, con.conname, pg_get_constraintdef(con.oid) AS definition
+        FROM pg_constraint con
+        JOIN pg_class c ON c.oid = con.conrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = source_schema AND con.contype = 'f'
+    LOOP
+        EXECUTE format('ALTER TABLE %I.%I ADD CONSTRAINT %I %s',
+                       dest_schema, obj.table_name, obj.conname,
+                       replace(obj.definition, source_prefix, dest_prefix));
+    END LOOP;
+END;
+$$;
+"""
+
+
+class TenantSchemaService:
+    """
+    Builds the database schema of a tenant.
+
+    The schema is built from the DDL script, the seed rows and every migration
+    of MIGRATIONS_PATH, so new tenants start at the latest schema version.
+
+    Two provisioning modes are available (TENANT_PROVISIONING_MODE):
+        - 'ddl': replays the DDL script (and seed rows) statement by statement.
+        - 'clone': keeps a versioned template schema built once from the same
+          scripts and copies it server-side with public.clone_schema().
+    """
+
+    @inject
+    def __init__(self, tenant_migration_service: TenantMigrationService):
+        self.tenant_migration_service = tenant_migration_service
+
+    def provision_schema(self, schema_name, mode=None):
+        """
+        Creates `schema_name` with the tenant tables and seed rows.
+
+        Everything runs in a single transaction on a dedicated connection, so a
+        failure leaves no half-built schema behind.
+
+        Args:
+            schema_name (str): The schema to create.
+            mode (str, optional): 'clone' or 'ddl' (defaults to TENANT_PROVISIONING_MODE).
+
+        Returns:
+            int: The migration version the schema was built at.
+        """
+        mode = mode or Config.TENANT_PROVISIONING_MODE
+        print(f"Provisioning schema {schema_name} (mode: {mode})")
+
+        if mode == PROVISIONING_MODE_CLONE:
+            template_schema = self.ensure_template()
+            with db.engine.begin() as connection:
+                connection.execute(
+                    text("SELECT public.clone_schema(:source, :dest)"),
+                    {"source": template_schema, "dest": schema_name},
+                )
+        elif mode == PROVISIONING_MODE_DDL:
+            with db.engine.begin() as connection:
+                connection.execute(CreateSchema(schema_name, if_not_exists=True))
+                self._run_scripts(connection, schema_name)
+        else:
+            raise ValueError(f"Unknown tenant provisioning mode: {mode}")
+
+        print(f"Schema {schema_name} provisioned successfully")
+        return self.tenant_migration_service.latest_version()
+
+    def template_version(self):
+        """Version of the template: a hash of the scripts it is built from."""
+        digest = hashlib.sha256()
+        for script in self._read_scripts():
+            digest.update(script.encode('utf-8'))
+        return digest.hexdigest()[:12]
+
+    def template_schema_name(self):
+        return f"{TEMPLATE_SCHEMA_PREFIX}{self.template_version()}"
+
+    def ensure_template(self):
+        """
+        Builds the template schema of the current version if it does not exist yet,
+        and drops templates of previous versions.
+
+        Returns:
+            str: The name of the template schema.
+        """
+        template_schema = self.template_schema_name()
+
+        with db.engine.begin() as connection:
+            # Serialize concurrent provisioning jobs building the same template
+            connection.execute(text("SELECT pg_advisory_xact_lock(hashtext('tenant_template'))"))
+
+            existing = connection.execute(
+                text("SELECT 1 FROM pg_namespace WHERE nspname = :name"), {"name": template_schema}
+            ).first()
+            if existing:
+                return template_schema
+
+            print(f"Building tenant template schema {template_schema}")
+            connection.exec_driver_sql(CLONE_SCHEMA_FUNCTION)
+            connection.execute(CreateSchema(template_schema))
+            self._run_scripts(connection, template_schema)
+
+            stale_templates = connection.execute(
+                text("SELECT nspname FROM pg_namespace WHERE nspname LIKE :prefix AND nspname <> :current"),
+                {"prefix": f"{TEMPLATE_SCHEMA_PREFIX}%", "current": template_schema},
+            ).scalars().all()
+            preparer = connection.dialect.identifier_preparer
+            for stale_template in stale_templates:
+                connection.exec_driver_sql(f"DROP SCHEMA {preparer.quote(stale_template)} CASCADE")
+
+        return template_schema
+
+    def _run_scripts(self, connection, schema_name):
+        """Runs the DDL and seed scripts inside `schema_name` (transaction-scoped search_path)."""
+        quoted_schema = connection.dialect.identifier_preparer.quote(schema_name)
+        connection.exec_driver_sql(f"SET LOCAL search_path TO {quoted_schema}, public")
+        for script in self._read_scripts():
+            connection.exec_driver_sql(script)
+
+    def _read_scripts(self):
+        """
+        Reads the DDL script, the seed rows script and the migrations. Both
+        scripts are required: a schema without the seed rows has no roles or
+        permission catalog.
+        """
+        scripts = []
+        for path in (Config.TENANT_DDL_PATH, Config.TENANT_SEED_PATH):
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"Tenant provisioning script not found: {os.path.abspath(path)}")
+            print(f"Reading tenant script from: {path}")
+            with open(path, 'r') as script_file:
+                scripts.append(script_file.read())
+
+        scripts.extend(migration.sql for migration in self.tenant_migration_service.load_migrations())
+        return scripts
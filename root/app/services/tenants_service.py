@@ -1,51 +1,58 @@
-from app.extensions import db
+from app.config import Config
 from flask_injector import inject
-from sqlalchemy import text
-from sqlalchemy.schema import CreateSchema
 from werkzeug.exceptions import InternalServerError, NotFound, BadRequest
+from app.models.tenants import Tenant
 from app.repositories.tenants_repository import TenantRepository
+from app.services.tenant_schema_service import TenantSchemaService
 from app.services.usage_log_service import UsageLogService
+from app.utils.tenant_cache import tenant_cache
+from app.utils.sqs_utils import SQSUtils
+from app.utils.tenant_routing import validate_schema_name
+import logging
+
+# Logger configuration
+logger = logging.getLogger(__name__)
 
 class TenantService:
 
     @inject
-    def __init__(self, tenant_repository: TenantRepository, usage_log_service: UsageLogService):
+    def __init__(self, tenant_repository: TenantRepository, usage_log_service: UsageLogService, tenant_schema_service: TenantSchemaService):
         self.tenant_repository = tenant_repository
         self.usage_log_service = usage_log_service
+        self.tenant_schema_service = tenant_schema_service
 
     def create_tenant(self, tenant_name, schema_name):
         """
-        Creates a new tenant and a schema in the database, then runs the DDL SQL to initialize the schema.
+        Registers a new tenant in the 'pending' state and queues the provisioning
+        job that creates its schema, so the request returns without running the DDL.
         """
         try:
-            # Set session to Public Schema
-            self._set_search_path('public')
             print(f"Creating a new tenant: {tenant_name} with schema: {schema_name}")
 
             if not tenant_name or not schema_name:
                 print("The 'tenant_name' and 'schema_name' parameters are required")
                 raise BadRequest("The 'tenant_name' and 'schema_name' parameters are required")
 
+            try:
+                validate_schema_name(schema_name)
+            except ValueError as e:
+                raise BadRequest(str(e))
+
             # Verify if the schema exists
             existing_tenant = self.tenant_repository.get_tenant_by_schema(schema_name)
             if existing_tenant:
                 print(f"Schema {schema_name} already exists for another tenant.")
                 raise BadRequest(f"Schema {schema_name} already exists.")
 
-            # Create new Schema
-            self._create_schema(schema_name)
-
-            # Return Session to Public Schema
-            self._set_search_path('public')
             new_tenant = self.tenant_repository.create_tenant(tenant_name, schema_name)
+            # Drop a cached "unknown tenant" entry for this schema
+            tenant_cache.invalidate(schema_name)
 
             if not new_tenant:
                 raise InternalServerError("An error occurred while creating the tenant in the public schema.")
-            
-            # Execute DDL into new SCHEMA
-            self._execute_ddl_for_schema(schema_name)
 
-            self._set_search_path('public')
+            # The schema itself is built by a provisioning job
+            self._enqueue_provisioning(new_tenant)
 
             return new_tenant
         except BadRequest as e:
@@ -55,56 +62,100 @@ class TenantService:
             print(f"Error creating tenant: {e}")
             raise InternalServerError("An internal error occurred while creating the tenant.")
 
-    def _create_schema(self, schema_name):
-        """Creates a new schema in the database."""
+    def _enqueue_provisioning(self, tenant):
+        """
+        Queues the provisioning job of a tenant. Without a provisioning queue
+        configured (local development), the tenant is provisioned inline.
+        """
+        queue_url = Config.TENANT_PROVISIONING_QUEUE_URL
+        if not queue_url:
+            print(f"No provisioning queue configured, provisioning tenant {tenant.tenant_id} inline")
+            try:
+                self.provision_tenant(tenant.tenant_id)
+            except Exception:
+                # The failure is recorded on the tenant and can be retried
+                logger.exception(f"Inline provisioning of tenant {tenant.tenant_id} failed")
+            return
+
+        print(f"Queueing provisioning job for tenant {tenant.tenant_id}")
+        SQSUtils.send_message({"tenant_id": tenant.tenant_id}, queue_url=queue_url)
+
+    def provision_tenant(self, tenant_id):
+        """
+        Provisioning job: creates the tenant schema with its tables and seed rows.
+
+        The job is idempotent: it only runs if it can claim the tenant (pending,
+        failed or stale), and the schema is built in a single transaction, so a
+        failed attempt leaves nothing behind and can be retried.
+
+        Returns:
+            Tenant: The tenant with its resulting provisioning state.
+        """
+        tenant = self.tenant_repository.get_tenant_by_id(tenant_id)
+        if not tenant:
+            raise NotFound(f"Tenant with ID {tenant_id} not found.")
+
+        if not self.tenant_repository.claim_provisioning(tenant_id, Config.TENANT_PROVISIONING_STALE_AFTER):
+            print(f"Tenant {tenant_id} is {tenant.provisioning_status}, skipping provisioning job")
+            return tenant
+
         try:
-            print(f"Creating schema: {schema_name}")
-            db.session.execute(CreateSchema(schema_name))
-            db.session.commit()
+            schema_version = self.tenant_schema_service.provision_schema(tenant.schema_name)
         except Exception as e:
-            db.session.rollback()
-            print(f"Error creating schema {schema_name}: {e}")
-            raise InternalServerError(f"An error occurred while creating the schema {schema_name}.")
+            print(f"Provisioning of tenant {tenant_id} failed: {e}")
+            self.tenant_repository.update_provisioning_status(tenant_id, Tenant.STATUS_FAILED, error=str(e))
+            raise
+
+        tenant = self.tenant_repository.update_provisioning_status(
+            tenant_id, Tenant.STATUS_READY, schema_version=schema_version
+        )
+        tenant_cache.invalidate(tenant.schema_name)
+        print(f"Tenant {tenant_id} provisioned successfully")
+        return tenant
 
-    def _set_search_path(self, schema_name):
-        """Sets the search_path to the given schema."""
+    def get_provisioning_status(self, tenant_id):
+        """Returns the tenant whose provisioning state is requested."""
         try:
-            print(f"Setting search_path to {schema_name}")
-            db.session.execute(text(f"SET search_path TO {schema_name}"))
-            db.session.commit()
+            tenant = self.tenant_repository.get_tenant_by_id(tenant_id)
+
+            if not tenant:
+                print(f"Tenant with ID {tenant_id} not found.")
+                raise NotFound("Tenant not found.")
+
+            return tenant
+        except NotFound as e:
+            print(f"Not found: {e}")
+            raise
         except Exception as e:
-            db.session.rollback()
-            print(f"Error setting search_path to {schema_name}: {e}")
-            raise InternalServerError(f"An error occurred while setting search_path to {schema_name}.")
+            print(f"Error fetching provisioning status of tenant {tenant_id}: {e}")
+            raise InternalServerError("An internal error occurred while fetching the provisioning status.")
 
-    def _execute_ddl_for_schema(self, schema_name):
+    def retry_provisioning(self, tenant_id):
         """
-        Executes the SQL DDL script to create the necessary tables in the new schema.
+        Re-queues the provisioning job of a tenant. Ready tenants are returned
+        unchanged, and a job already running is not duplicated.
         """
         try:
-            ddl_path = 'db/assets/ddl.sql'
-            print(f"Executing DDL script from: {ddl_path}")
-
-            with open(ddl_path, 'r') as ddl_file:
-                ddl_sql = ddl_file.read()
+            tenant = self.tenant_repository.get_tenant_by_id(tenant_id)
 
-            print(ddl_sql)
+            if not tenant:
+                print(f"Tenant with ID {tenant_id} not found.")
+                raise NotFound("Tenant not found.")
 
-            with db.session.begin():
-                self._set_search_path(schema_name)
-                print("Executing DDL SQL")
-                db.session.execute(text(ddl_sql))
+            if tenant.provisioning_status != Tenant.STATUS_READY:
+                self._enqueue_provisioning(tenant)
 
-            print(f"DDL executed successfully for schema: {schema_name}")
+            return self.tenant_repository.get_tenant_by_id(tenant_id)
+        except NotFound as e:
+            print(f"Not found: {e}")
+            raise
         except Exception as e:
-            print(f"Error executing DDL for schema {schema_name}: {e}")
-            db.session.rollback()
-            raise InternalServerError(f"An error occurred while executing DDL for schema {schema_name}.")
+            print(f"Error retrying provisioning of tenant {tenant_id}: {e}")
+            raise InternalServerError("An internal error occurred while retrying the provisioning.")
 
     def get_all_tenants(self):
         """Retrieves all tenants, always from the 'public' schema."""
         try:
-            self._set_search_path('public')
             print("Fetching all tenants")
             tenants = self.tenant_repository.get_all_tenants()
 
@@ -120,7 +171,6 @@ class TenantService:
     def get_tenant_by_id(self, tenant_id):
         """Fetches a tenant by ID from the 'public' schema."""
         try:
-            self._set_search_path('public')
             print(f"Fetching tenant with ID: {tenant_id}")
             tenant = self.tenant_repository.get_tenant_by_id(tenant_id)
 
@@ -139,14 +189,16 @@ class TenantService:
     def update_tenant(self, tenant_id, tenant_name=None, schema_name=None):
         """Updates an existing tenant in the 'public' schema."""
         try:
-            self._set_search_path('public')
             print(f"Updating tenant with ID: {tenant_id}")
             updated_tenant = self.tenant_repository.update_tenant(tenant_id, tenant_name, schema_name)
 
             if not updated_tenant:
                 print(f"Tenant with ID {tenant_id} not found.")
                 raise NotFound("Tenant not found.")
-            
+
+            # The schema name (the cache key) may have changed, so drop every cached tenant
+            tenant_cache.clear()
+
             return updated_tenant
         except NotFound as e:
             print(f"Not found: {e}")
@@ -158,14 +210,15 @@ class TenantService:
     def delete_tenant(self, tenant_id):
         """Deletes a tenant by its ID, operating in the 'public' schema."""
         try:
-            self._set_search_path('public')
             print(f"Deleting tenant with ID: {tenant_id}")
             result = self.tenant_repository.delete_tenant(tenant_id)
 
             if not result:
                 print(f"Tenant with ID {tenant_id} not found.")
                 raise NotFound(f"Tenant with ID {tenant_id} not found.")
-            
+
+            tenant_cache.invalidate(result.schema_name)
+
             return result
         except Exception as e:
             print(f"Error deleting tenant with ID {tenant_id}: {e}")
@@ -1,9 +1,12 @@
 import logging
 from flask_injector import inject
 from werkzeug.exceptions import InternalServerError, NotFound, BadRequest
-from werkzeug.security import generate_password_hash
+from app.repositories.role_repository import RoleRepository
 from app.repositories.user_repository import UserRepository
+from app.utils.jwt_utils import encode_permission_mask
+from app.utils.password_policy import hash_password
 from app.services.usage_log_service import UsageLogService
+from app.utils.tenant_routing import current_schema
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +38,7 @@ class UserService:
             logger.info(f"Creating a new user with username: {username}, DNI: {dni}, and role ID: {role_id}")
 
             # Encriptar la contraseña antes de guardar
-            hashed_password = generate_password_hash(password)
+            hashed_password = hash_password(password)
 
             new_user = self.user_repository.create_user(
                 username=username,
@@ -138,7 +141,7 @@ class UserService:
             logger.info(f"Updating user with ID: {user_id}")
             # Encriptar la contraseña si se proporciona una nueva
             if password:
-                password = generate_password_hash(password)
+                password = hash_password(password)
 
             updated_user = self.user_repository.update_user(
                 user_id, username, password, full_name, mail, dni, role_id
@@ -204,4 +207,51 @@ class UserService:
             return self.user_repository.get_user_by_username(username)
         except Exception as e:
             logger.error(f"Error fetching user by username {username}: {e}")
-            raise InternalServerError("An internal error occurred while fetching the user.")
\ No newline at end of file
+            raise InternalServerError("An internal error occurred while fetching the user.")
+
+    def get_token_claims(self, user):
+        """
+        Builds the access token claims of a user, including its permissions.
+
+        Parameters:
+            user (User): The authenticated user.
+
+        Returns:
+            dict: The claims: user_id, username, role, the tenant schema the
+                token is valid for ("tenant"), the permission bitmask ("perms"),
+                the permissions version of the role ("rv") and the token version
+                of the user ("uv").
+        """
+        try:
+            claims = {
+                "user_id": user.id,
+                "username": user.username,
+                "role": user.role_id,
+                "tenant": current_schema(),
+            }
+            role_claims = RoleRepository.get_role_claims(user.role_id)
+            if role_claims:
+                permissions_version, permission_ids = role_claims
+                claims["perms"] = encode_permission_mask(permission_ids)
+                claims["rv"] = permissions_version
+                claims["uv"] = user.token_version
+            return claims
+        except Exception as e:
+            logger.error(f"Error building token claims for user {user.id}: {e}")
+            raise InternalServerError("An internal error occurred while building the token.")
+
+    def rehash_password(self, user, password):
+        """
+        Re-hashes the password of a user with the current hash policy.
+        Called after a successful login, so policy changes roll out gradually.
+
+        Parameters:
+            user (User): The authenticated user.
+            password (str): The password just verified.
+        """
+        try:
+            self.user_repository.update_password_hash(user.id, hash_password(password))
+            logger.info(f"Password of user {user.id} re-hashed with the current policy")
+        except Exception as e:
+            # The login already succeeded: the rehash is retried on the next login
+            logger.error(f"Error re-hashing password of user {user.id}: {e}")
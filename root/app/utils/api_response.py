@@ -45,6 +45,16 @@ class ApiResponse:
         }
         return jsonify(response_data), status
 
+    @staticmethod
+    def unprocessable_entity(result=None, message="The request could not be processed.", status=422):
+        response_data = {
+            "result": result,
+            "message": message,
+            "success": False,
+            "status": status
+        }
+        return jsonify(response_data), status
+
     @staticmethod
     def not_found(resource, resource_id=None, message=None, status=404):
         if not message:
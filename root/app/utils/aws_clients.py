@@ -0,0 +1,98 @@
+import threading
+from app.config import Config
+from app.utils.lazy_import import lazy_import
+
+boto3 = lazy_import("boto3")
+botocore_config = lazy_import("botocore.config")
+
+
+class AwsClientRegistry:
+    """
+    Container-scoped registry of boto3 clients.
+
+    Creating a client parses the service model and opens a new connection
+    pool, so clients are created lazily once per (service, region) and reused
+    by every invocation served by the container. Retries and timeouts come
+    from the AWS_* settings of Config.
+
+    Endpoints can be redirected to a local stub with the standard
+    AWS_ENDPOINT_URL / AWS_ENDPOINT_URL_<SERVICE> environment variables, or a
+    prepared client (e.g. wrapped by botocore.stub.Stubber) can be installed
+    with `register`.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._session = None
+        self._lock = threading.Lock()
+        self.created = {}
+        self.reused = {}
+
+    def client(self, service_name, region_name=None):
+        """
+        Returns the shared client of `service_name`, creating it on first use.
+
+        Args:
+            service_name (str): The AWS service (e.g. 'sqs', 'bedrock-runtime').
+            region_name (str, optional): The region (defaults to AWS_REGION).
+
+        Returns:
+            botocore.client.BaseClient: The shared client.
+        """
+        key = (service_name, region_name or Config.AWS_REGION)
+        client = self._clients.get(key)
+        if client is not None:
+            self._count(self.reused, service_name)
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._create_client(*key)
+                self._clients[key] = client
+                self._count(self.created, service_name)
+            else:
+                self._count(self.reused, service_name)
+        return client
+
+    def register(self, service_name, client, region_name=None):
+        """Installs `client` as the shared client of `service_name` (tests, stubs)."""
+        with self._lock:
+            self._clients[(service_name, region_name or Config.AWS_REGION)] = client
+
+    def prewarm(self, service_names=None):
+        """
+        Creates the clients of `service_names` ahead of time, e.g. during the
+        Lambda init phase (defaults to AWS_PREWARM_CLIENTS).
+        """
+        for service_name in service_names or Config.AWS_PREWARM_CLIENTS:
+            self.client(service_name)
+
+    def reset(self):
+        """Drops every client and counter."""
+        with self._lock:
+            self._clients.clear()
+            self.created.clear()
+            self.reused.clear()
+
+    @property
+    def stats(self):
+        return {"created": dict(self.created), "reused": dict(self.reused)}
+
+    def _create_client(self, service_name, region_name):
+        if self._session is None:
+            # boto3's default session is not thread safe; keep our own
+            self._session = boto3.session.Session()
+
+        config = botocore_config.Config(
+            retries={"max_attempts": Config.AWS_MAX_ATTEMPTS, "mode": Config.AWS_RETRY_MODE},
+            connect_timeout=Config.AWS_CONNECT_TIMEOUT,
+            read_timeout=Config.AWS_BEDROCK_READ_TIMEOUT if service_name == 'bedrock-runtime' else Config.AWS_READ_TIMEOUT,
+        )
+        return self._session.client(service_name, region_name=region_name, config=config)
+
+    def _count(self, counters, service_name):
+        counters[service_name] = counters.get(service_name, 0) + 1
+
+
+aws_clients = AwsClientRegistry()
@@ -1,5 +1,5 @@
-import boto3
 import json
+from app.utils.aws_clients import aws_clients
 
 class BedrockService:
     @staticmethod
@@ -15,8 +15,8 @@ class BedrockService:
         :return: Respuesta generada por el modelo.
         """
         try:
-            # Inicializar cliente de Amazon Bedrock
-            client = boto3.client("bedrock-runtime", region_name=region_name)
+            # Cliente compartido de Amazon Bedrock (se crea una sola vez por contenedor)
+            client = aws_clients.client("bedrock-runtime", region_name=region_name)
             
             # Preparar el payload para la solicitud
             payload = {
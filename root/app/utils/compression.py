@@ -0,0 +1,103 @@
+import gzip
+from functools import wraps
+from flask import current_app, request
+from app.config import Config
+
+try:
+    import brotli
+except ImportError:  # brotli is optional: gzip only
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html', 'text/plain', 'text/csv', 'application/x-ndjson')
+
+
+def no_compression(func):
+    """
+    Decorador para excluir una ruta de la compresión de respuestas
+    (e.g. respuestas en streaming o contenido ya comprimido).
+    """
+    @wraps(func)
+    def decorated_function(*args, **kwargs):
+        return func(*args, **kwargs)
+    decorated_function.no_compression = True
+    return decorated_function
+
+
+def available_encodings():
+    """Content codings this container can produce, in order of preference."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encodings):
+    """
+    Picks the content coding for a request.
+
+    Args:
+        accept_encodings (werkzeug.datastructures.Accept): The parsed Accept-Encoding header.
+
+    Returns:
+        str: 'br' or 'gzip', or None to send the body as is.
+    """
+    best, best_quality = None, 0
+    for encoding in available_encodings():
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=Config.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=Config.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def compress_response(response):
+    """
+    after_request hook: compresses JSON and text bodies of at least
+    COMPRESSION_MIN_SIZE bytes with the coding negotiated from Accept-Encoding.
+
+    The Lambda adapter returns bodies with a Content-Encoding base64-encoded,
+    so API Gateway must treat every media type as binary (BinaryMediaTypes */*).
+    """
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+
+    # The body depends on Accept-Encoding even when it is sent uncompressed
+    response.vary.add('Accept-Encoding')
+
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.direct_passthrough
+        or response.is_streamed
+        or 'Content-Encoding' in response.headers
+        or request.method == 'HEAD'
+    ):
+        return response
+
+    view_function = current_app.view_functions.get(request.endpoint)
+    if getattr(view_function, 'no_compression', False):
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < Config.COMPRESSION_MIN_SIZE:
+        return response
+
+    response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    # The representation changed: a strong ETag of the plain body no longer applies
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """Registers the response compression hook (COMPRESSION_ENABLED)."""
+    if Config.COMPRESSION_ENABLED:
+        app.after_request(compress_response)
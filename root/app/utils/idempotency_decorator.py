@@ -0,0 +1,89 @@
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import current_app, g, jsonify, request
+from app.config import Config
+from app.models.idempotency_key import IdempotencyKey
+from app.repositories.idempotency_repository import IdempotencyRepository
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def _fingerprint(fingerprint_fields):
+    user_data = getattr(g, "current_user", None) or {}
+    digest = hashlib.sha256()
+    digest.update(f"{user_data.get('user_id')}\n{request.method}\n{request.path}\n".encode('utf-8'))
+    if fingerprint_fields:
+        data = request.get_json(silent=True) or {}
+        digest.update(json.dumps([data.get(field) for field in fingerprint_fields], default=str).encode('utf-8'))
+    else:
+        digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def idempotent(fingerprint_fields=None):
+    """
+    Decorador para que una ruta se ejecute una sola vez por cabecera Idempotency-Key.
+
+    La primera solicitud registra la clave (tabla idempotency_keys del tenant) y
+    guarda su respuesta; los reintentos con la misma clave y el mismo contenido
+    reciben la respuesta guardada sin volver a ejecutar la ruta. Las respuestas
+    5xx no se guardan, para que un reintento pueda completarse. Sin la cabecera
+    la ruta se ejecuta normalmente.
+
+    :param fingerprint_fields: Campos del cuerpo JSON que identifican la solicitud
+        (por defecto, el cuerpo completo).
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapped_function(*args, **kwargs):
+            idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+            if not idempotency_key:
+                return f(*args, **kwargs)
+            if len(idempotency_key) > MAX_KEY_LENGTH:
+                return jsonify({"msg": f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters"}), 400
+
+            scope = f"{request.method} {request.url_rule.rule}"
+            fingerprint = _fingerprint(fingerprint_fields)
+            expires_at = datetime.utcnow() + timedelta(hours=Config.IDEMPOTENCY_KEY_TTL_HOURS)
+
+            if not IdempotencyRepository.claim_key(scope, idempotency_key, fingerprint, expires_at, Config.IDEMPOTENCY_LOCK_TIMEOUT):
+                stored = IdempotencyRepository.get_key(scope, idempotency_key)
+                if stored is None:
+                    # Released by a failed request in the meantime: the client may retry
+                    return jsonify({"msg": "A request with this Idempotency-Key failed, retry"}), 409
+                if stored.fingerprint != fingerprint:
+                    return jsonify({"msg": f"{IDEMPOTENCY_HEADER} was already used for a different request"}), 422
+                if stored.status == IdempotencyKey.STATUS_IN_PROGRESS:
+                    response = jsonify({"msg": "A request with this Idempotency-Key is still being processed"})
+                    response.headers['Retry-After'] = '1'
+                    return response, 409
+
+                logger.info(f"Replaying stored response for {IDEMPOTENCY_HEADER} {idempotency_key} ({scope})")
+                response = current_app.response_class(
+                    stored.response_body, status=stored.response_status, content_type=stored.response_content_type
+                )
+                response.headers['Idempotent-Replayed'] = 'true'
+                return response
+
+            try:
+                response = current_app.make_response(f(*args, **kwargs))
+            except Exception:
+                IdempotencyRepository.release_key(scope, idempotency_key)
+                raise
+
+            if response.status_code >= 500:
+                IdempotencyRepository.release_key(scope, idempotency_key)
+            else:
+                IdempotencyRepository.complete_key(
+                    scope, idempotency_key, response.status_code, response.get_data(as_text=True), response.content_type
+                )
+            return response
+
+        return wrapped_function
+    return decorator
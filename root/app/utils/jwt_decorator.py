@@ -2,6 +2,7 @@ from functools import wraps
 from flask import request, jsonify, g
 import jwt
 from app.config import Config
+from app.utils.tenant_routing import current_schema
 
 def jwt_required(func):
     @wraps(func)
@@ -23,6 +24,10 @@ def jwt_required(func):
         except jwt.InvalidTokenError:
             return jsonify({"msg": "Invalid token"}), 401
 
+        # El token solo es válido en el tenant (schema) para el que se emitió
+        if decoded_token.get("tenant") != current_schema():
+            return jsonify({"msg": "Token is not valid for this tenant"}), 401
+
         
 
         return func(*args, **kwargs)
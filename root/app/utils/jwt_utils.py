@@ -16,6 +16,29 @@ def create_jwt_token(data, expires_in=20):
     token = jwt.encode(payload, Config.SECRET_KEY, algorithm="HS256")
     return token
 
+def encode_permission_mask(permission_ids):
+    """
+    Codifica un conjunto de IDs de permisos como un bitmask hexadecimal
+    (bit N encendido = permiso con ID N) para el claim "perms" del token.
+
+    :param permission_ids: IDs de los permisos.
+    :return: El bitmask como cadena hexadecimal.
+    """
+    mask = 0
+    for permission_id in permission_ids:
+        mask |= 1 << permission_id
+    return format(mask, 'x')
+
+def mask_has_permission(mask, permission_id):
+    """
+    Indica si el bitmask hexadecimal del claim "perms" incluye el permiso.
+
+    :param mask: El bitmask como cadena hexadecimal.
+    :param permission_id: El ID del permiso.
+    :return: True si el permiso está incluido.
+    """
+    return bool(int(mask, 16) >> permission_id & 1)
+
 def decode_jwt_token(token):
     """
     Decodifica un token JWT y verifica su validez.
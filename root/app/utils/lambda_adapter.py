@@ -0,0 +1,220 @@
+import sys
+from base64 import b64decode, b64encode
+from io import BytesIO
+from urllib.parse import unquote_to_bytes, urlencode
+
+# Responses with these content types are returned as text, everything else as base64
+TEXT_CONTENT_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', 'application/x-ndjson')
+TEXT_CONTENT_SUFFIXES = ('+json', '+xml')
+
+_EMPTY_BODY = b''
+
+
+def handle_request(app, event, context):
+    """
+    Runs a WSGI application for an API Gateway proxy event.
+
+    Supports REST API (payload v1) and HTTP API (payload v2) events, base64
+    request bodies, and binary or compressed (Content-Encoding) response
+    bodies, which are returned base64-encoded.
+
+    API Gateway delivers the request body whole inside the event, so
+    wsgi.input is an in-memory buffer of the decoded body: endpoints that read
+    it as a stream (e.g. /answers/stream) bound the memory of what they build
+    from it, not of the body itself.
+
+    Args:
+        app: The WSGI application.
+        event (dict): The API Gateway event.
+        context: The Lambda context.
+
+    Returns:
+        dict: The API Gateway proxy response.
+    """
+    is_v2 = event.get('version') == '2.0'
+    environ = _environ_v2(event, context) if is_v2 else _environ_v1(event, context)
+
+    response = _StartResponse()
+    app_iter = app(environ, response)
+    try:
+        chunks = response.chunks
+        chunks.extend(app_iter)
+        body = chunks[0] if len(chunks) == 1 else _EMPTY_BODY.join(chunks)
+    finally:
+        if hasattr(app_iter, 'close'):
+            app_iter.close()
+
+    return response.build_v2(body) if is_v2 else response.build_v1(body)
+
+
+def _decode_body(event):
+    body = event.get('body')
+    if not body:
+        return _EMPTY_BODY
+    if event.get('isBase64Encoded'):
+        return b64decode(body)
+    return body.encode('utf-8')
+
+
+def _base_environ(event, context, method, path_info, query_string, body, source_ip):
+    return {
+        'REQUEST_METHOD': method,
+        'SCRIPT_NAME': '',
+        'PATH_INFO': path_info,
+        'QUERY_STRING': query_string,
+        'SERVER_NAME': 'lambda',
+        'SERVER_PORT': '443',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': source_ip or '127.0.0.1',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'https',
+        'wsgi.input': BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': False,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+        'lambda.event': event,
+        'lambda.context': context,
+    }
+
+
+def _add_header(environ, name, value):
+    key = name.upper().replace('-', '_')
+    if key == 'CONTENT_TYPE':
+        environ['CONTENT_TYPE'] = value
+        return
+    if key == 'CONTENT_LENGTH':
+        return
+    if key == 'HOST':
+        environ['SERVER_NAME'] = value
+    elif key == 'X_FORWARDED_PROTO':
+        environ['wsgi.url_scheme'] = value
+    elif key == 'X_FORWARDED_PORT':
+        environ['SERVER_PORT'] = value
+    environ['HTTP_' + key] = value
+
+
+def _environ_v1(event, context):
+    multi_query = event.get('multiValueQueryStringParameters')
+    if multi_query:
+        query_string = urlencode(multi_query, doseq=True)
+    else:
+        query_string = urlencode(event.get('queryStringParameters') or {})
+
+    request_context = event.get('requestContext') or {}
+    body = _decode_body(event)
+    environ = _base_environ(
+        event, context,
+        method=event['httpMethod'],
+        # WSGI strings carry the raw UTF-8 bytes as latin-1
+        path_info=event['path'].encode('utf-8').decode('latin-1'),
+        query_string=query_string,
+        body=body,
+        source_ip=(request_context.get('identity') or {}).get('sourceIp'),
+    )
+
+    multi_headers = event.get('multiValueHeaders')
+    if multi_headers:
+        for name, values in multi_headers.items():
+            _add_header(environ, name, ','.join(values))
+    else:
+        for name, value in (event.get('headers') or {}).items():
+            _add_header(environ, name, value)
+
+    return environ
+
+
+def _environ_v2(event, context):
+    http_context = event['requestContext']['http']
+    body = _decode_body(event)
+    environ = _base_environ(
+        event, context,
+        method=http_context['method'],
+        path_info=unquote_to_bytes(event['rawPath']).decode('latin-1'),
+        query_string=event.get('rawQueryString', ''),
+        body=body,
+        source_ip=http_context.get('sourceIp'),
+    )
+
+    for name, value in (event.get('headers') or {}).items():
+        _add_header(environ, name, value)
+
+    cookies = event.get('cookies')
+    if cookies:
+        environ['HTTP_COOKIE'] = '; '.join(cookies)
+
+    return environ
+
+
+def _is_text(content_type):
+    content_type = content_type.split(';', 1)[0].strip().lower()
+    return content_type.startswith(TEXT_CONTENT_TYPES) or content_type.endswith(TEXT_CONTENT_SUFFIXES)
+
+
+class _StartResponse:
+    """WSGI start_response callable that keeps the status, headers and written chunks."""
+
+    def __init__(self):
+        self.status = 500
+        self.headers = []
+        self.chunks = []
+
+    def __call__(self, status, headers, exc_info=None):
+        self.status = int(status.split(' ', 1)[0])
+        self.headers = headers
+        return self.chunks.append
+
+    def _encode_body(self, body):
+        content_type = ''
+        encoded = False
+        for name, value in self.headers:
+            lower_name = name.lower()
+            if lower_name == 'content-type':
+                content_type = value
+            elif lower_name == 'content-encoding':
+                encoded = True
+
+        if not body:
+            return '', False
+        if not encoded and (not content_type or _is_text(content_type)):
+            try:
+                return body.decode('utf-8'), False
+            except UnicodeDecodeError:
+                pass
+        return b64encode(body).decode('ascii'), True
+
+    def build_v1(self, body):
+        multi_headers = {}
+        for name, value in self.headers:
+            multi_headers.setdefault(name, []).append(value)
+
+        body, is_base64 = self._encode_body(body)
+        return {
+            'statusCode': self.status,
+            'multiValueHeaders': multi_headers,
+            'body': body,
+            'isBase64Encoded': is_base64,
+        }
+
+    def build_v2(self, body):
+        headers = {}
+        cookies = []
+        for name, value in self.headers:
+            if name.lower() == 'set-cookie':
+                cookies.append(value)
+            elif name in headers:
+                headers[name] = f"{headers[name]},{value}"
+            else:
+                headers[name] = value
+
+        body, is_base64 = self._encode_body(body)
+        response = {
+            'statusCode': self.status,
+            'headers': headers,
+            'body': body,
+            'isBase64Encoded': is_base64,
+        }
+        if cookies:
+            response['cookies'] = cookies
+        return response
@@ -0,0 +1,36 @@
+import importlib
+import importlib.util
+import sys
+from app.config import Config
+
+
+def lazy_import(name):
+    """
+    Returns module `name`, deferring its execution until an attribute is first used.
+
+    Heavy dependencies that only some routes need (e.g. boto3) are imported
+    this way so they do not add to the Lambda Init Duration of every cold start.
+    Set LAZY_IMPORTS=false to import eagerly (e.g. to compare startup times).
+
+    Args:
+        name (str): The absolute module name.
+
+    Returns:
+        module: The (possibly not yet executed) module.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    if not Config.LAZY_IMPORTS:
+        return importlib.import_module(name)
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,33 @@
+import io
+from werkzeug.exceptions import RequestEntityTooLarge
+
+
+def iter_lines(stream, max_line_bytes, max_bytes=None):
+    """
+    Itera las líneas de un cuerpo NDJSON sin copiarlo completo. De las líneas de
+    más de `max_line_bytes` solo se conserva el comienzo (se reportan como error).
+    En Lambda el cuerpo ya está en memoria (ver lambda_adapter.handle_request).
+
+    Con `max_bytes` cuenta los bytes leídos (también los descartados de líneas
+    largas) y corta la lectura con RequestEntityTooLarge al pasar el límite, así
+    se aplica también a cargas sin Content-Length (chunked).
+    """
+    # LimitedStream lee byte a byte en readline: se usa un buffer
+    reader = io.BufferedReader(stream, buffer_size=64 * 1024)
+    read_bytes = 0
+    while True:
+        line = reader.readline(max_line_bytes + 1)
+        if not line:
+            return
+        read_bytes += len(line)
+        oversized = line
+        while not oversized.endswith(b'\n') and len(oversized) > max_line_bytes:
+            if max_bytes is not None and read_bytes > max_bytes:
+                break
+            oversized = reader.readline(max_line_bytes + 1)
+            if not oversized:
+                break
+            read_bytes += len(oversized)
+        if max_bytes is not None and read_bytes > max_bytes:
+            raise RequestEntityTooLarge(f"The upload exceeds {max_bytes} bytes.")
+        yield line
@@ -0,0 +1,116 @@
+import logging
+import os
+import time
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Hash method per Lambda memory size (MB, inclusive upper bound). Lambda gives
+# CPU in proportion to memory (1769 MB = 1 vCPU), so each profile keeps a
+# verification around 0.45 s at its size. Nothing goes below werkzeug's default
+# (scrypt N=32768): up to 512 MB verifications are slower instead of weaker.
+# Re-measure with benchmarks/password_hash_benchmark.py.
+PASSWORD_HASH_PROFILES = (
+    (512, 'scrypt:32768:8:1'),
+    (1536, 'scrypt:65536:8:1'),
+    (None, 'scrypt:131072:8:1'),
+)
+
+# Outside Lambda (local runs, sam local): werkzeug's default, also the floor of the policy
+DEFAULT_PASSWORD_HASH_METHOD = 'scrypt:32768:8:1'
+
+
+def normalize_method(method):
+    """Expands a werkzeug method to the full form stored in the hashes (e.g. 'scrypt' -> 'scrypt:32768:8:1')."""
+    if method == 'scrypt':
+        return DEFAULT_PASSWORD_HASH_METHOD
+    if method == 'pbkdf2':
+        return f"pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}"
+    if method.startswith('pbkdf2:') and method.count(':') == 1:
+        return f"{method}:{DEFAULT_PBKDF2_ITERATIONS}"
+    return method
+
+
+def method_for_memory(memory_size):
+    """Returns the hash method of the profile of a Lambda memory size (MB)."""
+    for max_memory, method in PASSWORD_HASH_PROFILES:
+        if max_memory is None or memory_size <= max_memory:
+            return method
+
+
+def current_method():
+    """
+    Hash method of this deployment: PASSWORD_HASH_METHOD if set, otherwise the
+    profile of the Lambda memory size (AWS_LAMBDA_FUNCTION_MEMORY_SIZE). Never
+    weaker than DEFAULT_PASSWORD_HASH_METHOD.
+    """
+    if Config.PASSWORD_HASH_METHOD:
+        method = normalize_method(Config.PASSWORD_HASH_METHOD)
+        if is_weaker(method, DEFAULT_PASSWORD_HASH_METHOD):
+            logger.warning(f"PASSWORD_HASH_METHOD {method} is below the floor, using {DEFAULT_PASSWORD_HASH_METHOD}")
+            return DEFAULT_PASSWORD_HASH_METHOD
+        return method
+    memory_size = os.getenv('AWS_LAMBDA_FUNCTION_MEMORY_SIZE')
+    if memory_size:
+        return method_for_memory(int(memory_size))
+    return DEFAULT_PASSWORD_HASH_METHOD
+
+
+def _method_cost(method):
+    """
+    Comparable cost of a full werkzeug method: ('scrypt', N * r * p) or
+    ('pbkdf2:<digest>', iterations). None if the method is not recognized.
+    """
+    parts = method.split(':')
+    try:
+        if parts[0] == 'scrypt' and len(parts) == 4:
+            return 'scrypt', int(parts[1]) * int(parts[2]) * int(parts[3])
+        if parts[0] == 'pbkdf2' and len(parts) == 3:
+            return f"pbkdf2:{parts[1]}", int(parts[2])
+    except ValueError:
+        pass
+    return None
+
+
+def is_weaker(method, reference):
+    """
+    Indicates whether `method` is weaker than `reference`. scrypt (memory-hard)
+    is stronger than any pbkdf2; within a family, the cost parameters decide.
+    Unknown methods count as weaker.
+    """
+    cost, reference_cost = _method_cost(method), _method_cost(reference)
+    if cost is None:
+        return True
+    if reference_cost is None or cost[0] == reference_cost[0]:
+        return reference_cost is not None and cost[1] < reference_cost[1]
+    return reference_cost[0] == 'scrypt'
+
+
+def hash_password(password):
+    """Hashes a password with the method of the current policy."""
+    return generate_password_hash(password, method=current_method())
+
+
+def needs_rehash(password_hash):
+    """
+    Indicates whether a stored hash is weaker than the current policy. Stronger
+    hashes (e.g. made by a larger Lambda) are kept, never downgraded.
+    """
+    return is_weaker(normalize_method(password_hash.split('$', 1)[0]), current_method())
+
+
+def verify_password(password_hash, password):
+    """
+    Checks a password against its stored hash and logs the verification time.
+
+    Returns:
+        bool: True if the password matches.
+    """
+    method = password_hash.split('$', 1)[0]
+    started = time.perf_counter()
+    valid = check_password_hash(password_hash, password)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    logger.info(f"password_verify method={method} ms={elapsed_ms:.1f} valid={valid}")
+    return valid
@@ -0,0 +1,146 @@
+import threading
+from collections import namedtuple
+from app.config import Config
+from app.utils.ttl_cache import TTLCache
+
+# Permissions of a user: its role and the set of permission names of that role
+CachedPermissions = namedtuple('CachedPermissions', ['role_id', 'names'])
+
+_UNKNOWN_ENTITY = object()
+
+
+class PermissionCache:
+    """
+    Per-container cache of the permission set of each (tenant schema, user).
+
+    Entries are tagged with the version of their tenant. Changes that affect
+    many users (role permissions, role deletion) bump the tenant version, which
+    discards every entry of the tenant at once; changes to a single user drop
+    only its entry. Other containers pick up changes when their entries expire
+    after PERMISSION_CACHE_TTL seconds.
+    """
+
+    def __init__(self, ttl, max_size=4096):
+        self._cache = TTLCache(ttl=ttl, max_size=max_size)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, schema_name, user_id, loader):
+        """
+        Returns the permissions of a user.
+
+        Args:
+            schema_name (str): The tenant schema the user belongs to.
+            user_id (int): The user ID.
+            loader (callable): Called with `user_id` on a cache miss; must return
+                CachedPermissions, or None if the user does not exist.
+
+        Returns:
+            CachedPermissions: The role and permission names, or None if the user does not exist.
+        """
+        key = (schema_name, user_id)
+        version = self._versions.get(schema_name, 0)
+
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        permissions = loader(user_id)
+        if permissions is not None:
+            self._cache.set(key, (version, permissions))
+        return permissions
+
+    def invalidate_user(self, schema_name, user_id):
+        """Drops the cached permissions of one user."""
+        self._cache.invalidate((schema_name, user_id))
+
+    def invalidate_tenant(self, schema_name):
+        """Discards the cached permissions of every user of a tenant."""
+        with self._lock:
+            self._versions[schema_name] = self._versions.get(schema_name, 0) + 1
+
+    def clear(self):
+        self._cache.clear()
+
+    @property
+    def stats(self):
+        return {"hits": self._cache.hits, "misses": self._cache.misses, "size": len(self._cache)}
+
+
+class VersionCache:
+    """
+    Per-container cache of a token version column (`roles.permissions_version`
+    or `users.token_version`), used to revoke access tokens issued before the
+    permissions of their role, or their user, changed.
+
+    Changes made by this container are seen at once; changes made by other
+    containers after ROLE_VERSION_CACHE_TTL seconds.
+    """
+
+    def __init__(self, ttl, max_size=1024):
+        self._cache = TTLCache(ttl=ttl, max_size=max_size)
+
+    def resolve(self, schema_name, entity_id, loader):
+        """
+        Returns the version of a role or user.
+
+        Args:
+            schema_name (str): The tenant schema of the role or user.
+            entity_id (int): The role or user ID.
+            loader (callable): Called with `entity_id` on a cache miss; must return
+                the version, or None if the row does not exist.
+
+        Returns:
+            int: The version, or None if the row does not exist.
+        """
+        key = (schema_name, entity_id)
+        cached = self._cache.get(key)
+        if cached is _UNKNOWN_ENTITY:
+            return None
+        if cached is not None:
+            return cached
+
+        version = loader(entity_id)
+        self._cache.set(key, _UNKNOWN_ENTITY if version is None else version)
+        return version
+
+    def invalidate(self, schema_name, entity_id):
+        self._cache.invalidate((schema_name, entity_id))
+
+    @property
+    def stats(self):
+        return {"hits": self._cache.hits, "misses": self._cache.misses, "size": len(self._cache)}
+
+
+class PermissionCatalogCache:
+    """Per-container cache of the permission name -> ID map of each tenant."""
+
+    def __init__(self, ttl, max_size=256):
+        self._cache = TTLCache(ttl=ttl, max_size=max_size)
+
+    def resolve(self, schema_name, loader):
+        """
+        Returns the permission catalog of a tenant.
+
+        Args:
+            schema_name (str): The tenant schema.
+            loader (callable): Called without arguments on a cache miss; must
+                return a dict of permission name -> permission ID.
+
+        Returns:
+            dict: The permission IDs by name.
+        """
+        catalog = self._cache.get(schema_name)
+        if catalog is None:
+            catalog = loader()
+            self._cache.set(schema_name, catalog)
+        return catalog
+
+    def invalidate(self, schema_name):
+        self._cache.invalidate(schema_name)
+
+
+permission_cache = PermissionCache(ttl=Config.PERMISSION_CACHE_TTL)
+role_version_cache = VersionCache(ttl=Config.ROLE_VERSION_CACHE_TTL)
+user_version_cache = VersionCache(ttl=Config.ROLE_VERSION_CACHE_TTL)
+permission_catalog_cache = PermissionCatalogCache(ttl=Config.PERMISSION_CACHE_TTL)
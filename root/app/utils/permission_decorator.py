@@ -1,11 +1,22 @@
 from functools import wraps
 from flask import jsonify, g
-from app.models.user import User
+from app.repositories.permission_repository import PermissionRepository
+from app.repositories.role_repository import RoleRepository
+from app.repositories.user_repository import UserRepository
+from app.utils.jwt_utils import mask_has_permission
+from app.utils.permission_cache import permission_cache, permission_catalog_cache, role_version_cache, user_version_cache
+from app.utils.tenant_routing import current_schema
 
 def requires_permission(name):
     """
     Decorador para verificar si el usuario tiene el permiso requerido.
-    
+
+    El token debe haberse emitido para el tenant de la solicitud (claim "tenant").
+    Los tokens con claims de permisos ("perms", "rv" y "uv") se autorizan con el
+    propio token y dos verificaciones cacheadas: la versión del usuario (que
+    además comprueba que siga existiendo) y la versión de permisos del rol; los
+    tokens emitidos sin esos claims consultan los permisos del usuario.
+
     :param name: Nombre del permiso requerido para acceder a la ruta.
     """
     def decorator(f):
@@ -17,19 +28,47 @@ def requires_permission(name):
                 if not user_data:
                     return jsonify({"msg": "Unauthorized"}), 401
 
-                # Obtener el usuario desde la base de datos
-                user = User.query.get(user_data.get("user_id"))
-                if not user:
+                # Los claims y el user_id solo tienen sentido en el tenant que emitió el token
+                schema = current_schema()
+                if user_data.get("tenant") != schema:
+                    return jsonify({"msg": "Token is not valid for this tenant"}), 401
+
+                if "perms" in user_data and "rv" in user_data and "uv" in user_data:
+                    # El token deja de ser válido si el usuario se eliminó, cambió de rol o de contraseña
+                    user_version = user_version_cache.resolve(
+                        schema, user_data.get("user_id"), UserRepository.get_token_version
+                    )
+                    if user_version is None or user_version != user_data["uv"]:
+                        return jsonify({"msg": "Token has been revoked"}), 401
+
+                    # El token deja de ser válido si los permisos de su rol cambiaron
+                    role_version = role_version_cache.resolve(
+                        schema, user_data.get("role"), RoleRepository.get_permissions_version
+                    )
+                    if role_version is None or role_version != user_data["rv"]:
+                        return jsonify({"msg": "Token has been revoked"}), 401
+
+                    permission_id = permission_catalog_cache.resolve(
+                        schema, PermissionRepository.get_permission_catalog
+                    ).get(name)
+                    if permission_id is None or not mask_has_permission(user_data["perms"], permission_id):
+                        return jsonify({"msg": "Permission denied"}), 403
+
+                    return f(*args, **kwargs)
+
+                # Obtener los permisos del usuario (cache por tenant y usuario)
+                permissions = permission_cache.resolve(
+                    schema, user_data.get("user_id"), PermissionRepository.get_user_permissions
+                )
+                if permissions is None:
                     return jsonify({"msg": "User not found"}), 404
 
                 # Verificar si el usuario tiene un rol asignado
-                role = user.role
-                if not role:
+                if permissions.role_id is None:
                     return jsonify({"msg": "Role not assigned"}), 400
 
                 # Verificar si el rol tiene el permiso requerido
-                has_permission = any(perm.name == name for perm in role.permissions)
-                if not has_permission:
+                if name not in permissions.names:
                     return jsonify({"msg": "Permission denied"}), 403
 
                 # Si tiene el permiso, continuar con la ejecución de la vista
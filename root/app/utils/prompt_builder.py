@@ -0,0 +1,176 @@
+import math
+from collections import namedtuple
+from app.config import Config
+
+# Plantillas del prompt de feedback por versión. La versión viaja en el mensaje
+# SQS: una plantilla nueva se agrega con otra clave, sin modificar las anteriores
+# (v1 fue el prompt sin límite de tamaño, anterior a este módulo).
+PROMPT_TEMPLATES = {
+    'answers-feedback/v2': {
+        'header': "Generate feedback for the following responses:\n",
+        'line': "Descripción: {description}, Puntaje: {score}, Pregunta: {question}\n",
+        'omitted': "({count} more responses omitted)\n",
+    },
+}
+PROMPT_TEMPLATE_VERSION = 'answers-feedback/v2'
+
+# Aproximación sin tokenizer: ~4 caracteres por token en texto latino
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = " [...]"
+# Los nombres de pregunta se recortan a un máximo fijo; si el texto fijo de las
+# líneas no entra en el presupuesto, se acortan a los siguientes máximos
+MAX_QUESTION_TOKENS = 50
+QUESTION_TOKEN_STEPS = (MAX_QUESTION_TOKENS, 25, 10, 0)
+# Tokens de descripción garantizados a cada respuesta incluida: antes de dejar
+# respuestas sin descripción se omiten respuestas
+MIN_ANSWER_TOKENS = 20
+
+PromptEntry = namedtuple('PromptEntry', ['description', 'score', 'question'])
+BuiltPrompt = namedtuple('BuiltPrompt', ['text', 'version', 'estimated_tokens', 'truncated', 'omitted'])
+
+
+def estimate_tokens(text):
+    """Estimación (por exceso) de los tokens de `text`."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text, max_tokens):
+    """
+    Recorta `text` para que su estimación no supere `max_tokens`, en un límite
+    de palabra si hay uno cerca, y marca el recorte con TRUNCATION_MARKER.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    if max_chars < len(TRUNCATION_MARKER):
+        return ""
+    cut = text[:max_chars - len(TRUNCATION_MARKER)]
+    word_boundary = cut.rfind(" ")
+    if word_boundary >= len(cut) * 0.8:
+        cut = cut[:word_boundary]
+    return cut.rstrip() + TRUNCATION_MARKER
+
+
+def allocate_budget(needs, budget):
+    """
+    Reparte `budget` tokens entre respuestas que necesitan `needs` (water-filling):
+    las que caben en la parte equitativa la reciben completa y lo que sobra se
+    reparte entre las más largas. Para las mismas entradas el resultado es siempre
+    el mismo, así que el mismo envío produce el mismo prompt.
+    """
+    if sum(needs) <= budget:
+        return list(needs)
+
+    allocations = [0] * len(needs)
+    remaining = budget
+    # De menor a mayor necesidad; a igual necesidad, en el orden de las respuestas
+    order = sorted(range(len(needs)), key=lambda index: (needs[index], index))
+    for position, index in enumerate(order):
+        share = remaining // (len(needs) - position)
+        allocations[index] = min(needs[index], share)
+        remaining -= allocations[index]
+    return allocations
+
+
+class PromptBuilder:
+    """
+    Arma el prompt de feedback de un conjunto de respuestas dentro de un
+    presupuesto de tokens, para que el costo y la latencia de cada llamada al
+    modelo (y el tamaño del mensaje SQS) tengan un máximo conocido.
+
+    `max_tokens` es un límite estricto de la estimación del prompt completo:
+
+    1. Cada descripción se recorta primero a `max_answer_tokens`.
+    2. Si el texto fijo de las líneas (puntaje, nombre de la pregunta) más
+       MIN_ANSWER_TOKENS de descripción por respuesta no entra, los nombres de
+       pregunta se acortan según QUESTION_TOKEN_STEPS y, si aún no entra, se
+       omiten las últimas respuestas (una línea indica cuántas).
+    3. El presupuesto que queda se reparte entre las descripciones con
+       `allocate_budget`.
+
+    Todos los pasos dependen solo de las entradas: el mismo envío da el mismo prompt.
+    """
+
+    def __init__(self, max_tokens, max_answer_tokens, version=PROMPT_TEMPLATE_VERSION):
+        self.max_tokens = max_tokens
+        self.max_answer_tokens = max_answer_tokens
+        self.version = version
+        self.template = PROMPT_TEMPLATES[version]
+        # Lo mínimo que se envía: la cabecera y la línea de respuestas omitidas
+        minimum = self.template['header'] + self.template['omitted'].format(count=10 ** 6)
+        if estimate_tokens(minimum) > max_tokens:
+            raise ValueError(f"max_tokens ({max_tokens}) is too small for the {version} template")
+
+    def build(self, entries):
+        """
+        :param entries: Lista de PromptEntry (descripción, puntaje, nombre de la pregunta).
+        :return: BuiltPrompt con el texto, la versión de la plantilla, los tokens
+            estimados, cuántas descripciones se recortaron y cuántas respuestas
+            se omitieron.
+        """
+        entries = [
+            PromptEntry(str(entry.description or ""), entry.score, str(entry.question))
+            for entry in entries
+        ]
+        # Trabaja en caracteres: estimate_tokens(texto) <= max_tokens si y solo si
+        # len(texto) <= max_tokens * CHARS_PER_TOKEN
+        budget_chars = self.max_tokens * CHARS_PER_TOKEN
+
+        # Las respuestas que no entrarían ni con la línea más corta posible se omiten de entrada
+        omitted = 0
+        capacity = budget_chars // len(self.template['line'].format(description="", score="", question=""))
+        if len(entries) > capacity:
+            omitted = len(entries) - capacity
+            entries = entries[:capacity]
+
+        for question_tokens in QUESTION_TOKEN_STEPS:
+            lines = [
+                entry._replace(question=truncate_to_tokens(entry.question, question_tokens))
+                for entry in entries
+            ]
+            line_chars = [self._required_chars(line) for line in lines]
+            required_chars = len(self.template['header']) + sum(line_chars)
+            if required_chars + self._omitted_chars(omitted) <= budget_chars:
+                break
+
+        # Aún sin nombres de pregunta no entra: se omiten las últimas respuestas
+        while required_chars + self._omitted_chars(omitted) > budget_chars:
+            lines.pop()
+            required_chars -= line_chars.pop()
+            omitted += 1
+
+        needs = [min(estimate_tokens(line.description), self.max_answer_tokens) for line in lines]
+        fixed_chars = len(self.template['header']) + sum(len(self._line(line, "")) for line in lines)
+        allocations = allocate_budget(
+            needs, (budget_chars - fixed_chars - self._omitted_chars(omitted)) // CHARS_PER_TOKEN
+        )
+
+        text = self.template['header']
+        truncated = 0
+        for line, allocation in zip(lines, allocations):
+            description = truncate_to_tokens(line.description, allocation)
+            if description != line.description:
+                truncated += 1
+            text += self._line(line, description)
+        if omitted:
+            text += self.template['omitted'].format(count=omitted)
+
+        estimated_tokens = estimate_tokens(text)
+        assert estimated_tokens <= self.max_tokens, f"prompt of {estimated_tokens} tokens over {self.max_tokens}"
+        return BuiltPrompt(text, self.version, estimated_tokens, truncated, omitted)
+
+    def _required_chars(self, line):
+        """Caracteres de la línea sin descripción más los de su descripción mínima."""
+        reserved = min(estimate_tokens(line.description), self.max_answer_tokens, MIN_ANSWER_TOKENS)
+        return len(self._line(line, "")) + reserved * CHARS_PER_TOKEN
+
+    def _omitted_chars(self, omitted):
+        return len(self.template['omitted'].format(count=omitted)) if omitted else 0
+
+    def _line(self, entry, description):
+        return self.template['line'].format(description=description, score=entry.score, question=entry.question)
+
+
+feedback_prompt_builder = PromptBuilder(
+    max_tokens=Config.PROMPT_MAX_TOKENS, max_answer_tokens=Config.PROMPT_MAX_ANSWER_TOKENS
+)
@@ -0,0 +1,34 @@
+from app.config import Config
+from app.utils.ttl_cache import TTLCache
+
+
+class QuestionMapCache:
+    """
+    Per-container cache of the question names of each evaluation, keyed by
+    (tenant schema, evaluation ID) and holding a dict of question ID -> name.
+
+    Questions rarely change once an evaluation is published, so entries live
+    for QUESTION_CACHE_TTL seconds; question changes made by this container
+    drop the affected evaluations at once.
+    """
+
+    def __init__(self, ttl, max_size=2048):
+        self._cache = TTLCache(ttl=ttl, max_size=max_size)
+
+    def get(self, schema_name, id_evaluation):
+        return self._cache.get((schema_name, id_evaluation))
+
+    def set(self, schema_name, id_evaluation, question_names):
+        self._cache.set((schema_name, id_evaluation), question_names)
+
+    def invalidate(self, schema_name, *evaluation_ids):
+        """Drops the question maps of the given evaluations."""
+        for id_evaluation in evaluation_ids:
+            self._cache.invalidate((schema_name, id_evaluation))
+
+    @property
+    def stats(self):
+        return {"hits": self._cache.hits, "misses": self._cache.misses, "size": len(self._cache)}
+
+
+question_cache = QuestionMapCache(ttl=Config.QUESTION_CACHE_TTL)
@@ -1,21 +1,120 @@
-import boto3
 import json
 import os
+import random
+import time
+from collections import namedtuple
+from app.utils.aws_clients import aws_clients
+
+# Límites de SendMessageBatch
+MAX_BATCH_ENTRIES = 10
+MAX_BATCH_PAYLOAD_BYTES = 256 * 1024
+
+
+class BatchEntryResult(namedtuple('BatchEntryResult', ['id', 'message_id', 'error', 'sender_fault', 'attempts'])):
+    """Resultado del envío de un mensaje: el MessageId de SQS o el error del último intento."""
+
+    @property
+    def success(self):
+        return self.error is None
+
 
 class SQSUtils:
     @staticmethod
-    def send_message(message_body):
+    def send_message(message_body, queue_url=None):
         """
         Envía un mensaje a una cola SQS.
-        :param queue_url: URL de la cola.
         :param message_body: Cuerpo del mensaje.
+        :param queue_url: URL de la cola (por defecto `SQS_QUEUE_URL`).
         """
-        client = boto3.client("sqs")
+        client = aws_clients.client("sqs")
         try:
             response = client.send_message(
-                QueueUrl=os.getenv('SQS_QUEUE_URL'),
+                QueueUrl=queue_url or os.getenv('SQS_QUEUE_URL'),
                 MessageBody=json.dumps(message_body)
             )
             return response
         except Exception as e:
             raise Exception(f"Error sending message to SQS: {str(e)}")
+
+    @staticmethod
+    def send_message_batch(messages, queue_url=None, max_attempts=3, retry_delay=0.1):
+        """
+        Envía varios mensajes a una cola SQS con SendMessageBatch.
+
+        Los mensajes se agrupan en llamadas de hasta 10 entradas y 256 KB de
+        payload. Solo se reintentan (con espera exponencial) las entradas que
+        fallan por causas del servicio; las rechazadas por el mensaje
+        (SenderFault) o de más de 256 KB no se reintentan.
+        :param messages: Lista de (id, cuerpo) de los mensajes; el id identifica
+            cada mensaje en el resultado.
+        :param queue_url: URL de la cola (por defecto `SQS_QUEUE_URL`).
+        :param max_attempts: Intentos por mensaje.
+        :param retry_delay: Espera base (segundos) entre intentos.
+        :return: Lista de `BatchEntryResult`, en el orden de `messages`.
+        """
+        client = aws_clients.client("sqs")
+        queue_url = queue_url or os.getenv('SQS_QUEUE_URL')
+        results = [None] * len(messages)
+
+        pending = []
+        for index, (message_id, message_body) in enumerate(messages):
+            body = json.dumps(message_body)
+            size = len(body.encode('utf-8'))
+            if size > MAX_BATCH_PAYLOAD_BYTES:
+                results[index] = BatchEntryResult(
+                    message_id, None, f"MessageTooLong: {size} bytes (max {MAX_BATCH_PAYLOAD_BYTES})", True, 0
+                )
+            else:
+                pending.append((index, body, size))
+
+        attempt = 0
+        while pending:
+            attempt += 1
+            retry = []
+            for chunk in _batch_chunks(pending):
+                entries = {f"m{index}": index for index, _, _ in chunk}
+                try:
+                    response = client.send_message_batch(
+                        QueueUrl=queue_url,
+                        Entries=[{"Id": f"m{index}", "MessageBody": body} for index, body, _ in chunk]
+                    )
+                except Exception as e:
+                    # La llamada completa falló (red, throttling...): todas sus entradas
+                    failures = [(entry, str(e), False) for entry in chunk]
+                else:
+                    for entry in response.get("Successful", []):
+                        index = entries[entry["Id"]]
+                        results[index] = BatchEntryResult(messages[index][0], entry["MessageId"], None, False, attempt)
+                    by_index = {index: (index, body, size) for index, body, size in chunk}
+                    failures = [
+                        (
+                            by_index[entries[entry["Id"]]],
+                            f"{entry.get('Code')}: {entry.get('Message')}",
+                            entry.get("SenderFault", False)
+                        )
+                        for entry in response.get("Failed", [])
+                    ]
+
+                for entry, error, sender_fault in failures:
+                    if sender_fault or attempt >= max_attempts:
+                        results[entry[0]] = BatchEntryResult(messages[entry[0]][0], None, error, sender_fault, attempt)
+                    else:
+                        retry.append(entry)
+
+            pending = retry
+            if pending:
+                time.sleep(random.uniform(0, retry_delay * 2 ** (attempt - 1)))
+        return results
+
+
+def _batch_chunks(entries):
+    """Agrupa (index, body, size) en lotes de hasta 10 entradas y 256 KB de payload."""
+    chunk, chunk_size = [], 0
+    for entry in entries:
+        if chunk and (len(chunk) == MAX_BATCH_ENTRIES or chunk_size + entry[2] > MAX_BATCH_PAYLOAD_BYTES):
+            yield chunk
+            chunk, chunk_size = [], 0
+        chunk.append(entry)
+        chunk_size += entry[2]
+    if chunk:
+        yield chunk
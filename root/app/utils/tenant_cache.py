@@ -0,0 +1,69 @@
+from collections import namedtuple
+from app.config import Config
+from app.utils.ttl_cache import TTLCache
+
+# Detached snapshot of a row of public.tenants, safe to share across requests
+CachedTenant = namedtuple('CachedTenant', ['tenant_id', 'tenant_name', 'schema_name', 'provisioning_status'])
+
+_UNKNOWN_TENANT = object()
+
+
+class TenantCache:
+    """
+    Per-container registry of tenants keyed by the X-Tenant header value.
+
+    Known tenants are kept for TENANT_CACHE_TTL seconds and unknown tenant
+    names for TENANT_CACHE_NEGATIVE_TTL seconds, so a warm container resolves
+    tenants without querying the database.
+    """
+
+    def __init__(self, ttl, negative_ttl, max_size=1024):
+        self.negative_ttl = negative_ttl
+        self._cache = TTLCache(ttl=ttl, max_size=max_size)
+
+    def resolve(self, schema_name, loader):
+        """
+        Resolves a tenant by its schema name.
+
+        Args:
+            schema_name (str): The tenant schema name (X-Tenant header).
+            loader (callable): Called with `schema_name` on a cache miss; must
+                return the Tenant model or None if it does not exist.
+
+        Returns:
+            CachedTenant: The tenant snapshot, or None if the tenant does not exist.
+        """
+        cached = self._cache.get(schema_name)
+        if cached is _UNKNOWN_TENANT:
+            return None
+        if cached is not None:
+            return cached
+
+        tenant = loader(schema_name)
+        if tenant is None:
+            self._cache.set(schema_name, _UNKNOWN_TENANT, ttl=self.negative_ttl)
+            return None
+
+        snapshot = CachedTenant(tenant.tenant_id, tenant.tenant_name, tenant.schema_name, tenant.provisioning_status)
+        # Tenants still being provisioned are looked up again until they are ready
+        if snapshot.provisioning_status == tenant.STATUS_READY:
+            self._cache.set(schema_name, snapshot)
+        return snapshot
+
+    def invalidate(self, schema_name):
+        """Drops the cached entry (positive or negative) for `schema_name`."""
+        self._cache.invalidate(schema_name)
+
+    def clear(self):
+        """Drops every cached tenant."""
+        self._cache.clear()
+
+    @property
+    def stats(self):
+        return {"hits": self._cache.hits, "misses": self._cache.misses, "size": len(self._cache)}
+
+
+tenant_cache = TenantCache(
+    ttl=Config.TENANT_CACHE_TTL,
+    negative_ttl=Config.TENANT_CACHE_NEGATIVE_TTL,
+)
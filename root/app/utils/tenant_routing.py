@@ -0,0 +1,103 @@
+import contextvars
+import re
+from contextlib import contextmanager
+from sqlalchemy import event
+from app.extensions import db
+
+DEFAULT_SCHEMA = 'public'
+
+# Key under which a pooled connection remembers the schema it is bound to
+_SCHEMA_INFO_KEY = 'tenant_schema'
+
+_VALID_SCHEMA_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_]{0,62}$')
+
+_current_schema = contextvars.ContextVar('current_schema', default=None)
+
+
+def validate_schema_name(schema_name):
+    """
+    Checks that `schema_name` is a plain PostgreSQL identifier.
+
+    Raises:
+        ValueError: If the name could not be safely used as a schema.
+    """
+    if not schema_name or not _VALID_SCHEMA_NAME.match(schema_name):
+        raise ValueError(f"Invalid schema name: {schema_name!r}")
+    return schema_name
+
+
+def current_schema():
+    """Returns the schema the current request/thread is routed to."""
+    return _current_schema.get() or DEFAULT_SCHEMA
+
+
+def init_tenant_routing(engine):
+    """
+    Binds pooled connections to the routed tenant schema at checkout time.
+
+    Each pooled connection remembers the schema its search_path points to, so
+    the SET is only issued (and committed, to survive the rollback done when
+    the connection goes back to the pool) when a connection is handed to a
+    request routed to a different schema. Connections checked out without a
+    routed tenant are reset to 'public', so a schema never leaks across requests.
+    """
+    if engine.dialect.name != 'postgresql':
+        return
+
+    preparer = engine.dialect.identifier_preparer
+
+    @event.listens_for(engine, 'checkout')
+    def _pin_connection_schema(dbapi_connection, connection_record, connection_proxy):
+        schema_name = current_schema()
+        if connection_record.info.get(_SCHEMA_INFO_KEY) == schema_name:
+            return
+
+        search_path = preparer.quote(schema_name)
+        if schema_name != DEFAULT_SCHEMA:
+            search_path = f"{search_path}, {DEFAULT_SCHEMA}"
+
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"SET search_path TO {search_path}")
+        finally:
+            cursor.close()
+        dbapi_connection.commit()
+
+        connection_record.info[_SCHEMA_INFO_KEY] = schema_name
+
+
+def route_to_schema(schema_name):
+    """
+    Routes the database work of the current request/thread to `schema_name`.
+
+    If the session already holds a connection (e.g. it was used to resolve the
+    tenant), it is released so the next statement checks out a connection
+    bound to the new schema. Call this before doing any tenant work.
+    """
+    schema_name = validate_schema_name(schema_name)
+    if _current_schema.get() == schema_name:
+        return
+
+    _current_schema.set(schema_name)
+    if db.session().in_transaction():
+        db.session.rollback()
+
+
+def reset_schema_routing():
+    """Clears the routed schema; subsequent checkouts are bound to 'public'."""
+    _current_schema.set(None)
+
+
+@contextmanager
+def tenant_schema(schema_name):
+    """
+    Context manager routing the session to `schema_name` for the enclosed
+    block (scripts, workers and jobs running outside a tenant request).
+    """
+    previous = _current_schema.get()
+    route_to_schema(schema_name)
+    try:
+        yield
+    finally:
+        db.session.remove()
+        _current_schema.set(previous)
@@ -0,0 +1,67 @@
+import threading
+import time
+
+
+class TTLCache:
+    """
+    Small in-process cache with per-entry expiration.
+
+    Entries live for the lifetime of the Lambda container (or until they
+    expire), so they are shared by every request served by a warm container.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, ttl, max_size=1024):
+        """
+        Args:
+            ttl (float): Default time to live of an entry, in seconds.
+            max_size (int): Maximum number of entries kept; the oldest entry is
+                evicted when the cache is full.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Returns the cached value for `key`, or `default` if missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key, self._MISSING)
+            if entry is self._MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Stores `value` under `key` for `ttl` seconds (defaults to the cache TTL)."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_size:
+                # Dicts keep insertion order, so the first key is the oldest one
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (value, expires_at)
+
+    def invalidate(self, key):
+        """Removes `key` from the cache if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Removes every entry from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,6 +1,7 @@
 CREATE TABLE roles (
     id SERIAL PRIMARY KEY,
     role_name VARCHAR,
+    permissions_version INTEGER NOT NULL DEFAULT 1,
     created_at TIMESTAMP,
     updated_at TIMESTAMP
 );
@@ -14,6 +15,7 @@ CREATE TABLE users (
     mail VARCHAR,
     role_id INTEGER,
     dni VARCHAR,
+    token_version INTEGER NOT NULL DEFAULT 1,
     created_at TIMESTAMP,
     updated_at TIMESTAMP,
     FOREIGN KEY (role_id) REFERENCES roles(id)
@@ -110,9 +112,71 @@ CREATE TABLE feedback (
     id_evaluation INTEGER NOT NULL,
     id_user INTEGER NOT NULL,
     feedback_text TEXT NOT NULL,
+    source_message_id VARCHAR(100),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (id_evaluation) REFERENCES evaluations(id) ON DELETE CASCADE,
     FOREIGN KEY (id_user) REFERENCES users(id) ON DELETE CASCADE
 );
 
+CREATE UNIQUE INDEX idx_feedback_source_message_id ON feedback (source_message_id);
+
+
+-- Refresh tokens (hash SHA-256), rotados dentro de una familia por login
+CREATE TABLE refresh_tokens (
+    id SERIAL PRIMARY KEY,
+    token_hash VARCHAR(64) NOT NULL UNIQUE,
+    family_id VARCHAR(36) NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    parent_id INTEGER,
+    expires_at TIMESTAMP NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    used_at TIMESTAMP,
+    revoked_at TIMESTAMP,
+    revoked_reason VARCHAR
+);
+
+CREATE INDEX idx_refresh_tokens_family_id ON refresh_tokens (family_id);
+CREATE INDEX idx_refresh_tokens_user_id ON refresh_tokens (user_id);
+
+-- Claves de idempotencia (cabecera Idempotency-Key) con la respuesta guardada
+CREATE TABLE idempotency_keys (
+    scope VARCHAR(255) NOT NULL,
+    idempotency_key VARCHAR(255) NOT NULL,
+    fingerprint VARCHAR(64) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'in_progress',
+    response_status INTEGER,
+    response_body TEXT,
+    response_content_type VARCHAR,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (scope, idempotency_key)
+);
+
+-- Outbox de mensajes SQS, escrito en la misma transacción que los datos que los originan
+CREATE TABLE outbox_messages (
+    id SERIAL PRIMARY KEY,
+    message_body TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    available_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    -- 'pending' o 'dead' (agotó los intentos; se reencola a mano)
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    last_error TEXT
+);
+
+CREATE INDEX idx_outbox_messages_status_available_at ON outbox_messages (status, available_at);
+
+-- Cache de textos generados por Bedrock (worker de feedback), por hash del prompt, modelo y parámetros
+CREATE TABLE generation_cache (
+    cache_key VARCHAR(64) PRIMARY KEY,
+    response_text TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_hit_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX idx_generation_cache_expires_at ON generation_cache (expires_at);
+CREATE INDEX idx_generation_cache_last_hit_at ON generation_cache (last_hit_at);
@@ -0,0 +1,18 @@
+-- Registro de tenants (schema public)
+CREATE TABLE IF NOT EXISTS public.tenants (
+    tenant_id SERIAL PRIMARY KEY,
+    tenant_name VARCHAR(255) NOT NULL,
+    schema_name VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP
+);
+
+-- Estado del aprovisionamiento asincrono del schema (pending/creating/ready/failed).
+-- Los tenants existentes ya tienen su schema creado, por eso el default es 'ready'.
+ALTER TABLE public.tenants ADD COLUMN IF NOT EXISTS provisioning_status VARCHAR(16) NOT NULL DEFAULT 'ready';
+ALTER TABLE public.tenants ADD COLUMN IF NOT EXISTS provisioning_error TEXT;
+ALTER TABLE public.tenants ADD COLUMN IF NOT EXISTS provisioning_updated_at TIMESTAMP;
+
+-- Version de migraciones aplicada a cada schema (ver root/db/migrations)
+ALTER TABLE public.tenants ADD COLUMN IF NOT EXISTS schema_version INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE public.tenants ADD COLUMN IF NOT EXISTS migrated_at TIMESTAMP;
+ALTER TABLE public.tenants ADD COLUMN IF NOT EXISTS migration_error TEXT;
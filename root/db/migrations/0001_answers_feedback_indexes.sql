@@ -0,0 +1,5 @@
+-- Indices para los filtros de los listados paginados de respuestas y feedback
+CREATE INDEX IF NOT EXISTS idx_answers_id_evaluation ON answers (id_evaluation);
+CREATE INDEX IF NOT EXISTS idx_answers_id_question ON answers (id_question);
+CREATE INDEX IF NOT EXISTS idx_feedback_id_evaluation ON feedback (id_evaluation);
+CREATE INDEX IF NOT EXISTS idx_questions_id_evaluation ON questions (id_evaluation);
@@ -0,0 +1,5 @@
+-- Version de los permisos de cada rol: los tokens emitidos con otra version quedan revocados
+ALTER TABLE roles ADD COLUMN IF NOT EXISTS permissions_version INTEGER NOT NULL DEFAULT 1;
+-- Version de los tokens de cada usuario: cambiar su rol o su contrasena la incrementa
+-- y revoca solo sus access tokens (no los de los demas usuarios del rol)
+ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 1;
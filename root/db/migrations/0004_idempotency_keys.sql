@@ -0,0 +1,14 @@
+-- Claves de idempotencia (cabecera Idempotency-Key) con la respuesta guardada
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    scope VARCHAR(255) NOT NULL,
+    idempotency_key VARCHAR(255) NOT NULL,
+    fingerprint VARCHAR(64) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'in_progress',
+    response_status INTEGER,
+    response_body TEXT,
+    response_content_type VARCHAR,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (scope, idempotency_key)
+);
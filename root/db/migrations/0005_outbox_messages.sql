@@ -0,0 +1,13 @@
+-- Outbox de mensajes SQS, escrito en la misma transacción que los datos que los originan
+CREATE TABLE IF NOT EXISTS outbox_messages (
+    id SERIAL PRIMARY KEY,
+    message_body TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    available_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    -- 'pending' o 'dead' (agotó los intentos; se reencola a mano)
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    last_error TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_outbox_messages_status_available_at ON outbox_messages (status, available_at);
@@ -0,0 +1,4 @@
+-- Mensaje SQS que originó el feedback: el worker lo inserta con ON CONFLICT DO NOTHING
+ALTER TABLE feedback ADD COLUMN IF NOT EXISTS source_message_id VARCHAR(100);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_feedback_source_message_id ON feedback (source_message_id);
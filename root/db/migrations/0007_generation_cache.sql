@@ -0,0 +1,13 @@
+-- Textos generados por Bedrock, por hash del prompt normalizado, modelo y parámetros.
+-- Los lee y escribe el worker de feedback; desaloja por expires_at y last_hit_at.
+CREATE TABLE IF NOT EXISTS generation_cache (
+    cache_key VARCHAR(64) PRIMARY KEY,
+    response_text TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_hit_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_generation_cache_expires_at ON generation_cache (expires_at);
+CREATE INDEX IF NOT EXISTS idx_generation_cache_last_hit_at ON generation_cache (last_hit_at);
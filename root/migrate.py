@@ -0,0 +1,48 @@
+import argparse
+import sys
+from app import create_app
+from app.extensions import db
+from app.services.tenant_migration_service import TenantMigrationService
+
+
+def run_migrations(workers=None, tenant_ids=None):
+    """
+    Applies the pending migrations to every tenant schema and prints a per-tenant report.
+
+    Returns:
+        list[dict]: The migration report of each tenant.
+    """
+    app = create_app()
+    with app.app_context():
+        reports = TenantMigrationService().migrate_all(db.engine, workers=workers, tenant_ids=tenant_ids)
+
+    for report in reports:
+        print(
+            f"tenant {report['tenant_id']:>5} {report['schema_name']:<30} "
+            f"v{report['from_version']} -> v{report['to_version']} "
+            f"{report['seconds']:>8.3f}s {report['status']}"
+            + (f" ({report['error']})" if report['error'] else "")
+        )
+
+    failed = sum(1 for report in reports if report['status'] != 'ok')
+    print(f"{len(reports)} tenant(s) processed, {failed} failed")
+    return reports
+
+
+def lambda_handler(event, context):
+    """
+    Runs the migrations from inside the VPC. Optional event keys:
+    `workers` (int) and `tenant_ids` (list[int]).
+    """
+    reports = run_migrations(workers=event.get("workers"), tenant_ids=event.get("tenant_ids"))
+    return {"reports": reports, "failed": sum(1 for report in reports if report['status'] != 'ok')}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Apply pending migrations to every tenant schema.")
+    parser.add_argument('--workers', type=int, help="Tenants migrated in parallel")
+    parser.add_argument('--tenant', type=int, action='append', dest='tenant_ids', help="Only migrate this tenant ID")
+    args = parser.parse_args()
+
+    reports = run_migrations(workers=args.workers, tenant_ids=args.tenant_ids)
+    sys.exit(1 if any(report['status'] != 'ok' for report in reports) else 0)
@@ -0,0 +1,122 @@
+import json
+import time
+from app import create_app
+from app.repositories.outbox_repository import OutboxRepository
+from app.repositories.tenants_repository import TenantRepository
+from app.services.outbox_service import OutboxService
+from app.utils.tenant_routing import DEFAULT_SCHEMA, tenant_schema
+
+app = create_app()
+
+# Tiempo que se deja sin usar al final de una invocación, para confirmar el último lote
+SAFETY_MARGIN_SECONDS = 10
+
+METRICS_NAMESPACE = "Competencias/OutboxDispatcher"
+
+
+def _schema_names():
+    with app.app_context():
+        return [DEFAULT_SCHEMA, *TenantRepository().get_ready_schema_names()]
+
+
+def dispatch_all(deadline=None):
+    """
+    Vacía el outbox de feedback del schema public y de cada tenant listo.
+
+    Returns:
+        list[dict]: Por schema, los mensajes enviados, fallidos y pasados a 'dead'
+            en esta ejecución, y los mensajes 'dead' que tiene en total.
+    """
+    outbox_service = OutboxService(OutboxRepository())
+
+    reports = []
+    for schema_name in _schema_names():
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        with app.app_context(), tenant_schema(schema_name):
+            try:
+                report = outbox_service.dispatch_pending(deadline)
+                report["dead_total"] = outbox_service.count_dead()
+            except Exception as e:
+                print(f"Outbox dispatch for schema {schema_name} failed: {e}")
+                report = {"sent": 0, "failed": 0, "dead": 0, "dead_total": 0, "error": str(e)}
+        if report["sent"] or report["failed"] or report["dead_total"] or report.get("error"):
+            print(
+                f"Outbox {schema_name}: {report['sent']} sent, {report['failed']} failed, "
+                f"{report['dead']} dead ({report['dead_total']} dead in total)"
+            )
+        reports.append({"schema_name": schema_name, **report})
+    return reports
+
+
+def replay_dead(schema_names=None):
+    """
+    Reencola los mensajes 'dead' de los schemas indicados (por defecto, de todos);
+    se envían en la siguiente ejecución del dispatcher.
+
+    Returns:
+        dict: Mensajes reencolados por schema.
+    """
+    outbox_service = OutboxService(OutboxRepository())
+
+    requeued = {}
+    for schema_name in schema_names or _schema_names():
+        with app.app_context(), tenant_schema(schema_name):
+            requeued[schema_name] = outbox_service.requeue_dead()
+    return requeued
+
+
+def emit_metrics(reports):
+    """
+    Publica los totales de la ejecución en Embedded Metric Format. OutboxDeadMessages
+    es la cantidad de mensajes 'dead' pendientes de revisión (alarma en template.yaml).
+    """
+    print(json.dumps({
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [[]],
+                "Metrics": [
+                    {"Name": "OutboxSent", "Unit": "Count"},
+                    {"Name": "OutboxFailed", "Unit": "Count"},
+                    {"Name": "OutboxDeadLettered", "Unit": "Count"},
+                    {"Name": "OutboxDeadMessages", "Unit": "Count"},
+                    {"Name": "OutboxSchemaErrors", "Unit": "Count"},
+                ],
+            }],
+        },
+        "OutboxSent": sum(report["sent"] for report in reports),
+        "OutboxFailed": sum(report["failed"] for report in reports),
+        "OutboxDeadLettered": sum(report["dead"] for report in reports),
+        "OutboxDeadMessages": sum(report["dead_total"] for report in reports),
+        "OutboxSchemaErrors": sum(1 for report in reports if report.get("error")),
+    }))
+
+
+def lambda_handler(event, context):
+    """
+    Dispatcher programado de las tablas outbox_messages (ver template.yaml).
+    Se detiene antes de que venza la invocación; lo que queda se envía en la
+    siguiente ejecución.
+
+    Invocado a mano con {"replay_dead": true} (y opcionalmente "schemas": [...])
+    reencola los mensajes 'dead' en vez de enviar.
+    """
+    if (event or {}).get("replay_dead"):
+        requeued = replay_dead(event.get("schemas"))
+        return {"requeued": sum(requeued.values()), "schemas": requeued}
+
+    deadline = None
+    if context is not None:
+        remaining_seconds = context.get_remaining_time_in_millis() / 1000
+        deadline = time.monotonic() + remaining_seconds - SAFETY_MARGIN_SECONDS
+
+    reports = dispatch_all(deadline)
+    emit_metrics(reports)
+    return {
+        "sent": sum(report["sent"] for report in reports),
+        "failed": sum(report["failed"] for report in reports),
+        "dead": sum(report["dead_total"] for report in reports),
+        "schemas": len(reports),
+    }
@@ -0,0 +1,30 @@
+import json
+from app import create_app
+from app.repositories.tenants_repository import TenantRepository
+from app.services.tenant_migration_service import TenantMigrationService
+from app.services.tenant_schema_service import TenantSchemaService
+from app.services.tenants_service import TenantService
+from app.services.usage_log_service import UsageLogService
+
+app = create_app()
+
+def lambda_handler(event, context):
+    """
+    Consumes tenant provisioning jobs queued by POST /tenants.
+
+    Each message carries a `tenant_id`. A failed job is recorded on the tenant
+    and reported back so SQS redelivers only that message.
+    """
+    tenant_service = TenantService(TenantRepository(), UsageLogService(), TenantSchemaService(TenantMigrationService()))
+    failures = []
+
+    for record in event["Records"]:
+        tenant_id = json.loads(record["body"])["tenant_id"]
+        with app.app_context():
+            try:
+                tenant_service.provision_tenant(tenant_id)
+            except Exception as e:
+                print(f"Provisioning job for tenant {tenant_id} failed: {e}")
+                failures.append({"itemIdentifier": record["messageId"]})
+
+    return {"batchItemFailures": failures}
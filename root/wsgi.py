@@ -1,7 +1,10 @@
 from app import create_app
-from awsgi import response
+from app.utils.aws_clients import aws_clients
+from app.utils.lambda_adapter import handle_request
 
 app = create_app()
+# Optional: create the AWS clients listed in AWS_PREWARM_CLIENTS during init
+aws_clients.prewarm()
 
 def lambda_handler(event, context):
-    return response(app, event, context)
\ No newline at end of file
+    return handle_request(app, event, context)
@@ -0,0 +1,13 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT_DIR = os.path.join(REPO_DIR, 'root')
+
+# The Lambda code runs from root/ with its vendored dependencies; the feedback
+# worker is deployed on its own, with its modules at the top level
+sys.path[:0] = [
+    ROOT_DIR,
+    os.path.join(ROOT_DIR, 'python', 'lib', 'python3.11', 'site-packages'),
+    os.path.join(REPO_DIR, 'workers', 'bedrock-feedback'),
+]
@@ -0,0 +1,57 @@
+import threading
+import adaptive_concurrency
+from adaptive_concurrency import AdaptiveConcurrency
+
+
+def test_initial_limit_is_clamped():
+    assert AdaptiveConcurrency(initial=20, maximum=8).limit == 8
+    assert AdaptiveConcurrency(initial=0, maximum=8, minimum=2).limit == 2
+
+
+def test_successes_raise_the_limit_about_one_per_round():
+    concurrency = AdaptiveConcurrency(initial=4, maximum=8)
+
+    for _ in range(4):
+        concurrency.on_success()
+    assert concurrency.limit == 4
+    concurrency.on_success()
+    assert concurrency.limit == 5
+
+    for _ in range(100):
+        concurrency.on_success()
+    assert concurrency.limit == 8
+
+
+def test_throttles_halve_the_limit_once_per_cooldown(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(adaptive_concurrency.time, 'monotonic', lambda: now[0])
+    concurrency = AdaptiveConcurrency(initial=8, maximum=8, cooldown=1.0)
+
+    concurrency.on_throttle()
+    concurrency.on_throttle()
+    assert concurrency.limit == 4
+
+    now[0] += 1.0
+    concurrency.on_throttle()
+    now[0] += 1.0
+    concurrency.on_throttle()
+    concurrency.on_throttle()
+    assert concurrency.limit == 1
+    assert concurrency.throttles == 5
+
+
+def test_slot_waits_for_a_free_place():
+    concurrency = AdaptiveConcurrency(initial=1, maximum=1)
+    entered = threading.Event()
+
+    def enter():
+        with concurrency.slot():
+            entered.set()
+
+    with concurrency.slot():
+        waiting = threading.Thread(target=enter)
+        waiting.start()
+        assert not entered.wait(0.1)
+
+    assert entered.wait(1)
+    waiting.join()
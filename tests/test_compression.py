@@ -0,0 +1,75 @@
+import gzip
+from flask import Flask, jsonify
+from werkzeug.http import parse_accept_header
+from app.config import Config
+from app.utils import compression
+from app.utils.compression import choose_encoding, compress_response, no_compression
+
+LARGE_PAYLOAD = {"items": ["x" * 40] * 100}
+
+
+def make_app():
+    app = Flask(__name__)
+    app.after_request(compress_response)
+
+    @app.route('/large')
+    def large():
+        return jsonify(LARGE_PAYLOAD)
+
+    @app.route('/small')
+    def small():
+        return jsonify({"ok": True})
+
+    @app.route('/excluded')
+    @no_compression
+    def excluded():
+        return jsonify(LARGE_PAYLOAD)
+
+    return app
+
+
+def test_choose_encoding_follows_the_client_preference(monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', None)
+
+    assert choose_encoding(parse_accept_header('gzip, deflate')) == 'gzip'
+    assert choose_encoding(parse_accept_header('br')) is None
+    assert choose_encoding(parse_accept_header('gzip;q=0')) is None
+    assert choose_encoding(parse_accept_header('')) is None
+
+
+def test_choose_encoding_prefers_brotli_when_available(monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', object())
+
+    assert choose_encoding(parse_accept_header('gzip, br')) == 'br'
+    assert choose_encoding(parse_accept_header('gzip, br;q=0.5')) == 'gzip'
+
+
+def test_large_json_responses_are_gzipped(monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', None)
+    client = make_app().test_client()
+
+    response = client.get('/large', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert gzip.decompress(response.get_data()) == client.get('/large').get_data()
+
+
+def test_small_and_excluded_responses_are_sent_as_is(monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', None)
+    client = make_app().test_client()
+
+    small = client.get('/small', headers={'Accept-Encoding': 'gzip'})
+    excluded = client.get('/excluded', headers={'Accept-Encoding': 'gzip'})
+
+    assert len(small.get_data()) < Config.COMPRESSION_MIN_SIZE
+    assert 'Content-Encoding' not in small.headers
+    assert 'Content-Encoding' not in excluded.headers
+    assert excluded.get_json() == LARGE_PAYLOAD
+
+
+def test_responses_without_accept_encoding_are_not_compressed():
+    response = make_app().test_client().get('/large')
+
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_json() == LARGE_PAYLOAD
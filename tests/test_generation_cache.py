@@ -0,0 +1,97 @@
+import generation_cache
+from generation_cache import GenerationCache, cache_key, normalize_prompt
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(monkeypatch, max_entries=10, ttl_seconds=60, persist=False):
+    clock = FakeClock()
+    monkeypatch.setattr(generation_cache.time, "time", clock)
+    return GenerationCache(max_entries, ttl_seconds, persist=persist), clock
+
+
+def test_normalize_prompt_ignores_whitespace_and_line_endings():
+    assert normalize_prompt("  Hola \t  mundo \r\n  fin  ") == "Hola mundo\nfin"
+    assert normalize_prompt("Cafe\u0301") == "Caf\u00e9"
+
+
+def test_cache_key_depends_on_prompt_model_and_params():
+    key = cache_key("Hola  mundo", "model-a", {"temperature": 0.7})
+    assert key == cache_key("Hola mundo ", "model-a", {"temperature": 0.7})
+    assert key != cache_key("Hola mundo!", "model-a", {"temperature": 0.7})
+    assert key != cache_key("Hola mundo", "model-b", {"temperature": 0.7})
+    assert key != cache_key("Hola mundo", "model-a", {"temperature": 0.5})
+    assert len(key) == 64
+
+
+def test_get_counts_hits_and_misses(monkeypatch):
+    cache, _ = make_cache(monkeypatch)
+
+    assert cache.get("t1", "k") is None
+    cache.put("t1", "k", "texto")
+
+    assert cache.get("t1", "k") == "texto"
+    assert cache.get("t2", "k") is None
+    assert cache.stats == {"memory_hits": 1, "database_hits": 0, "misses": 2, "size": 1}
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache, clock = make_cache(monkeypatch, ttl_seconds=60)
+    cache.put("t1", "k", "texto")
+
+    clock.now += 61
+
+    assert cache.get("t1", "k") is None
+    assert cache.stats["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    cache, _ = make_cache(monkeypatch, max_entries=2)
+    cache.put("t1", "a", "A")
+    cache.put("t1", "b", "B")
+    cache.get("t1", "a")
+
+    cache.put("t1", "c", "C")
+
+    assert cache.get("t1", "b") is None
+    assert cache.get("t1", "a") == "A"
+    assert cache.get("t1", "c") == "C"
+
+
+def test_preloaded_entries_count_one_database_hit(monkeypatch):
+    cache, clock = make_cache(monkeypatch)
+    cache.preload("t1", {"k": ("texto", clock.now + 30), "old": ("viejo", clock.now - 1)})
+
+    assert cache.get("t1", "k") == "texto"
+    assert cache.get("t1", "k") == "texto"
+    assert cache.get("t1", "old") is None
+    assert cache.stats["database_hits"] == 1
+    assert cache.stats["memory_hits"] == 1
+
+
+def test_preload_does_not_overwrite_memory_entries(monkeypatch):
+    cache, clock = make_cache(monkeypatch)
+    cache.put("t1", "k", "nuevo")
+
+    cache.preload("t1", {"k": ("viejo", clock.now + 30)})
+
+    assert cache.get("t1", "k") == "nuevo"
+
+
+def test_pending_entries_only_with_persist(monkeypatch):
+    cache, _ = make_cache(monkeypatch)
+    cache.put("t1", "k", "texto")
+    assert cache.pending_entries() == {}
+
+    cache, _ = make_cache(monkeypatch, persist=True)
+    cache.put("t1", "a", "A")
+    cache.put("t2", "b", "B")
+
+    assert cache.pending_entries() == {"t1": {"a": "A"}, "t2": {"b": "B"}}
+    assert cache.pending_entries() == {}
@@ -0,0 +1,112 @@
+import gzip
+import json
+from base64 import b64decode, b64encode
+from flask import Flask, jsonify, request
+from app.utils.lambda_adapter import handle_request
+
+
+def make_app():
+    app = Flask(__name__)
+
+    @app.route('/echo/<name>', methods=['GET', 'POST'])
+    def echo(name):
+        return jsonify({
+            "name": name,
+            "args": request.args.to_dict(flat=False),
+            "body": request.get_data(as_text=True),
+            "tenant": request.headers.get('X-Tenant'),
+            "cookie": request.headers.get('Cookie'),
+        })
+
+    @app.route('/gzip')
+    def compressed():
+        response = app.response_class(gzip.compress(b'{"ok": true}'), mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
+
+    @app.route('/cookies')
+    def cookies():
+        response = jsonify({})
+        response.set_cookie('a', '1')
+        response.set_cookie('b', '2')
+        return response
+
+    return app
+
+
+def v1_event(method, path, **kwargs):
+    event = {'httpMethod': method, 'path': path, 'headers': {}, 'requestContext': {}}
+    event.update(kwargs)
+    return event
+
+
+def v2_event(method, raw_path, **kwargs):
+    event = {
+        'version': '2.0',
+        'rawPath': raw_path,
+        'rawQueryString': '',
+        'headers': {},
+        'requestContext': {'http': {'method': method, 'sourceIp': '10.0.0.1'}},
+    }
+    event.update(kwargs)
+    return event
+
+
+def test_v1_event_with_multi_value_query_and_headers():
+    event = v1_event(
+        'POST', '/echo/café',
+        multiValueQueryStringParameters={'tag': ['a', 'b']},
+        multiValueHeaders={'X-Tenant': ['tenant_a'], 'Content-Type': ['text/plain']},
+        body='hello',
+    )
+
+    response = handle_request(make_app(), event, None)
+
+    assert response['statusCode'] == 200
+    assert response['isBase64Encoded'] is False
+    assert response['multiValueHeaders']['Content-Type'] == ['application/json']
+    assert json.loads(response['body']) == {
+        "name": "café", "args": {"tag": ["a", "b"]}, "body": "hello", "tenant": "tenant_a", "cookie": None,
+    }
+
+
+def test_v1_event_with_base64_body():
+    event = v1_event('POST', '/echo/x', headers={'Content-Type': 'text/plain'},
+                     body=b64encode('ñandú'.encode('utf-8')).decode('ascii'), isBase64Encoded=True)
+
+    response = handle_request(make_app(), event, None)
+
+    assert json.loads(response['body'])['body'] == 'ñandú'
+
+
+def test_v2_event_with_query_string_and_cookies():
+    event = v2_event('GET', '/echo/caf%C3%A9', rawQueryString='tag=a&tag=b',
+                     headers={'x-tenant': 'tenant_b'}, cookies=['a=1', 'b=2'])
+
+    response = handle_request(make_app(), event, None)
+
+    assert response['statusCode'] == 200
+    assert json.loads(response['body']) == {
+        "name": "café", "args": {"tag": ["a", "b"]}, "body": "", "tenant": "tenant_b", "cookie": "a=1; b=2",
+    }
+
+
+def test_v2_response_moves_set_cookie_headers_to_cookies():
+    response = handle_request(make_app(), v2_event('GET', '/cookies'), None)
+
+    assert [cookie.split(';')[0] for cookie in response['cookies']] == ['a=1', 'b=2']
+    assert 'Set-Cookie' not in response['headers']
+
+
+def test_encoded_responses_are_returned_as_base64():
+    response = handle_request(make_app(), v1_event('GET', '/gzip'), None)
+
+    assert response['isBase64Encoded'] is True
+    assert gzip.decompress(b64decode(response['body'])) == b'{"ok": true}'
+
+
+def test_unknown_route_keeps_the_status():
+    response = handle_request(make_app(), v2_event('GET', '/missing'), None)
+
+    assert response['statusCode'] == 404
+    assert response['isBase64Encoded'] is False
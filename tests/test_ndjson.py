@@ -0,0 +1,54 @@
+import io
+import pytest
+from werkzeug.exceptions import RequestEntityTooLarge
+from app.utils.ndjson import iter_lines
+
+
+def test_iter_lines_yields_every_line():
+    body = b'{"a": 1}\n{"a": 2}\r\n{"a": 3}'
+
+    assert list(iter_lines(io.BytesIO(body), max_line_bytes=100)) == [
+        b'{"a": 1}\n', b'{"a": 2}\r\n', b'{"a": 3}'
+    ]
+
+
+def test_oversized_lines_keep_only_their_beginning():
+    body = b'x' * 250 + b'\n{"a": 1}\n'
+
+    lines = list(iter_lines(io.BytesIO(body), max_line_bytes=100))
+
+    assert lines == [b'x' * 101, b'{"a": 1}\n']
+
+
+def test_max_bytes_allows_a_body_at_the_limit():
+    body = b'{"a": 1}\n' * 10
+
+    assert len(list(iter_lines(io.BytesIO(body), max_line_bytes=100, max_bytes=len(body)))) == 10
+
+
+def test_max_bytes_stops_the_read_once_exceeded():
+    body = b'{"a": 1}\n' * 10
+    lines = iter_lines(io.BytesIO(body), max_line_bytes=100, max_bytes=len(body) - 1)
+
+    assert len([next(lines) for _ in range(9)]) == 9
+    with pytest.raises(RequestEntityTooLarge):
+        next(lines)
+
+
+class CountingStream(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.read_bytes = 0
+
+    def readinto(self, buffer):
+        read = super().readinto(buffer)
+        self.read_bytes += read
+        return read
+
+
+def test_max_bytes_counts_the_discarded_part_of_oversized_lines():
+    stream = CountingStream(b'x' * 10 * 1024 * 1024)
+
+    with pytest.raises(RequestEntityTooLarge):
+        list(iter_lines(stream, max_line_bytes=100, max_bytes=1000))
+    assert stream.read_bytes < 1024 * 1024
@@ -0,0 +1,65 @@
+from app.utils.permission_cache import CachedPermissions, PermissionCache
+
+
+class Loader:
+    def __init__(self, permissions):
+        self.permissions = permissions
+        self.calls = []
+
+    def __call__(self, user_id):
+        self.calls.append(user_id)
+        return self.permissions.get(user_id)
+
+
+def test_resolve_loads_each_user_once():
+    loader = Loader({1: CachedPermissions(10, frozenset({'answers:read'}))})
+    cache = PermissionCache(ttl=60)
+
+    assert cache.resolve('tenant_a', 1, loader).names == {'answers:read'}
+    assert cache.resolve('tenant_a', 1, loader).role_id == 10
+    assert loader.calls == [1]
+
+
+def test_entries_are_scoped_by_tenant():
+    loader = Loader({1: CachedPermissions(10, frozenset())})
+    cache = PermissionCache(ttl=60)
+
+    cache.resolve('tenant_a', 1, loader)
+    cache.resolve('tenant_b', 1, loader)
+
+    assert loader.calls == [1, 1]
+
+
+def test_missing_users_are_not_cached():
+    loader = Loader({})
+    cache = PermissionCache(ttl=60)
+
+    assert cache.resolve('tenant_a', 1, loader) is None
+    assert cache.resolve('tenant_a', 1, loader) is None
+    assert loader.calls == [1, 1]
+
+
+def test_invalidate_user_drops_only_that_user():
+    loader = Loader({1: CachedPermissions(10, frozenset()), 2: CachedPermissions(10, frozenset())})
+    cache = PermissionCache(ttl=60)
+    cache.resolve('tenant_a', 1, loader)
+    cache.resolve('tenant_a', 2, loader)
+
+    cache.invalidate_user('tenant_a', 1)
+    cache.resolve('tenant_a', 1, loader)
+    cache.resolve('tenant_a', 2, loader)
+
+    assert loader.calls == [1, 2, 1]
+
+
+def test_invalidate_tenant_drops_every_user_of_the_tenant():
+    loader = Loader({1: CachedPermissions(10, frozenset())})
+    cache = PermissionCache(ttl=60)
+    cache.resolve('tenant_a', 1, loader)
+    cache.resolve('tenant_b', 1, loader)
+
+    cache.invalidate_tenant('tenant_a')
+    cache.resolve('tenant_a', 1, loader)
+    cache.resolve('tenant_b', 1, loader)
+
+    assert loader.calls == [1, 1, 1]
@@ -0,0 +1,70 @@
+import pytest
+from app.utils.prompt_builder import (
+    PROMPT_TEMPLATE_VERSION, TRUNCATION_MARKER, PromptBuilder, PromptEntry,
+    allocate_budget, estimate_tokens, truncate_to_tokens,
+)
+
+
+def make_entries(count, description_words=5, question="Pregunta"):
+    return [
+        PromptEntry(" ".join(["palabra"] * description_words), index, f"{question} {index}")
+        for index in range(count)
+    ]
+
+
+def test_truncate_to_tokens_keeps_short_text():
+    assert truncate_to_tokens("hola mundo", 10) == "hola mundo"
+
+
+def test_truncate_to_tokens_cuts_at_a_word_boundary():
+    text = " ".join(["palabra"] * 20)
+
+    truncated = truncate_to_tokens(text, 20)
+
+    assert truncated.endswith(TRUNCATION_MARKER)
+    assert estimate_tokens(truncated) <= 20
+    assert truncated[:-len(TRUNCATION_MARKER)].split(" ")[-1] == "palabra"
+
+
+def test_allocate_budget_fills_short_needs_first():
+    assert allocate_budget([5, 10], 100) == [5, 10]
+    assert allocate_budget([2, 10, 10], 12) == [2, 5, 5]
+    assert sum(allocate_budget([7, 8, 9], 10)) == 10
+
+
+def test_builder_rejects_a_budget_smaller_than_the_template():
+    with pytest.raises(ValueError):
+        PromptBuilder(max_tokens=5, max_answer_tokens=10)
+
+
+def test_build_includes_every_answer_when_it_fits():
+    built = PromptBuilder(max_tokens=1000, max_answer_tokens=50).build(make_entries(3))
+
+    assert built.version == PROMPT_TEMPLATE_VERSION
+    assert (built.truncated, built.omitted) == (0, 0)
+    assert built.text.count("Descripción:") == 3
+    assert built.estimated_tokens == estimate_tokens(built.text)
+
+
+def test_build_truncates_long_descriptions_to_max_answer_tokens():
+    built = PromptBuilder(max_tokens=1000, max_answer_tokens=10).build(make_entries(2, description_words=50))
+
+    assert built.truncated == 2
+    assert built.omitted == 0
+    assert built.text.count(TRUNCATION_MARKER) == 2
+
+
+def test_build_omits_answers_over_the_budget():
+    built = PromptBuilder(max_tokens=200, max_answer_tokens=50).build(make_entries(50, description_words=20))
+
+    assert built.omitted > 0
+    assert built.estimated_tokens <= 200
+    assert f"({built.omitted} more responses omitted)" in built.text
+    assert built.text.count("Descripción:") == 50 - built.omitted
+
+
+def test_build_is_deterministic():
+    builder = PromptBuilder(max_tokens=300, max_answer_tokens=30)
+    entries = make_entries(20, description_words=15)
+
+    assert builder.build(entries) == builder.build(entries)
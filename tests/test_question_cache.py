@@ -0,0 +1,26 @@
+from app.utils.question_cache import QuestionMapCache
+
+
+def test_question_maps_are_scoped_by_tenant_and_evaluation():
+    cache = QuestionMapCache(ttl=60)
+    cache.set('tenant_a', 1, {10: 'Pregunta 1'})
+
+    assert cache.get('tenant_a', 1) == {10: 'Pregunta 1'}
+    assert cache.get('tenant_a', 2) is None
+    assert cache.get('tenant_b', 1) is None
+    assert cache.stats == {"hits": 1, "misses": 2, "size": 1}
+
+
+def test_invalidate_drops_the_given_evaluations():
+    cache = QuestionMapCache(ttl=60)
+    cache.set('tenant_a', 1, {10: 'Pregunta 1'})
+    cache.set('tenant_a', 2, {20: 'Pregunta 2'})
+    cache.set('tenant_a', 3, {30: 'Pregunta 3'})
+    cache.set('tenant_b', 1, {10: 'Otra pregunta'})
+
+    cache.invalidate('tenant_a', 1, 2)
+
+    assert cache.get('tenant_a', 1) is None
+    assert cache.get('tenant_a', 2) is None
+    assert cache.get('tenant_a', 3) == {30: 'Pregunta 3'}
+    assert cache.get('tenant_b', 1) == {10: 'Otra pregunta'}
@@ -0,0 +1,104 @@
+import json
+from app.utils import sqs_utils
+from app.utils.sqs_utils import MAX_BATCH_PAYLOAD_BYTES, SQSUtils
+
+
+class FakeSQS:
+    """send_message_batch que falla las entradas o las llamadas indicadas."""
+
+    def __init__(self, failures=None, errors=0):
+        self.failures = failures or {}
+        self.errors = errors
+        self.calls = []
+
+    def send_message_batch(self, QueueUrl, Entries):
+        self.calls.append([json.loads(entry["MessageBody"]) for entry in Entries])
+        if self.errors:
+            self.errors -= 1
+            raise ConnectionError("connection reset")
+        successful, failed = [], []
+        for entry in Entries:
+            body = json.loads(entry["MessageBody"])
+            failure = self.failures.get(body.get("n"))
+            if failure and failure["times"]:
+                failure["times"] -= 1
+                failed.append({"Id": entry["Id"], "Code": failure["code"], "Message": "failed",
+                               "SenderFault": failure["sender_fault"]})
+            else:
+                successful.append({"Id": entry["Id"], "MessageId": f"sqs-{body.get('n')}"})
+        return {"Successful": successful, "Failed": failed}
+
+
+def use_client(monkeypatch, client):
+    monkeypatch.setattr(sqs_utils.aws_clients, 'client', lambda service_name: client)
+    monkeypatch.setattr(sqs_utils.time, 'sleep', lambda seconds: None)
+
+
+def test_messages_are_packed_in_batches_of_ten(monkeypatch):
+    client = FakeSQS()
+    use_client(monkeypatch, client)
+
+    results = SQSUtils.send_message_batch([(n, {"n": n}) for n in range(25)], queue_url='queue')
+
+    assert [len(call) for call in client.calls] == [10, 10, 5]
+    assert [result.id for result in results] == list(range(25))
+    assert all(result.success and result.attempts == 1 for result in results)
+    assert results[3].message_id == 'sqs-3'
+
+
+def test_batches_are_limited_by_payload_size(monkeypatch):
+    client = FakeSQS()
+    use_client(monkeypatch, client)
+    text = "x" * (MAX_BATCH_PAYLOAD_BYTES // 3)
+
+    SQSUtils.send_message_batch([(n, {"n": n, "text": text}) for n in range(5)], queue_url='queue')
+
+    assert [len(call) for call in client.calls] == [2, 2, 1]
+
+
+def test_oversized_messages_are_rejected_without_calling_sqs(monkeypatch):
+    client = FakeSQS()
+    use_client(monkeypatch, client)
+
+    results = SQSUtils.send_message_batch(
+        [(1, {"n": 1, "text": "x" * MAX_BATCH_PAYLOAD_BYTES}), (2, {"n": 2})], queue_url='queue'
+    )
+
+    assert client.calls == [[{"n": 2}]]
+    assert results[0].error.startswith("MessageTooLong")
+    assert results[0].sender_fault and results[0].attempts == 0
+    assert results[1].success
+
+
+def test_only_failed_entries_are_retried(monkeypatch):
+    client = FakeSQS(failures={2: {"times": 1, "code": "InternalError", "sender_fault": False}})
+    use_client(monkeypatch, client)
+
+    results = SQSUtils.send_message_batch([(n, {"n": n}) for n in range(3)], queue_url='queue')
+
+    assert client.calls[1] == [{"n": 2}]
+    assert all(result.success for result in results)
+    assert [result.attempts for result in results] == [1, 1, 2]
+
+
+def test_sender_faults_are_not_retried(monkeypatch):
+    client = FakeSQS(failures={1: {"times": 5, "code": "InvalidMessageContents", "sender_fault": True}})
+    use_client(monkeypatch, client)
+
+    results = SQSUtils.send_message_batch([(n, {"n": n}) for n in range(2)], queue_url='queue')
+
+    assert len(client.calls) == 1
+    assert results[0].success
+    assert results[1].error == "InvalidMessageContents: failed"
+    assert results[1].sender_fault
+
+
+def test_failed_calls_are_retried_up_to_max_attempts(monkeypatch):
+    client = FakeSQS(errors=5)
+    use_client(monkeypatch, client)
+
+    results = SQSUtils.send_message_batch([(1, {"n": 1})], queue_url='queue', max_attempts=3)
+
+    assert len(client.calls) == 3
+    assert results[0].error == "connection reset"
+    assert not results[0].sender_fault and results[0].attempts == 3
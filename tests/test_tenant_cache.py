@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+from app.utils.tenant_cache import CachedTenant, TenantCache
+
+
+class Loader:
+    def __init__(self, tenants):
+        self.tenants = tenants
+        self.calls = []
+
+    def __call__(self, schema_name):
+        self.calls.append(schema_name)
+        return self.tenants.get(schema_name)
+
+
+def make_tenant(schema_name, provisioning_status='ready'):
+    return SimpleNamespace(
+        tenant_id=1, tenant_name='Tenant', schema_name=schema_name,
+        provisioning_status=provisioning_status, STATUS_READY='ready'
+    )
+
+
+def test_resolve_loads_a_tenant_once():
+    loader = Loader({'tenant_a': make_tenant('tenant_a')})
+    cache = TenantCache(ttl=60, negative_ttl=5)
+
+    first = cache.resolve('tenant_a', loader)
+    second = cache.resolve('tenant_a', loader)
+
+    assert first == CachedTenant(1, 'Tenant', 'tenant_a', 'ready')
+    assert second is first
+    assert loader.calls == ['tenant_a']
+    assert cache.stats == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_unknown_tenants_are_cached_as_missing():
+    loader = Loader({})
+    cache = TenantCache(ttl=60, negative_ttl=5)
+
+    assert cache.resolve('missing', loader) is None
+    assert cache.resolve('missing', loader) is None
+    assert loader.calls == ['missing']
+
+
+def test_invalidate_reloads_the_tenant():
+    loader = Loader({})
+    cache = TenantCache(ttl=60, negative_ttl=5)
+    cache.resolve('tenant_a', loader)
+
+    loader.tenants['tenant_a'] = make_tenant('tenant_a')
+    cache.invalidate('tenant_a')
+
+    assert cache.resolve('tenant_a', loader).schema_name == 'tenant_a'
+    assert loader.calls == ['tenant_a', 'tenant_a']
+
+
+def test_tenants_not_ready_are_not_cached():
+    loader = Loader({'tenant_a': make_tenant('tenant_a', provisioning_status='creating')})
+    cache = TenantCache(ttl=60, negative_ttl=5)
+
+    assert cache.resolve('tenant_a', loader).provisioning_status == 'creating'
+    loader.tenants['tenant_a'] = make_tenant('tenant_a')
+
+    assert cache.resolve('tenant_a', loader).provisioning_status == 'ready'
+    assert loader.calls == ['tenant_a', 'tenant_a']
@@ -0,0 +1,61 @@
+from app.utils import ttl_cache
+from app.utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_returns_cached_value_until_it_expires(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ttl_cache.time, 'monotonic', clock)
+    cache = TTLCache(ttl=10)
+
+    cache.set('key', 'value')
+    clock.now += 9
+    assert cache.get('key') == 'value'
+
+    clock.now += 1
+    assert cache.get('key', 'default') == 'default'
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_set_uses_the_entry_ttl_over_the_default(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ttl_cache.time, 'monotonic', clock)
+    cache = TTLCache(ttl=10)
+
+    cache.set('key', 'value', ttl=2)
+    clock.now += 2
+    assert cache.get('key') is None
+
+
+def test_full_cache_evicts_the_oldest_entry():
+    cache = TTLCache(ttl=60, max_size=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.set('a', 10)
+    cache.set('c', 3)
+
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+    assert cache.get('c') == 3
+
+
+def test_invalidate_and_clear():
+    cache = TTLCache(ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+
+    cache.invalidate('a')
+    cache.invalidate('missing')
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+
+    cache.clear()
+    assert len(cache) == 0
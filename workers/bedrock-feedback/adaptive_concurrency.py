@@ -0,0 +1,55 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class AdaptiveConcurrency:
+    """
+    Límite de llamadas simultáneas a Bedrock con control AIMD.
+
+    Cada llamada correcta sube el límite en 1/límite (alrededor de +1 por
+    cada ronda de llamadas); cada ThrottlingException lo reduce a la mitad,
+    como máximo una vez por `cooldown` segundos para que los throttles de
+    las llamadas que ya estaban en vuelo no lo hundan de golpe.
+    """
+
+    def __init__(self, initial, maximum, minimum=1, cooldown=1.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown = cooldown
+        self._limit = float(max(minimum, min(initial, maximum)))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        self.throttles = 0
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    @contextmanager
+    def slot(self):
+        """Espera a que haya un lugar libre dentro del límite actual."""
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self):
+        with self._condition:
+            self._limit = min(self.maximum, self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+    def on_throttle(self):
+        with self._condition:
+            self.throttles += 1
+            now = time.monotonic()
+            if now - self._last_decrease >= self.cooldown:
+                self._limit = max(self.minimum, self._limit / 2)
+                self._last_decrease = now
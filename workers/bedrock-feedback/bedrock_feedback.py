@@ -1,41 +1,324 @@
 import os
 import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import boto3
 import requests
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from adaptive_concurrency import AdaptiveConcurrency
+from generation_cache import GenerationCache, cache_key
+
+# Llamadas simultáneas a Bedrock: empieza en FEEDBACK_INITIAL_CONCURRENCY y se
+# ajusta (AIMD) entre 1 y FEEDBACK_MAX_CONCURRENCY según los throttles
+MAX_CONCURRENCY = int(os.getenv("FEEDBACK_MAX_CONCURRENCY", 8))
+INITIAL_CONCURRENCY = int(os.getenv("FEEDBACK_INITIAL_CONCURRENCY", 4))
+# Reintentos de un mensaje dentro de la invocación cuando Bedrock lo rechaza por throttling
+THROTTLE_RETRIES = int(os.getenv("FEEDBACK_THROTTLE_RETRIES", 3))
+BEDROCK_READ_TIMEOUT = 60
+# No se empiezan mensajes si queda menos que esto de la invocación: se reintentan en otra
+DEADLINE_MARGIN_SECONDS = BEDROCK_READ_TIMEOUT + 15
+
+METRICS_NAMESPACE = "Competencias/FeedbackWorker"
+
+# Destino del feedback generado: 'database' lo inserta directamente en el schema
+# del tenant (feedback_persistence); 'http' lo envía al API (POST API_URL)
+FEEDBACK_SINK = os.getenv("FEEDBACK_SINK", "http")
+
+MODEL_ID = "ai21.jamba-1-5-mini-v1:0"
+GENERATION_PARAMS = {"max_tokens": 200, "temperature": 0.7, "top_p": 0.9}
+
+# Cache de textos generados, consultada antes de llamar a Bedrock: 'memory' (por
+# contenedor), 'database' (además, tabla generation_cache del tenant) u 'off'
+GENERATION_CACHE = os.getenv("GENERATION_CACHE", "memory")
+GENERATION_CACHE_TTL_SECONDS = int(os.getenv("GENERATION_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+GENERATION_CACHE_MEMORY_ENTRIES = int(os.getenv("GENERATION_CACHE_MEMORY_ENTRIES", 1000))
+# Entradas por tenant en la tabla; se desalojan las usadas hace más tiempo
+GENERATION_CACHE_DB_ENTRIES = int(os.getenv("GENERATION_CACHE_DB_ENTRIES", 10000))
+
+# Clientes de Bedrock reutilizados entre invocaciones del mismo contenedor
+_bedrock_clients = {}
+_bedrock_clients_lock = threading.Lock()
+
+# Conexiones HTTP al API reutilizadas entre mensajes e invocaciones
+_http_session = requests.Session()
+_http_session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=MAX_CONCURRENCY))
+
+# El límite aprendido se conserva entre invocaciones del mismo contenedor
+_concurrency = AdaptiveConcurrency(initial=INITIAL_CONCURRENCY, maximum=MAX_CONCURRENCY)
+
+_generation_cache = GenerationCache(
+    max_entries=GENERATION_CACHE_MEMORY_ENTRIES,
+    ttl_seconds=GENERATION_CACHE_TTL_SECONDS,
+    persist=GENERATION_CACHE == "database",
+)
+
+
+class BedrockThrottlingError(Exception):
+    """Bedrock rechazó la llamada por exceso de solicitudes (ThrottlingException)."""
+
+
+def get_bedrock_client(region_name):
+    """
+    Devuelve el cliente de Bedrock de la región, creándolo una sola vez por contenedor.
+    """
+    client = _bedrock_clients.get(region_name)
+    if client is None:
+        with _bedrock_clients_lock:
+            client = _bedrock_clients.get(region_name)
+            if client is None:
+                client = boto3.client(
+                    "bedrock-runtime",
+                    region_name=region_name,
+                    config=Config(
+                        retries={"max_attempts": int(os.getenv("AWS_MAX_ATTEMPTS", 3)), "mode": "standard"},
+                        connect_timeout=2,
+                        read_timeout=BEDROCK_READ_TIMEOUT,
+                        max_pool_connections=MAX_CONCURRENCY,
+                    ),
+                )
+                _bedrock_clients[region_name] = client
+    return client
 
 def lambda_handler(event, context):
+    """
+    Procesa los mensajes de feedback de SQS en paralelo, con a lo sumo
+    FEEDBACK_MAX_CONCURRENCY a la vez y las llamadas a Bedrock limitadas por
+    un control de concurrencia adaptativo. Con FEEDBACK_SINK=database el feedback
+    de todo el lote se inserta al final, en un INSERT por tenant.
+
+    Los mensajes que fallan se devuelven en `batchItemFailures`
+    (ReportBatchItemFailures): SQS solo vuelve a entregar esos, sin regenerar
+    el feedback de los que ya se guardaron.
+    """
+    if FEEDBACK_SINK not in ("database", "http"):
+        raise Exception(f"Invalid FEEDBACK_SINK: {FEEDBACK_SINK}")
     api_url = os.getenv("API_URL")
-    if not api_url:
+    if FEEDBACK_SINK == "http" and not api_url:
         raise Exception("API_URL is not configured")
 
-    try:
-        for record in event["Records"]:
-            # Leer mensaje de SQS
+    started = time.perf_counter()
+    deadline = None
+    if context is not None:
+        deadline = time.monotonic() + context.get_remaining_time_in_millis() / 1000 - DEADLINE_MARGIN_SECONDS
+
+    records = event["Records"]
+    throttles_before = _concurrency.throttles
+    cache_before = _generation_cache.stats
+    if GENERATION_CACHE == "database":
+        preload_generation_cache(records)
+
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENCY, len(records)) or 1) as executor:
+        results = list(executor.map(lambda record: run_record(record, api_url, deadline), records))
+
+    failed_ids = {record["messageId"] for record, (ok, _) in zip(records, results) if not ok}
+    db_ms = 0.0
+    rows = [row for ok, row in results if ok and row is not None]
+    if rows:
+        # Importado aquí: el modo http no necesita psycopg2
+        import feedback_persistence
+
+        db_started = time.perf_counter()
+        failed_ids.update(feedback_persistence.save_feedback(rows))
+        db_ms = (time.perf_counter() - db_started) * 1000
+    if GENERATION_CACHE == "database":
+        # También las generaciones de mensajes que fallaron: su reentrega no vuelve a llamar a Bedrock
+        store_generation_cache()
+
+    cache_stats = _generation_cache.stats
+
+    failures = [{"itemIdentifier": record["messageId"]} for record in records if record["messageId"] in failed_ids]
+    print(json.dumps({
+        "event": "feedback_batch",
+        "sink": FEEDBACK_SINK,
+        "records": len(records),
+        "failed": len(failures),
+        "throttles": _concurrency.throttles - throttles_before,
+        "concurrency_limit": _concurrency.limit,
+        "db_ms": round(db_ms, 1),
+        "cache_memory_hits": cache_stats["memory_hits"] - cache_before["memory_hits"],
+        "cache_database_hits": cache_stats["database_hits"] - cache_before["database_hits"],
+        "cache_misses": cache_stats["misses"] - cache_before["misses"],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }))
+    return {"batchItemFailures": failures}
+
+
+def preload_generation_cache(records):
+    """Lee de la base de datos, en una consulta por tenant, las generaciones ya guardadas del lote."""
+    import feedback_persistence
+
+    keys_by_tenant = {}
+    for record in records:
+        try:
             message_body = json.loads(record["body"])
-            prompt_string = message_body["prompt_string"]
-            id_evaluation = message_body["id_evaluation"]
-            id_user = message_body["id_user"]
-            performed_by = message_body["performed_by"]
+            key = cache_key(message_body["prompt_string"], MODEL_ID, GENERATION_PARAMS)
+        except Exception:
+            continue  # El mensaje falla (y se reporta) al procesarlo
+        keys_by_tenant.setdefault(message_body.get("tenant") or "public", set()).add(key)
+
+    for tenant, keys in keys_by_tenant.items():
+        try:
+            _generation_cache.preload(tenant, feedback_persistence.load_generations(tenant, keys))
+        except Exception as e:
+            print(f"Loading the generation cache of schema {tenant} failed: {e}")
 
-            # Generar texto con Bedrock
-            feedback_text = generate_text(prompt=prompt_string)
 
-            # Enviar feedback al API
-            payload = {
-                "id_evaluation": id_evaluation,
-                "id_user": id_user,
-                "feedback_text": feedback_text,
-                "performed_by": performed_by,
-            }
-            headers = {"Content-Type": "application/json"}
+def store_generation_cache():
+    """Guarda en la base de datos las generaciones nuevas del lote, por tenant."""
+    import feedback_persistence
 
-            response = requests.post(api_url, json=payload, headers=headers)
-            if response.status_code != 200:
-                raise Exception(f"Error calling API: {response.text}")
+    for tenant, entries in _generation_cache.pending_entries().items():
+        try:
+            feedback_persistence.store_generations(
+                tenant, entries, GENERATION_CACHE_TTL_SECONDS, GENERATION_CACHE_DB_ENTRIES
+            )
+        except Exception as e:
+            print(f"Storing the generation cache of schema {tenant} failed: {e}")
 
-        return {"statusCode": 200, "body": "Messages processed successfully"}
+
+def run_record(record, api_url, deadline=None):
+    """
+    Procesa un mensaje y publica sus métricas.
+
+    Returns:
+        tuple: (ok, fila de feedback a guardar en la base de datos o None).
+    """
+    metrics = {"bedrock_ms": 0.0, "api_ms": 0.0, "attempts": 0, "throttles": 0, "cache_hit": 0}
+    started = time.perf_counter()
+    row = None
+    try:
+        if deadline is not None and time.monotonic() > deadline:
+            raise Exception("Not enough time left in the invocation")
+        row = process_record(record, api_url, metrics)
+        ok = True
     except Exception as e:
-        return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
+        print(f"Feedback message {record['messageId']} failed: {e}")
+        ok = False
+    metrics["record_ms"] = (time.perf_counter() - started) * 1000
+    emit_record_metrics(record["messageId"], ok, metrics)
+    return ok, row
+
+
+def emit_record_metrics(message_id, ok, metrics):
+    """
+    Escribe las latencias de un mensaje en Embedded Metric Format: CloudWatch
+    las convierte en métricas a partir del log, sin llamadas a la API.
+    """
+    print(json.dumps({
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [[]],
+                "Metrics": [
+                    {"Name": "RecordLatency", "Unit": "Milliseconds"},
+                    {"Name": "BedrockLatency", "Unit": "Milliseconds"},
+                    {"Name": "ApiLatency", "Unit": "Milliseconds"},
+                    {"Name": "BedrockThrottles", "Unit": "Count"},
+                    {"Name": "GenerationCacheHit", "Unit": "Count"},
+                    {"Name": "RecordFailed", "Unit": "Count"},
+                ],
+            }],
+        },
+        "message_id": message_id,
+        "attempts": metrics["attempts"],
+        "RecordLatency": round(metrics["record_ms"], 1),
+        "BedrockLatency": round(metrics["bedrock_ms"], 1),
+        "ApiLatency": round(metrics["api_ms"], 1),
+        "BedrockThrottles": metrics["throttles"],
+        "GenerationCacheHit": metrics["cache_hit"],
+        "RecordFailed": 0 if ok else 1,
+    }))
+
+
+def process_record(record, api_url, metrics=None):
+    """
+    Genera el feedback de un mensaje SQS. Con FEEDBACK_SINK=http lo envía al API;
+    con FEEDBACK_SINK=database devuelve la fila para guardarla con el resto del lote.
+    Lanza una excepción si el mensaje no se pudo procesar.
+    """
+    metrics = metrics if metrics is not None else {"bedrock_ms": 0.0, "api_ms": 0.0, "attempts": 0, "throttles": 0, "cache_hit": 0}
+
+    # Leer mensaje de SQS
+    message_body = json.loads(record["body"])
+    prompt_string = message_body["prompt_string"]
+    id_evaluation = message_body["id_evaluation"]
+    id_user = message_body["id_user"]
+    performed_by = message_body["performed_by"]
+
+    # Igual en todos los envíos de un mismo mensaje del outbox (un reenvío tiene otro
+    # messageId); los mensajes anteriores al outbox_id se deduplican por messageId
+    source_message_id = message_body.get("outbox_id") or record["messageId"]
+
+    # Generar texto con Bedrock, salvo que el mismo prompt ya se haya generado
+    tenant = message_body.get("tenant") or "public"
+    key = cache_key(prompt_string, MODEL_ID, GENERATION_PARAMS)
+    feedback_text = _generation_cache.get(tenant, key) if GENERATION_CACHE != "off" else None
+    if feedback_text is not None:
+        metrics["cache_hit"] = 1
+    else:
+        feedback_text = generate_text_throttled(prompt_string, metrics)
+        if GENERATION_CACHE != "off":
+            _generation_cache.put(tenant, key, feedback_text)
+
+    if FEEDBACK_SINK == "database":
+        return {
+            "message_id": record["messageId"],
+            "source_message_id": source_message_id,
+            # Mensajes anteriores al outbox no traen el tenant: schema public
+            "tenant": message_body.get("tenant"),
+            "id_evaluation": id_evaluation,
+            "id_user": id_user,
+            "feedback_text": feedback_text,
+            "performed_by": performed_by,
+        }
+
+    # Enviar feedback al API
+    payload = {
+        "id_evaluation": id_evaluation,
+        "id_user": id_user,
+        "feedback_text": feedback_text,
+        "performed_by": performed_by,
+    }
+    # Las redeliveries y los reenvíos del outbox conservan la clave: el API no duplica el feedback
+    headers = {"Content-Type": "application/json", "Idempotency-Key": source_message_id}
+    if message_body.get("tenant"):
+        headers["X-Tenant"] = message_body["tenant"]
+
+    started = time.perf_counter()
+    response = _http_session.post(api_url, json=payload, headers=headers)
+    metrics["api_ms"] += (time.perf_counter() - started) * 1000
+    if not 200 <= response.status_code < 300:
+        raise Exception(f"Error calling API: {response.status_code} {response.text}")
+    return None
+
+
+def generate_text_throttled(prompt, metrics):
+    """
+    Llama a `generate_text` dentro del límite de concurrencia. Un throttle reduce
+    el límite y el mensaje se reintenta (hasta FEEDBACK_THROTTLE_RETRIES veces)
+    tras una espera aleatoria creciente, fuera del límite.
+    """
+    for attempt in range(1, THROTTLE_RETRIES + 2):
+        metrics["attempts"] = attempt
+        with _concurrency.slot():
+            started = time.perf_counter()
+            try:
+                feedback_text = generate_text(prompt=prompt, model_id=MODEL_ID, **GENERATION_PARAMS)
+            except BedrockThrottlingError:
+                _concurrency.on_throttle()
+                metrics["throttles"] += 1
+                if attempt > THROTTLE_RETRIES:
+                    raise
+            else:
+                _concurrency.on_success()
+                return feedback_text
+            finally:
+                metrics["bedrock_ms"] += (time.perf_counter() - started) * 1000
+        time.sleep(random.uniform(0, min(2 ** attempt, 20)))
 
 
 def generate_text(prompt, model_id="ai21.jamba-1-5-mini-v1:0", max_tokens=200, temperature=0.7, top_p=0.9, region_name="us-east-1"):
@@ -48,17 +331,18 @@ def generate_text(prompt, model_id="ai21.jamba-1-5-mini-v1:0", max_tokens=200, t
         :param top_p: Valor de top-p para controlar la aleatoriedad del modelo.
         :param region_name: Región de AWS donde se encuentra Bedrock.
         :return: Respuesta generada por el modelo.
+        :raises Exception: Si falla la llamada a Bedrock (el mensaje se reintenta).
         """
         try:
-            # Inicializar cliente de Amazon Bedrock
-            client = boto3.client("bedrock-runtime", region_name=region_name)
+            # Cliente compartido de Amazon Bedrock
+            client = get_bedrock_client(region_name)
             
-            # Preparar el payload para la solicitud
+            # Preparar el payload para la solicitud (formato de chat de Jamba 1.5)
             payload = {
-                "prompt": prompt,
-                "maxTokens": max_tokens,
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": max_tokens,
                 "temperature": temperature,
-                "topP": top_p,
+                "top_p": top_p,
             }
             
             # Llamar al modelo en Bedrock
@@ -69,8 +353,16 @@ def generate_text(prompt, model_id="ai21.jamba-1-5-mini-v1:0", max_tokens=200, t
             )
             
             # Parsear la respuesta del modelo
-            result = json.loads(response["body"])
-            return result.get("generatedText", "No response generated.")
+            result = json.loads(response["body"].read())
+            choices = result.get("choices") or []
+            if not choices or not choices[0].get("message", {}).get("content"):
+                raise ValueError("No response generated.")
+            return choices[0]["message"]["content"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ThrottlingException":
+                raise BedrockThrottlingError(str(e)) from e
+            raise Exception(f"Error invoking Bedrock model: {str(e)}") from e
         except Exception as e:
-            return f"Error invoking Bedrock model: {str(e)}"
+            # Antes el error se devolvía como texto y se guardaba como feedback
+            raise Exception(f"Error invoking Bedrock model: {str(e)}") from e
 
@@ -0,0 +1,216 @@
+import os
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import psycopg2
+import psycopg2.extras
+import psycopg2.pool
+
+DEFAULT_SCHEMA = "public"
+
+_EPOCH = datetime(1970, 1, 1)
+
+_VALID_SCHEMA_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,62}$")
+
+# Pool de conexiones reutilizado entre invocaciones del mismo contenedor
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _dsn():
+    """DATABASE_URL con el formato de SQLAlchemy del API (postgresql+psycopg2://) o libpq."""
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise Exception("DATABASE_URL is not configured")
+    return re.sub(r"^postgresql\+psycopg2://", "postgresql://", database_url)
+
+
+def get_pool():
+    """Devuelve el pool de conexiones, creándolo una sola vez por contenedor."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = psycopg2.pool.ThreadedConnectionPool(
+                    minconn=1,
+                    maxconn=int(os.getenv("FEEDBACK_DB_POOL_SIZE", 2)),
+                    dsn=_dsn(),
+                    connect_timeout=5,
+                )
+    return _pool
+
+
+def save_feedback(rows):
+    """
+    Inserta el feedback generado directamente en la tabla feedback del schema de
+    cada tenant: un INSERT multi-fila y una transacción por tenant. Si el INSERT
+    del lote falla (p. ej. una evaluación eliminada), las filas se insertan de a
+    una, cada una en un savepoint: solo fallan las filas con error.
+
+    Las filas ya guardadas por una entrega anterior del mismo mensaje se ignoran
+    (ON CONFLICT sobre source_message_id), así que reintentar es seguro. Como en
+    FeedbackService.create_feedback, cada fila insertada deja su registro de uso.
+
+    :param rows: Lista de dicts con message_id (SQS), source_message_id (clave de
+        deduplicación: outbox_id o messageId), tenant, id_evaluation, id_user,
+        feedback_text y performed_by.
+    :return: {message_id: error} de las filas que no se pudieron guardar.
+    """
+    by_tenant = {}
+    for row in rows:
+        by_tenant.setdefault(row.get("tenant") or DEFAULT_SCHEMA, []).append(row)
+
+    failed = {}
+    for schema_name, tenant_rows in by_tenant.items():
+        try:
+            inserted, row_errors = _insert_tenant_feedback(schema_name, tenant_rows)
+        except Exception as e:
+            print(f"Saving feedback in schema {schema_name} failed: {e}")
+            failed.update({row["message_id"]: str(e) for row in tenant_rows})
+            continue
+
+        failed.update(row_errors)
+        for row in inserted:
+            _log_usage(
+                f"Created feedback for evaluation ID {row['id_evaluation']} by user ID {row['id_user']}",
+                row.get("performed_by"),
+            )
+    return failed
+
+
+def _insert_tenant_feedback(schema_name, rows):
+    """
+    :return: (filas insertadas, {message_id: error} de las que fallaron).
+    """
+    with tenant_cursor(schema_name) as cursor:
+        try:
+            return _insert_in_savepoint(cursor, rows), {}
+        except psycopg2.OperationalError:
+            raise
+        except psycopg2.Error as e:
+            if len(rows) == 1:
+                return [], {rows[0]["message_id"]: str(e)}
+            print(f"Batch insert of {len(rows)} feedback rows in schema {schema_name} failed, retrying per row: {e}")
+
+        inserted, failed = [], {}
+        for row in rows:
+            try:
+                inserted.extend(_insert_in_savepoint(cursor, [row]))
+            except psycopg2.OperationalError:
+                raise
+            except psycopg2.Error as e:
+                print(f"Saving feedback of message {row['message_id']} in schema {schema_name} failed: {e}")
+                failed[row["message_id"]] = str(e)
+        return inserted, failed
+
+
+def _insert_in_savepoint(cursor, rows):
+    """Inserta `rows` dentro de un savepoint; devuelve las filas realmente insertadas (no duplicadas)."""
+    now = datetime.utcnow()
+    cursor.execute("SAVEPOINT feedback_insert")
+    try:
+        inserted_keys = psycopg2.extras.execute_values(
+            cursor,
+            "INSERT INTO feedback (id_evaluation, id_user, feedback_text, source_message_id, created_at) "
+            "VALUES %s ON CONFLICT (source_message_id) DO NOTHING RETURNING source_message_id",
+            [
+                (row["id_evaluation"], row["id_user"], row["feedback_text"], row["source_message_id"], now)
+                for row in rows
+            ],
+            fetch=True,
+        )
+    except psycopg2.Error:
+        cursor.execute("ROLLBACK TO SAVEPOINT feedback_insert")
+        raise
+    cursor.execute("RELEASE SAVEPOINT feedback_insert")
+
+    # Un mismo mensaje entregado dos veces en el lote se inserta (y se registra) una sola vez
+    remaining = {key for (key,) in inserted_keys}
+    inserted = []
+    for row in rows:
+        if row["source_message_id"] in remaining:
+            remaining.discard(row["source_message_id"])
+            inserted.append(row)
+    return inserted
+
+
+def _log_usage(action, performed_by):
+    # Mismo registro que UsageLogService.create_usage_log en el API
+    print(f"Logging action: {action} performed by: {performed_by}")
+
+
+def load_generations(schema_name, keys):
+    """
+    Lee de la tabla generation_cache del tenant los textos vigentes de `keys`
+    y registra el acierto (last_hit_at, usado para el desalojo por tamaño).
+
+    :return: {clave: (texto, expira_epoch)}.
+    """
+    now = datetime.utcnow()
+    with tenant_cursor(schema_name) as cursor:
+        cursor.execute(
+            "UPDATE generation_cache SET hit_count = hit_count + 1, last_hit_at = %s "
+            "WHERE cache_key = ANY(%s) AND expires_at > %s "
+            "RETURNING cache_key, response_text, expires_at",
+            (now, list(keys), now),
+        )
+        return {
+            key: (text, (expires_at - _EPOCH).total_seconds())
+            for key, text, expires_at in cursor.fetchall()
+        }
+
+
+def store_generations(schema_name, entries, ttl_seconds, max_entries):
+    """
+    Guarda textos generados en la tabla generation_cache del tenant y aplica el
+    desalojo: borra lo vencido y, por encima de `max_entries`, lo usado hace más tiempo.
+
+    :param entries: {clave: texto}.
+    """
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    with tenant_cursor(schema_name) as cursor:
+        psycopg2.extras.execute_values(
+            cursor,
+            "INSERT INTO generation_cache (cache_key, response_text, created_at, last_hit_at, expires_at) VALUES %s "
+            "ON CONFLICT (cache_key) DO UPDATE SET response_text = EXCLUDED.response_text, "
+            "last_hit_at = EXCLUDED.last_hit_at, expires_at = EXCLUDED.expires_at",
+            [(key, text, now, now, expires_at) for key, text in entries.items()],
+        )
+        cursor.execute("DELETE FROM generation_cache WHERE expires_at <= %s", (now,))
+        cursor.execute(
+            "DELETE FROM generation_cache WHERE cache_key IN ("
+            "SELECT cache_key FROM generation_cache ORDER BY last_hit_at DESC OFFSET %s)",
+            (max_entries,),
+        )
+
+
+@contextmanager
+def tenant_cursor(schema_name):
+    """
+    Cursor de una conexión del pool dentro de una transacción fijada al schema
+    del tenant; confirma al salir o revierte si hubo un error.
+    """
+    if not _VALID_SCHEMA_NAME.match(schema_name):
+        raise ValueError(f"Invalid schema name: {schema_name!r}")
+
+    pool = get_pool()
+    connection = pool.getconn()
+    broken = False
+    try:
+        with connection.cursor() as cursor:
+            # SET LOCAL: el search_path vuelve al valor por defecto al terminar la transacción
+            search_path = f'"{schema_name}"' if schema_name == DEFAULT_SCHEMA else f'"{schema_name}", {DEFAULT_SCHEMA}'
+            cursor.execute(f"SET LOCAL search_path TO {search_path}")
+            yield cursor
+        connection.commit()
+    except psycopg2.OperationalError:
+        broken = True
+        raise
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        # Las conexiones caídas se descartan en vez de volver al pool
+        pool.putconn(connection, close=broken or connection.closed != 0)
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+# Sube al cambiar la normalización o el formato de la clave: invalida todo lo guardado
+CACHE_KEY_VERSION = 1
+
+_HORIZONTAL_SPACE = re.compile(r"[ \t\f\v]+")
+
+
+def normalize_prompt(prompt):
+    """
+    Forma canónica del prompt para la clave: Unicode NFC, saltos de línea \\n,
+    espacios repetidos colapsados y sin espacios al inicio/fin de cada línea.
+    """
+    prompt = unicodedata.normalize("NFC", prompt).replace("\r\n", "\n").replace("\r", "\n")
+    lines = (_HORIZONTAL_SPACE.sub(" ", line).strip() for line in prompt.split("\n"))
+    return "\n".join(lines).strip()
+
+
+def cache_key(prompt, model_id, params):
+    """SHA-256 del prompt normalizado, el modelo y los parámetros de muestreo."""
+    material = json.dumps(
+        {"v": CACHE_KEY_VERSION, "model": model_id, "params": params, "prompt": normalize_prompt(prompt)},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    """
+    Cache en memoria (LRU con TTL) de textos generados, por (tenant, clave).
+
+    Vive lo que el contenedor; la copia persistente está en la tabla
+    generation_cache de cada tenant (feedback_persistence), que el handler
+    precarga con `preload` y actualiza con `pending_entries`.
+    """
+
+    def __init__(self, max_entries, ttl_seconds, persist=False):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persist = persist
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.database_hits = 0
+        self.misses = 0
+
+    def get(self, tenant, key):
+        """Devuelve el texto guardado o None (cuenta el acierto o fallo)."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get((tenant, key))
+            if entry is not None and entry[2] > now:
+                self._entries.move_to_end((tenant, key))
+                if entry[1]:
+                    self.database_hits += 1
+                    # Las siguientes lecturas ya son de memoria
+                    self._entries[(tenant, key)] = (entry[0], False, entry[2])
+                else:
+                    self.memory_hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[(tenant, key)]
+            self.misses += 1
+            return None
+
+    def put(self, tenant, key, text):
+        """Guarda un texto recién generado; con `persist`, queda pendiente de guardar en la base de datos."""
+        with self._lock:
+            self._store((tenant, key), text, False, time.time() + self.ttl_seconds)
+            if self.persist:
+                self._pending[(tenant, key)] = text
+
+    def preload(self, tenant, entries):
+        """Carga en memoria las entradas leídas de la base de datos: {clave: (texto, expira_epoch)}."""
+        with self._lock:
+            for key, (text, expires_at) in entries.items():
+                if (tenant, key) not in self._entries:
+                    self._store((tenant, key), text, True, expires_at)
+
+    def pending_entries(self):
+        """Devuelve y vacía las entradas nuevas, agrupadas por tenant: {tenant: {clave: texto}}."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        by_tenant = {}
+        for (tenant, key), text in pending.items():
+            by_tenant.setdefault(tenant, {})[key] = text
+        return by_tenant
+
+    @property
+    def stats(self):
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "database_hits": self.database_hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+    def _store(self, cache_id, text, from_database, expires_at):
+        self._entries[cache_id] = (text, from_database, expires_at)
+        self._entries.move_to_end(cache_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)